@@ -0,0 +1,28 @@
+"""
+Protection des endpoints d'administration de Kwezi (traces, profilage)
+Jeton partagé ADMIN_TOKEN, envoyé dans l'en-tête X-Admin-Token ou
+Authorization: Bearer. Sans ADMIN_TOKEN les endpoints sont désactivés.
+"""
+import hmac
+import os
+
+from fastapi import HTTPException, Request
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def _request_token(request: Request) -> str:
+    token = request.headers.get("x-admin-token")
+    if token:
+        return token
+    authorization = request.headers.get("authorization", "")
+    scheme, _, credentials = authorization.partition(" ")
+    return credentials.strip() if scheme.lower() == "bearer" else ""
+
+
+def require_admin(request: Request):
+    """Dépendance FastAPI : 403 si le jeton d'administration est absent ou faux"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Accès administrateur désactivé (ADMIN_TOKEN non défini)")
+    if not hmac.compare_digest(_request_token(request).encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Jeton d'administration invalide")
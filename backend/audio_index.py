@@ -0,0 +1,282 @@
+"""
+Index des fichiers audio pour Kwezi
+Construit au démarrage et rafraîchi par un surveillant de dossiers, il résout
+(section, fichier) et (mot, langue) vers un fichier déjà inspecté (chemin,
+taille, date) sans sonder le disque à chaque requête
+"""
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from http_cache import file_content_hash
+from metrics import count_fs
+from tracing import span
+
+FRONTEND_AUDIO_DIR = os.getenv("AUDIO_ASSETS_DIR", "/app/frontend/assets/audio")
+BACKEND_AUDIO_DIR = os.getenv("BACKEND_AUDIO_ASSETS_DIR", "/app/backend/audio_assets")
+AUDIO_INDEX_POLL_SECONDS = float(os.getenv("AUDIO_INDEX_POLL_SECONDS", "30"))
+AUDIO_EXTENSIONS = (".m4a",)
+
+LANGUAGES = ("shimaore", "kibouchi")
+
+# Dossier de backend/audio_assets quand il diffère de la catégorie du mot
+BACKEND_CATEGORY_DIRS = {"tradition": "traditions"}
+# Dossier utilisé pour une catégorie sans dossier propre (comme l'ancien handler)
+DEFAULT_BACKEND_DIR = "famille"
+
+# Champs du système audio dual, par ordre de priorité :
+# format 1 (anciennes catégories) puis format 2 (nouveaux mots)
+DUAL_AUDIO_FIELDS = {
+    "shimaore": ("shimoare_audio_filename", "audio_filename_shimaore"),
+    "kibouchi": ("kibouchi_audio_filename", "audio_filename_kibouchi"),
+}
+
+# Ancien format (nom de fichier, indicateur de présence)
+LEGACY_AUDIO_FIELDS = {
+    "shimaore": ("audio_shimaoré_filename", "has_shimaoré_audio"),
+    "kibouchi": ("audio_kibouchi_filename", "has_kibouchi_audio"),
+}
+
+
+class AudioFile:
+    """Fichier audio indexé avec le résultat de son stat()"""
+
+    __slots__ = ("section", "filename", "path", "stat", "_content_hash")
+
+    def __init__(self, section: Optional[str], filename: str, path: str, stat: os.stat_result):
+        self.section = section
+        self.filename = filename
+        self.path = path
+        self.stat = stat
+        self._content_hash: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return self.stat.st_size
+
+    @property
+    def mtime(self) -> float:
+        return self.stat.st_mtime
+
+    @property
+    def fingerprint(self) -> Tuple[int, int]:
+        return (self.stat.st_size, self.stat.st_mtime_ns)
+
+    def content_hash(self) -> str:
+        """SHA-256 du contenu, calculé à la première demande (lecture disque)"""
+        if self._content_hash is None:
+            self._content_hash = file_content_hash(self.path)
+        return self._content_hash
+
+    @property
+    def etag(self) -> Optional[str]:
+        """ETag fort si l'empreinte est déjà connue, None sinon"""
+        if self._content_hash is None:
+            return None
+        return '"' + self._content_hash[:32] + '"'
+
+    def inherit_hash(self, previous: Optional["AudioFile"]):
+        """Reprend l'empreinte d'un parcours précédent si le fichier n'a pas changé"""
+        if previous is not None and previous._content_hash and previous.fingerprint == self.fingerprint:
+            self._content_hash = previous._content_hash
+
+
+def _scan_directory(path: str, section: Optional[str]) -> Dict[str, AudioFile]:
+    """Fichiers audio d'un dossier (non récursif)"""
+    files = {}
+    count_fs("scandir")
+    try:
+        with span("fs", "scandir", path=path), os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                    count_fs("stat")
+                    files[entry.name] = AudioFile(section, entry.name, entry.path, entry.stat())
+    except FileNotFoundError:
+        pass
+    return files
+
+
+def _list_subdirectories(path: str) -> List[str]:
+    count_fs("scandir")
+    try:
+        with span("fs", "scandir", path=path), os.scandir(path) as entries:
+            return sorted(entry.name for entry in entries if entry.is_dir())
+    except FileNotFoundError:
+        return []
+
+
+class AudioFiles:
+    """Résultat immuable d'un parcours des dossiers audio"""
+
+    def __init__(self, frontend_dir: str, backend_dir: str):
+        # Racine de frontend/assets/audio (nouveaux fichiers)
+        self.root = _scan_directory(frontend_dir, None)
+        # frontend/assets/audio/<section>
+        self.sections: Dict[str, Dict[str, AudioFile]] = {
+            section: _scan_directory(os.path.join(frontend_dir, section), section)
+            for section in _list_subdirectories(frontend_dir)
+        }
+        # backend/audio_assets/<dossier>
+        self.backend: Dict[str, Dict[str, AudioFile]] = {
+            directory: _scan_directory(os.path.join(backend_dir, directory), directory)
+            for directory in _list_subdirectories(backend_dir)
+        }
+
+    def all_files(self):
+        yield from self.root.values()
+        for files in self.sections.values():
+            yield from files.values()
+        for files in self.backend.values():
+            yield from files.values()
+
+    def inherit_hashes(self, previous: "AudioFiles"):
+        """Évite de relire les fichiers inchangés après une reconstruction"""
+        previous_by_path = {audio_file.path: audio_file for audio_file in previous.all_files()}
+        for audio_file in self.all_files():
+            audio_file.inherit_hash(previous_by_path.get(audio_file.path))
+
+    def count(self) -> int:
+        return (
+            len(self.root)
+            + sum(len(files) for files in self.sections.values())
+            + sum(len(files) for files in self.backend.values())
+        )
+
+
+def _directory_signature(frontend_dir: str, backend_dir: str) -> Tuple:
+    """
+    Taille et date de modification de chaque fichier audio surveillé : la
+    signature change quand un fichier est ajouté, supprimé, renommé ou
+    réécrit sur place (la date du dossier ne bouge pas dans ce dernier cas)
+    """
+    signature = []
+    for base in (frontend_dir, backend_dir):
+        for path in [base] + [os.path.join(base, name) for name in _list_subdirectories(base)]:
+            signature.append((path, tuple(sorted(
+                (name, audio_file.fingerprint) for name, audio_file in _scan_directory(path, None).items()
+            ))))
+    return tuple(signature)
+
+
+def word_audio_filename(word: dict, lang: str) -> Optional[str]:
+    """Nom du fichier audio d'un mot dans une langue (système dual puis ancien format)"""
+    if word.get("dual_audio_system", False):
+        for field in DUAL_AUDIO_FIELDS[lang]:
+            if word.get(field):
+                return word[field]
+    filename_field, has_audio_field = LEGACY_AUDIO_FIELDS[lang]
+    if word.get(has_audio_field) and word.get(filename_field):
+        return word[filename_field]
+    return None
+
+
+class AudioIndex:
+    """Index des fichiers audio, reconstruit quand les dossiers changent"""
+
+    def __init__(
+        self,
+        frontend_dir: str = FRONTEND_AUDIO_DIR,
+        backend_dir: str = BACKEND_AUDIO_DIR,
+        poll_seconds: float = AUDIO_INDEX_POLL_SECONDS,
+    ):
+        self.frontend_dir = frontend_dir
+        self.backend_dir = backend_dir
+        self.poll_seconds = poll_seconds
+        self.version = 0
+        self._files: Optional[AudioFiles] = None
+        self._signature = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        # ((version vocabulaire, version index), {(word_id, lang): AudioFile})
+        self._word_index: Tuple[Optional[tuple], Dict[Tuple[str, str], AudioFile]] = (None, {})
+
+    def build(self):
+        """Parcourt les dossiers audio et remplace l'index"""
+        with self._lock:
+            signature = _directory_signature(self.frontend_dir, self.backend_dir)
+            files = AudioFiles(self.frontend_dir, self.backend_dir)
+            if self._files is not None:
+                files.inherit_hashes(self._files)
+            self._files = files
+            self._signature = signature
+            self.version += 1
+        print(f"🔊 Index audio v{self.version}: {files.count()} fichiers")
+
+    def refresh_if_changed(self) -> bool:
+        """Reconstruit l'index si un dossier surveillé a changé"""
+        signature = _directory_signature(self.frontend_dir, self.backend_dir)
+        if signature == self._signature:
+            return False
+        self.build()
+        return True
+
+    @property
+    def files(self) -> AudioFiles:
+        if self._files is None:
+            self.build()
+        return self._files
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.refresh_if_changed()
+            except Exception as e:
+                print(f"⚠️ Erreur surveillance audio: {e}")
+
+    def start_watcher(self):
+        """Démarre le thread de surveillance des dossiers audio"""
+        if self.poll_seconds <= 0 or (self._watcher and self._watcher.is_alive()):
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="audio-index-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+
+    def find(self, section: str, filename: str) -> Optional[AudioFile]:
+        """Fichier frontend/assets/audio/<section>/<filename>"""
+        return self.files.sections.get(section, {}).get(filename)
+
+    def resolve_word(self, word: dict, lang: str) -> Optional[AudioFile]:
+        """Fichier audio d'un mot dans une langue (sans passer par la table en cache)"""
+        filename = word_audio_filename(word, lang)
+        if not filename:
+            return None
+        files = self.files
+        # Chercher d'abord à la racine (nouveaux fichiers), puis dans le dossier de
+        # la catégorie, ou dans famille si la catégorie n'a pas de dossier
+        audio_file = files.root.get(filename)
+        if audio_file is None:
+            category = word.get("section") or word.get("category", DEFAULT_BACKEND_DIR)
+            directory = BACKEND_CATEGORY_DIRS.get(category, category)
+            if directory not in files.backend:
+                directory = DEFAULT_BACKEND_DIR
+            audio_file = files.backend.get(directory, {}).get(filename)
+        return audio_file
+
+    def word_files_ready(self, vocabulary) -> bool:
+        """La table (word_id, langue) correspond au vocabulaire et à l'index courants"""
+        return self._word_index[0] == (vocabulary.version, self.version)
+
+    def word_files(self, vocabulary) -> Dict[Tuple[str, str], AudioFile]:
+        """
+        Table (word_id, langue) -> fichier audio du snapshot de vocabulaire,
+        reconstruite quand le vocabulaire ou l'index change (appel bloquant)
+        """
+        key = (vocabulary.version, self.version)
+        word_index_key, word_index = self._word_index
+        if word_index_key != key:
+            word_index = {}
+            for word in vocabulary.words:
+                for language in LANGUAGES:
+                    audio_file = self.resolve_word(word, language)
+                    if audio_file is not None:
+                        word_index[(word["id"], language)] = audio_file
+            self._word_index = (key, word_index)
+        return word_index
+
+    def find_for_word(self, vocabulary, word_id: str, lang: str) -> Optional[AudioFile]:
+        """Fichier audio d'un mot du snapshot de vocabulaire"""
+        return self.word_files(vocabulary).get((word_id, lang))
@@ -0,0 +1,153 @@
+"""
+Manifeste des fichiers audio pour Kwezi
+Liste précalculée (taille, empreinte SHA-256) de tous les fichiers servis par
+/api/audio/{section}/{filename}, reconstruite uniquement quand l'index audio
+change. Le téléchargement hors ligne le compare à ce qu'il possède déjà.
+"""
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from http_cache import EncodedBody
+
+# Catégories historiques de /api/audio/info (ordre de la réponse)
+AUDIO_INFO_CATEGORIES = (
+    "famille", "nature", "nombres", "animaux", "corps", "salutations",
+    "couleurs", "grammaire", "nourriture", "verbes", "expressions",
+    "adjectifs", "vetements", "maison", "tradition", "transport",
+)
+
+MANIFEST_DEFAULT_LIMIT = 500
+MANIFEST_MAX_LIMIT = 2000
+
+# Nombre maximal de pages pré-encodées gardées par version du manifeste
+MAX_ENCODED_PAGES = 128
+
+
+def _manifest_entry(audio_file) -> dict:
+    return {
+        "section": audio_file.section,
+        "filename": audio_file.filename,
+        "url": f"/api/audio/{audio_file.section}/{audio_file.filename}",
+        "size": audio_file.size,
+        "sha256": audio_file.content_hash(),
+    }
+
+
+class ManifestData:
+    """Une version immuable du manifeste"""
+
+    def __init__(self, index_version: int, sections: Dict[str, List[dict]]):
+        self.index_version = index_version
+        self.sections = sections
+        self.files = [entry for section in sorted(sections) for entry in sections[section]]
+        # Version stable d'un redémarrage à l'autre : dépend uniquement du contenu
+        digest = hashlib.sha256()
+        for entry in self.files:
+            digest.update(f"{entry['section']}/{entry['filename']}:{entry['sha256']}\n".encode("utf-8"))
+        self.version = digest.hexdigest()[:16]
+        self.total_size = sum(entry["size"] for entry in self.files)
+        self.encoded: Dict[tuple, EncodedBody] = {}
+        self._audio_info: Optional[EncodedBody] = None
+
+    def select(self, category: Optional[str]) -> List[dict]:
+        if category:
+            return self.sections.get(category, [])
+        return self.files
+
+    def page(self, category: Optional[str], offset: int, limit: int) -> dict:
+        files = self.select(category)
+        return {
+            "version": self.version,
+            "category": category,
+            "total": len(files),
+            "offset": offset,
+            "limit": limit,
+            "total_size": sum(entry["size"] for entry in files),
+            "files": files[offset:offset + limit],
+        }
+
+    def audio_info(self) -> EncodedBody:
+        """Réponse de /api/audio/info (format historique)"""
+        if self._audio_info is None:
+            payload = {"service": "Audio API intégré - Système Dual Étendu"}
+            total_files = 0
+            for category in AUDIO_INFO_CATEGORIES:
+                files = [entry["filename"] for entry in self.sections.get(category, [])]
+                payload[category] = {"count": len(files), "files": files}
+                total_files += len(files)
+            endpoints = {category: f"/api/audio/{category}/{{filename}}" for category in AUDIO_INFO_CATEGORIES}
+            endpoints["dual_system"] = "/api/words/{word_id}/audio/{lang}"
+            endpoints["manifest"] = "/api/audio/manifest"
+            payload["endpoints"] = endpoints
+            payload["total_categories"] = len(AUDIO_INFO_CATEGORIES)
+            payload["total_files"] = total_files
+            payload["manifest_version"] = self.version
+            self._audio_info = EncodedBody(payload)
+        return self._audio_info
+
+
+class AudioManifest:
+    """Manifeste reconstruit quand la version de l'index audio change"""
+
+    def __init__(self, audio_index):
+        self.audio_index = audio_index
+        self._data: Optional[ManifestData] = None
+        self._lock = threading.Lock()
+        # Appelés (sous le verrou, dans le thread qui construit) à chaque nouvelle version
+        self._listeners: List[Callable[[ManifestData], None]] = []
+
+    def add_listener(self, listener: Callable[["ManifestData"], None]):
+        """Prévient `listener` de chaque version du manifeste, y compris la version courante"""
+        with self._lock:
+            self._listeners.append(listener)
+            data = self._data
+        if data is not None:
+            listener(data)
+
+    def _notify(self, data: ManifestData):
+        for listener in self._listeners:
+            try:
+                listener(data)
+            except Exception as e:
+                print(f"⚠️ Manifeste audio {data.version}: {e}")
+
+    def _build(self, index_version: int) -> ManifestData:
+        files = self.audio_index.files
+        sections = {
+            section: [_manifest_entry(entries[name]) for name in sorted(entries)]
+            for section, entries in files.sections.items()
+        }
+        data = ManifestData(index_version, sections)
+        print(f"🗂️ Manifeste audio {data.version}: {len(data.files)} fichiers")
+        return data
+
+    def current(self) -> ManifestData:
+        """
+        Manifeste à jour (appel bloquant : la première construction lit les
+        fichiers pour calculer leur empreinte, à lancer dans un thread)
+        Les empreintes des fichiers inchangés sont reprises de l'index précédent.
+        """
+        data = self._data
+        index_version = self.audio_index.version
+        if data is not None and data.index_version == index_version:
+            return data
+        with self._lock:
+            self.audio_index.files  # construit l'index s'il ne l'est pas encore
+            index_version = self.audio_index.version
+            if self._data is None or self._data.index_version != index_version:
+                previous = self._data
+                self._data = self._build(index_version)
+                if previous is None or previous.version != self._data.version:
+                    self._notify(self._data)
+            return self._data
+
+    def encoded_page(self, category: Optional[str], offset: int, limit: int) -> Tuple[ManifestData, EncodedBody]:
+        data = self.current()
+        key = (category, offset, limit)
+        body = data.encoded.get(key)
+        if body is None:
+            body = EncodedBody(data.page(category, offset, limit))
+            if len(data.encoded) < MAX_ENCODED_PAGES:
+                data.encoded[key] = body
+        return data, body
@@ -0,0 +1,185 @@
+"""
+Paquets audio pour le mode hors ligne de Kwezi
+Une archive zip par catégorie (ou pour tout le manifeste) au lieu d'une requête
+HTTP par fichier. Les archives sont construites à la demande, gardées sur disque
+et identifiées par la version du manifeste ; le mode delta (since=<version>)
+ne contient que les fichiers ajoutés ou modifiés depuis cette version.
+Chaque version du manifeste est archivée dès sa construction (et pas
+seulement quand un paquet est demandé), pour que tout client puisse
+demander un delta depuis la version qu'il a reçue.
+"""
+import json
+import os
+import threading
+import zipfile
+from typing import Dict, Optional
+
+AUDIO_PACKS_DIR = os.getenv("AUDIO_PACKS_DIR", "/tmp/kwezi_audio_packs")
+
+# Versions du manifeste conservées pour calculer les deltas
+MAX_MANIFEST_HISTORY = int(os.getenv("AUDIO_PACKS_HISTORY", "20"))
+
+ALL_CATEGORIES = "all"
+PACK_MANIFEST_NAME = "manifest.json"
+
+
+class AudioPack:
+    """Archive construite, prête à être servie"""
+
+    def __init__(self, path: str, etag: str, category: str, version: str, since: Optional[str], file_count: int):
+        self.path = path
+        self.etag = etag
+        self.category = category
+        self.version = version
+        # None quand le paquet est complet (pas de delta possible)
+        self.since = since
+        self.file_count = file_count
+        self.stat = os.stat(path)
+        self.filename = os.path.basename(path)
+
+
+class AudioPacks:
+    """Construction et cache disque des paquets audio"""
+
+    def __init__(self, audio_manifest, packs_dir: str = AUDIO_PACKS_DIR):
+        self.audio_manifest = audio_manifest
+        self.packs_dir = packs_dir
+        self.history_dir = os.path.join(packs_dir, "manifests")
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._history_lock = threading.Lock()
+        self._recorded_version: Optional[str] = None
+        audio_manifest.add_listener(self._record)
+
+    def _lock_for(self, name: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def _history_path(self, version: str) -> str:
+        return os.path.join(self.history_dir, f"{version}.json")
+
+    def _record(self, manifest):
+        """Garde la liste {section/fichier: sha256} de chaque version du manifeste"""
+        if self._recorded_version == manifest.version:
+            return
+        with self._history_lock:
+            os.makedirs(self.history_dir, exist_ok=True)
+            path = self._history_path(manifest.version)
+            if not os.path.exists(path):
+                hashes = {f"{entry['section']}/{entry['filename']}": entry["sha256"] for entry in manifest.files}
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(hashes, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+                self._prune_history()
+            self._recorded_version = manifest.version
+
+    def _prune_history(self):
+        entries = sorted(
+            (entry for entry in os.scandir(self.history_dir) if entry.name.endswith(".json")),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in entries[MAX_MANIFEST_HISTORY:]:
+            os.remove(entry.path)
+
+    def _previous_hashes(self, version: str) -> Optional[Dict[str, str]]:
+        # La version vient du client : ne garder que les caractères d'une empreinte
+        if not version or not version.isalnum():
+            return None
+        try:
+            with open(self._history_path(version), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _prune_packs(self, category: str, current_version: str):
+        """Supprime les paquets de cette catégorie construits pour une ancienne version"""
+        prefix = f"{category}-"
+        for entry in os.scandir(self.packs_dir):
+            if (
+                entry.is_file()
+                and entry.name.startswith(prefix)
+                and entry.name.endswith(".zip")
+                and current_version not in entry.name
+            ):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def get_pack(self, category: str, since: Optional[str] = None) -> Optional[AudioPack]:
+        """
+        Paquet d'une catégorie (ou 'all'), construit au premier appel
+        Appel bloquant (lecture et écriture de fichiers), à lancer dans un thread
+        Retourne None si la catégorie n'existe pas
+        """
+        manifest = self.audio_manifest.current()
+        if category != ALL_CATEGORIES and category not in manifest.sections:
+            return None
+        self._record(manifest)
+
+        entries = manifest.select(None if category == ALL_CATEGORIES else category)
+        deleted = []
+        previous = self._previous_hashes(since) if since and since != manifest.version else None
+        if since == manifest.version:
+            # Client déjà à jour : delta vide
+            previous = {f"{entry['section']}/{entry['filename']}": entry["sha256"] for entry in entries}
+        if previous is not None:
+            current_keys = set()
+            changed = []
+            for entry in entries:
+                key = f"{entry['section']}/{entry['filename']}"
+                current_keys.add(key)
+                if previous.get(key) != entry["sha256"]:
+                    changed.append(entry)
+            deleted = sorted(
+                key for key in previous
+                if key not in current_keys and (category == ALL_CATEGORIES or key.startswith(f"{category}/"))
+            )
+            entries = changed
+        else:
+            # Version inconnue (trop ancienne ou invalide) : paquet complet
+            since = None
+
+        name = f"{category}-{since}-{manifest.version}.zip" if since else f"{category}-{manifest.version}.zip"
+        path = os.path.join(self.packs_dir, name)
+        etag = f'"{name[:-4]}"'
+
+        # Un verrou par catégorie : la suppression des anciens paquets ne
+        # peut pas retirer une archive pendant qu'un autre thread la construit
+        with self._lock_for(category):
+            if not os.path.exists(path):
+                os.makedirs(self.packs_dir, exist_ok=True)
+                self._prune_packs(category, manifest.version)
+                self._build(path, manifest.version, category, since, entries, deleted)
+                print(f"📦 Paquet audio {name}: {len(entries)} fichiers")
+        return AudioPack(path, etag, category, manifest.version, since, len(entries))
+
+    def _build(self, path: str, version: str, category: str, since: Optional[str], entries, deleted):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        pack_manifest = {
+            "version": version,
+            "category": category,
+            "since": since,
+            "files": entries,
+            "deleted": deleted,
+        }
+        # Les fichiers m4a sont déjà compressés : stockage sans compression
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_STORED) as archive:
+            archive.writestr(PACK_MANIFEST_NAME, json.dumps(pack_manifest, ensure_ascii=False))
+            for entry in entries:
+                audio_file = self.audio_manifest.audio_index.find(entry["section"], entry["filename"])
+                if audio_file is not None:
+                    archive.write(audio_file.path, f"{entry['section']}/{entry['filename']}")
+        os.replace(tmp_path, path)
+
+    def list_packs(self) -> dict:
+        """Catégories disponibles avec leur nombre de fichiers et leur taille"""
+        manifest = self.audio_manifest.current()
+        packs = {
+            section: {"count": len(entries), "size": sum(entry["size"] for entry in entries)}
+            for section, entries in sorted(manifest.sections.items())
+        }
+        packs[ALL_CATEGORIES] = {"count": len(manifest.files), "size": manifest.total_size}
+        return {"version": manifest.version, "packs": packs}
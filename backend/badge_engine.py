@@ -0,0 +1,99 @@
+"""
+Moteur de badges pour Kwezi
+Règles de déblocage côté serveur (mêmes règles que frontend/utils/badgeSystem.ts)
+évaluées en une requête : statistiques, règles et déblocage atomique
+"""
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple
+
+from database import badges_repository
+from user_stats import get_user_stats
+
+
+class BadgeRule(NamedTuple):
+    id: str
+    name: str
+    description: str
+    condition: Callable[[dict], bool]
+
+
+BADGE_RULES: List[BadgeRule] = [
+    BadgeRule(
+        "first-word", "Premier Mot",
+        "Tu as appris ton premier mot en shimaoré!",
+        lambda stats: stats["words_learned"] >= 1,
+    ),
+    BadgeRule(
+        "word-collector", "Collectionneur de Mots",
+        "Tu connais 10 mots dans les langues de Mayotte!",
+        lambda stats: stats["words_learned"] >= 10,
+    ),
+    BadgeRule(
+        "ylang-ylang-master", "Maître Ylang-Ylang",
+        "Tu as obtenu 100 points au total!",
+        lambda stats: stats["total_score"] >= 100,
+    ),
+    BadgeRule(
+        "perfect-score", "Score Parfait",
+        "Tu as obtenu 100% à un exercice!",
+        lambda stats: stats["perfect_scores"] >= 1,
+    ),
+    BadgeRule(
+        "game-master", "Maître des Jeux",
+        "Tu as joué à tous les types de jeux!",
+        lambda stats: stats["completed_exercises"] >= 5,
+    ),
+    BadgeRule(
+        "daily-learner", "Apprenant Quotidien",
+        "Tu apprends tous les jours pendant une semaine!",
+        lambda stats: stats["learning_days"] >= 7,
+    ),
+    BadgeRule(
+        "polyglot-kid", "Petit Polyglotte",
+        "Tu connais des mots dans les 3 langues!",
+        lambda stats: stats["words_learned"] >= 5 and stats["completed_exercises"] >= 3,
+    ),
+    BadgeRule(
+        "mayotte-champion", "Champion de Mayotte",
+        "Tu es devenu expert dans toutes les catégories!",
+        lambda stats: stats["average_score"] >= 80 and stats["words_learned"] >= 50,
+    ),
+]
+
+BADGES_BY_ID: Dict[str, BadgeRule] = {rule.id: rule for rule in BADGE_RULES}
+
+
+def earned_badges(stats: dict) -> List[str]:
+    """Identifiants des badges dont la condition est remplie"""
+    return [rule.id for rule in BADGE_RULES if rule.condition(stats)]
+
+
+async def unlock_badges(user_name: str, badge_ids: List[str]) -> Dict[str, List[str]]:
+    """
+    Débloque des badges en une écriture ($addToSet + upsert)
+    Retourne tous les badges de l'utilisateur et ceux qui viennent d'être débloqués
+    """
+    before = await badges_repository.add_badges(user_name, badge_ids, datetime.utcnow())
+    previous = before.get("badges", []) if before else []
+    newly_unlocked = [badge_id for badge_id in badge_ids if badge_id not in previous]
+    badges = previous + [badge_id for badge_id in dict.fromkeys(newly_unlocked)]
+    return {"badges": badges, "newly_unlocked": newly_unlocked}
+
+
+async def evaluate_badges(user_name: str) -> dict:
+    """Calcule les statistiques, évalue toutes les règles et débloque les badges gagnés"""
+    stats = await get_user_stats(user_name)
+    user_badges = await badges_repository.find_by_user(user_name)
+    current = user_badges.get("badges", []) if user_badges else []
+    missing = [badge_id for badge_id in earned_badges(stats) if badge_id not in current]
+    if missing:
+        # Écriture seulement s'il y a du nouveau ; $addToSet reste sûr en cas d'appels concurrents
+        result = await unlock_badges(user_name, missing)
+    else:
+        result = {"badges": current, "newly_unlocked": []}
+    return {
+        "user_name": user_name,
+        "stats": stats,
+        "badges": result["badges"],
+        "newly_unlocked": result["newly_unlocked"],
+    }
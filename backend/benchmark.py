@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Banc d'essai local et reproductible du backend Kwezi
+L'application (server:app) tourne dans le processus, appelée par httpx via
+ASGITransport : pas de réseau, seul le code du backend est mesuré. La base
+de test est recréée à chaque lancement depuis db_backup/mayotte_app/*.bson.
+
+Des utilisateurs virtuels concurrents rejouent le parcours de l'application
+mobile (ouverture → apprendre → jeux → badges → audio) ; le résultat (débit,
+latences p50/p90/p99 par étape) est écrit en JSON pour comparer les commits.
+
+Usage (depuis backend/):
+    python benchmark.py --users 20 --duration 30 --output bench.json
+    python benchmark.py --compare bench.json --fail-on-regression
+    python benchmark.py --memory      # sans mongod (pip install mongomock-motor)
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+SEED_DIR = os.path.join(BACKEND_DIR, "db_backup", "mayotte_app")
+REPO_AUDIO_DIR = os.path.join(os.path.dirname(BACKEND_DIR), "frontend", "assets", "audio")
+
+# Jamais de banc d'essai sur la base de production
+PRODUCTION_DB_NAME = "mayotte_app"
+BENCHMARK_DB_NAME = "kwezi_benchmark"
+
+BASE_URL = "http://kwezi.benchmark"
+AUDIO_STATUSES = (200, 206, 304, 404)  # un mot sans fichier audio n'est pas une erreur
+
+
+def configure_environment(args):
+    """Variables lues à l'import de server : à définir avant de l'importer"""
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = args.db_name
+    scratch = tempfile.mkdtemp(prefix="kwezi_benchmark_")
+    os.environ.setdefault("WRITE_BEHIND_SPOOL_DIR", os.path.join(scratch, "write_behind"))
+    os.environ.setdefault("BACKUP_DIR", os.path.join(scratch, "backups"))
+    if os.path.isdir(REPO_AUDIO_DIR):
+        os.environ.setdefault("AUDIO_ASSETS_DIR", REPO_AUDIO_DIR)
+
+
+def use_in_memory_mongo():
+    """Remplace MongoDB par mongomock (résultats indicatifs : pas de réseau ni de mongod)"""
+    try:
+        import mongomock
+        import mongomock_motor
+    except ImportError:
+        sys.exit("❌ --memory nécessite mongomock-motor (pip install mongomock-motor)")
+    import motor.motor_asyncio
+    import pymongo
+    pymongo.MongoClient = mongomock.MongoClient
+    motor.motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+
+
+def load_seed_documents() -> Dict[str, List[dict]]:
+    from bson import decode_all
+
+    documents = {}
+    for path in sorted(glob.glob(os.path.join(SEED_DIR, "*.bson"))):
+        with open(path, "rb") as f:
+            documents[os.path.basename(path)[:-len(".bson")]] = decode_all(f.read())
+    return documents
+
+
+async def seed_database(db, documents: Dict[str, List[dict]]):
+    for name, docs in documents.items():
+        await db[name].drop()
+        if docs:
+            await db[name].insert_many([dict(doc) for doc in docs])
+        print(f"🌱 {name}: {len(docs)} documents")
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LatencyRecorder:
+    """Durées et codes HTTP par étape du parcours"""
+
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def record(self, step: str, duration: float, status: Optional[int], ok: bool):
+        self.durations.setdefault(step, []).append(duration)
+        codes = self.statuses.setdefault(step, {})
+        key = str(status) if status is not None else "exception"
+        codes[key] = codes.get(key, 0) + 1
+        if not ok:
+            self.errors[step] = self.errors.get(step, 0) + 1
+
+    def reset(self):
+        self.__init__()
+
+    def summary(self, elapsed: float) -> Tuple[dict, dict]:
+        steps = {}
+        for step, durations in sorted(self.durations.items()):
+            values = sorted(durations)
+            steps[step] = {
+                "requests": len(values),
+                "errors": self.errors.get(step, 0),
+                "statuses": self.statuses[step],
+                "throughput_rps": round(len(values) / elapsed, 2),
+                "mean_ms": round(sum(values) / len(values) * 1000, 3),
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p90_ms": round(percentile(values, 90) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+                "max_ms": round(values[-1] * 1000, 3),
+            }
+        everything = sorted(d for durations in self.durations.values() for d in durations)
+        totals = {
+            "requests": len(everything),
+            "errors": sum(self.errors.values()),
+            "throughput_rps": round(len(everything) / elapsed, 2),
+            "p50_ms": round(percentile(everything, 50) * 1000, 3),
+            "p90_ms": round(percentile(everything, 90) * 1000, 3),
+            "p99_ms": round(percentile(everything, 99) * 1000, 3),
+        }
+        return totals, steps
+
+
+class MobileUser:
+    """Un utilisateur de l'application mobile (tirages déterministes via sa graine)"""
+
+    def __init__(self, client, recorder: LatencyRecorder, dataset: dict, index: int, seed: int, think_time: float):
+        self.client = client
+        self.recorder = recorder
+        self.dataset = dataset
+        self.random = random.Random(seed * 1000 + index)
+        self.user_id = f"benchmark_user_{index}"
+        self.user_name = f"Benchmark {index}"
+        self.think_time = think_time
+
+    async def step(self, step: str, method: str, url: str, expected=(200,), **kwargs):
+        start = time.perf_counter()
+        status = None
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            status = response.status_code
+        except Exception as e:
+            print(f"❌ {step}: {e}")
+        self.recorder.record(step, time.perf_counter() - start, status, status in expected)
+        if self.think_time:
+            await asyncio.sleep(self.think_time)
+
+    async def open_app(self):
+        await self.step("POST /api/users/register", "POST", "/api/users/register", json={"user_id": self.user_id})
+        await self.step("GET /api/users/{user_id}", "GET", f"/api/users/{self.user_id}")
+        await self.step("GET /api/audio/manifest", "GET", "/api/audio/manifest")
+
+    async def learn(self):
+        category = self.random.choice(self.dataset["categories"])
+        await self.step("GET /api/words?category", "GET", "/api/words", params={"category": category})
+        for word_id in self.random.sample(self.dataset["word_ids"], 2):
+            await self.step("GET /api/words/{word_id}", "GET", f"/api/words/{word_id}")
+        await self.step(
+            "GET /api/premium/words", "GET", "/api/premium/words",
+            params={"user_id": self.user_id, "category": category},
+        )
+
+    async def games(self):
+        await self.step("GET /api/quiz", "GET", "/api/quiz", params={"count": 10})
+        await self.step("GET /api/sentences", "GET", "/api/sentences", params={"limit": 20})
+        score = self.random.randint(0, 100)
+        await self.step("POST /api/progress", "POST", "/api/progress", json={
+            "user_name": self.user_name,
+            "exercise_id": self.random.choice(self.dataset["exercise_ids"]),
+            "score": score,
+        })
+        await self.step(
+            "POST /api/users/{user_id}/activity", "POST", f"/api/users/{self.user_id}/activity",
+            params={"words_learned": self.random.randint(1, 10), "score": score},
+        )
+
+    async def badges(self):
+        await self.step("GET /api/stats/{user_name}", "GET", f"/api/stats/{self.user_name}")
+        await self.step("POST /api/badges/{user_name}/evaluate", "POST", f"/api/badges/{self.user_name}/evaluate")
+        await self.step("GET /api/badges/{user_name}", "GET", f"/api/badges/{self.user_name}")
+
+    async def audio(self):
+        await self.step("GET /api/audio/info", "GET", "/api/audio/info")
+        for word_id in self.random.sample(self.dataset["word_ids"], 2):
+            lang = self.random.choice(("shimaore", "kibouchi"))
+            await self.step(
+                "GET /api/words/{word_id}/audio/{lang}", "GET", f"/api/words/{word_id}/audio/{lang}",
+                expected=AUDIO_STATUSES,
+            )
+
+    async def session(self, deadline: float):
+        await self.open_app()
+        while time.perf_counter() < deadline:
+            for flow in (self.learn, self.games, self.badges, self.audio):
+                await flow()
+                if time.perf_counter() >= deadline:
+                    break
+
+
+def build_dataset(documents: Dict[str, List[dict]]) -> dict:
+    words = documents.get("words", [])
+    return {
+        "categories": sorted({word["category"] for word in words if word.get("category")}),
+        "word_ids": [str(word["_id"]) for word in words],
+        "exercise_ids": [str(exercise["_id"]) for exercise in documents.get("exercises", [])] or ["benchmark"],
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(args) -> dict:
+    import httpx
+
+    sys.path.insert(0, BACKEND_DIR)
+    import server
+    from database import db
+
+    documents = load_seed_documents()
+    await seed_database(db, documents)
+    dataset = build_dataset(documents)
+
+    await server.app.router.startup()
+    recorder = LatencyRecorder()
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url=BASE_URL, timeout=60) as client:
+            users = [
+                MobileUser(client, recorder, dataset, i, args.seed, args.think_ms / 1000)
+                for i in range(args.users)
+            ]
+            if args.warmup > 0:
+                deadline = time.perf_counter() + args.warmup
+                await asyncio.gather(*(user.session(deadline) for user in users))
+                print(f"🔥 Échauffement: {sum(len(d) for d in recorder.durations.values())} requêtes")
+                recorder.reset()
+
+            start = time.perf_counter()
+            deadline = start + args.duration
+            await asyncio.gather(*(user.session(deadline) for user in users))
+            elapsed = time.perf_counter() - start
+    finally:
+        await server.app.router.shutdown()
+
+    totals, steps = recorder.summary(elapsed)
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mongo": "memory" if args.memory else args.mongo_url,
+            "users": args.users,
+            "duration_seconds": round(elapsed, 3),
+            "warmup_seconds": args.warmup,
+            "think_ms": args.think_ms,
+            "seed": args.seed,
+        },
+        "totals": totals,
+        "steps": steps,
+    }
+
+
+def _delta(current: float, previous: float) -> Optional[float]:
+    if not previous:
+        return None
+    return (current - previous) / previous * 100
+
+
+def compare_results(results: dict, baseline: dict, threshold: float) -> Tuple[List[str], List[str]]:
+    """Tableau des écarts avec une exécution de référence et liste des régressions"""
+    lines = [f"{'étape':<42} {'p50 ms':>18} {'p90 ms':>18} {'req/s':>18}"]
+    regressions = []
+
+    def cell(current: float, previous: Optional[float]) -> str:
+        delta = _delta(current, previous) if previous is not None else None
+        return f"{current:>9.2f}" + (f" ({delta:+6.1f}%)" if delta is not None else " " * 10)
+
+    rows = [("TOTAL", results["totals"], baseline.get("totals", {}))]
+    rows += [(step, stats, baseline.get("steps", {}).get(step, {})) for step, stats in results["steps"].items()]
+    for step, stats, previous in rows:
+        lines.append(
+            f"{step:<42} {cell(stats['p50_ms'], previous.get('p50_ms'))}"
+            f" {cell(stats['p90_ms'], previous.get('p90_ms'))}"
+            f" {cell(stats['throughput_rps'], previous.get('throughput_rps'))}"
+        )
+        p90_delta = _delta(stats["p90_ms"], previous.get("p90_ms"))
+        if p90_delta is not None and p90_delta > threshold:
+            regressions.append(f"{step}: p90 {previous['p90_ms']:.2f} → {stats['p90_ms']:.2f} ms ({p90_delta:+.1f}%)")
+    throughput_delta = _delta(results["totals"]["throughput_rps"], baseline.get("totals", {}).get("throughput_rps"))
+    if throughput_delta is not None and throughput_delta < -threshold:
+        regressions.append(f"débit total {throughput_delta:+.1f}%")
+    return lines, regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai local du backend Kwezi")
+    parser.add_argument("--users", type=int, default=10, help="utilisateurs virtuels concurrents")
+    parser.add_argument("--duration", type=float, default=20, help="durée mesurée (secondes)")
+    parser.add_argument("--warmup", type=float, default=3, help="échauffement non mesuré (secondes)")
+    parser.add_argument("--think-ms", type=float, default=0, help="pause entre deux requêtes d'un utilisateur")
+    parser.add_argument("--seed", type=int, default=42, help="graine des tirages (reproductibilité)")
+    parser.add_argument("--mongo-url", default=os.getenv("BENCHMARK_MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default=BENCHMARK_DB_NAME, help="base recréée à chaque lancement")
+    parser.add_argument("--memory", action="store_true", help="MongoDB en mémoire (mongomock-motor)")
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--compare", help="résultats JSON de référence")
+    parser.add_argument("--threshold", type=float, default=20, help="régression tolérée (%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="code de sortie 1 si régression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.db_name == PRODUCTION_DB_NAME:
+        sys.exit(f"❌ La base {PRODUCTION_DB_NAME} est recréée par le banc d'essai : choisir une autre base")
+
+    configure_environment(args)
+    if args.memory:
+        use_in_memory_mongo()
+
+    results = asyncio.run(run_benchmark(args))
+    totals = results["totals"]
+    print(
+        f"📊 {totals['requests']} requêtes en {results['meta']['duration_seconds']}s"
+        f" ({totals['throughput_rps']} req/s), p50 {totals['p50_ms']} ms,"
+        f" p90 {totals['p90_ms']} ms, p99 {totals['p99_ms']} ms, {totals['errors']} erreurs"
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"💾 Résultats: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines, regressions = compare_results(results, baseline, args.threshold)
+        print(f"\nComparaison avec {args.compare} ({baseline['meta'].get('git_revision')}):")
+        print("\n".join(lines))
+        if regressions:
+            print(f"\n⚠️ Régressions (> {args.threshold:g}%):")
+            for regression in regressions:
+                print(f"  - {regression}")
+            if args.fail_on_regression:
+                sys.exit(1)
+    if totals["errors"]:
+        sys.exit(f"❌ {totals['errors']} requêtes en erreur")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,23 @@ Version complète avec conjugaison française correcte
 """
 
 import uuid
+from itertools import islice
 from dotenv import load_dotenv
 load_dotenv()
 
-from pymongo import MongoClient
-import os
+from database import get_sync_db
+from french_conjugations import FRENCH_CONJUGATIONS, MissingConjugationError, conjugate_french, missing_conjugations
+
+SENTENCE_PRONOUNS = ('je', 'tu', 'il', 'nous', 'vous', 'ils')
+SENTENCE_TENSES = ('present', 'past', 'future')
+TENSE_DIFFICULTY = {'present': 1, 'past': 2, 'future': 3}
+
+# Taille des lots envoyés à MongoDB pendant la génération des phrases
+SENTENCE_INSERT_CHUNK = 500
 
 def get_database():
-    """Connexion à la base de données"""
-    MONGO_URL = os.getenv('MONGO_URL')
-    DB_NAME = os.getenv('DB_NAME', 'mayotte_app')
-    client = MongoClient(MONGO_URL)
-    return client[DB_NAME]
+    """Connexion à la base de données (pool de connexions partagé)"""
+    return get_sync_db()
 
 class ConjugationEngine:
     def __init__(self):
@@ -56,7 +61,7 @@ class ConjugationEngine:
         }
         
         # Conjugaisons kibouchi
-        # Règles: Présent = supprimer "m", Passé = remplacer "m" par "n", Futur = remplacer "m" par "Mbou"
+        # Règles: Présent = infinitif (avec le "m"), Passé = remplacer "m" par "n", Futur = remplacer "m" par "Mbou"
         self.kibouchi_pronouns = {
             'je': 'zahou',
             'tu': 'anaou', 
@@ -92,160 +97,18 @@ class ConjugationEngine:
             }
         }
         
-        # DICTIONNAIRE COMPLET DE CONJUGAISONS FRANÇAISES
-        self.french_conjugation = {
-            'present': {
-                'je': {
-                    'parler': 'je parle',
-                    'manger': 'je mange', 
-                    'jouer': 'je joue',
-                    'marcher': 'je marche',
-                    'courir': 'je cours',
-                    'dormir': 'je dors',
-                    'boire': 'je bois',
-                    'voir': 'je vois',
-                    'avoir': "j'ai",
-                    'être': 'je suis',
-                    'faire': 'je fais',
-                    'aller': 'je vais',
-                    'venir': 'je viens',
-                    'prendre': 'je prends',
-                    'donner': 'je donne',
-                    'regarder': 'je regarde',
-                    'écouter': "j'écoute",
-                    'lire': 'je lis',
-                    'écrire': "j'écris",
-                    'chanter': 'je chante',
-                    'danser': 'je danse',
-                    'travailler': 'je travaille',
-                    'aimer': "j'aime"
-                },
-                'tu': {
-                    'parler': 'tu parles',
-                    'manger': 'tu manges',
-                    'jouer': 'tu joues', 
-                    'marcher': 'tu marches',
-                    'courir': 'tu cours',
-                    'dormir': 'tu dors',
-                    'boire': 'tu bois',
-                    'voir': 'tu vois',
-                    'avoir': 'tu as',
-                    'être': 'tu es',
-                    'faire': 'tu fais',
-                    'aller': 'tu vas',
-                    'venir': 'tu viens',
-                    'prendre': 'tu prends',
-                    'donner': 'tu donnes',
-                    'regarder': 'tu regardes',
-                    'écouter': 'tu écoutes',
-                    'lire': 'tu lis',
-                    'écrire': 'tu écris',
-                    'chanter': 'tu chantes',
-                    'danser': 'tu danses',
-                    'travailler': 'tu travailles',
-                    'aimer': 'tu aimes'
-                },
-                'il': {
-                    'parler': 'il parle',
-                    'manger': 'il mange',
-                    'jouer': 'il joue',
-                    'marcher': 'il marche',
-                    'courir': 'il court',
-                    'dormir': 'il dort',
-                    'boire': 'il boit',
-                    'voir': 'il voit',
-                    'avoir': 'il a',
-                    'être': 'il est',
-                    'faire': 'il fait',
-                    'aller': 'il va',
-                    'venir': 'il vient',
-                    'prendre': 'il prend',
-                    'donner': 'il donne',
-                    'regarder': 'il regarde',
-                    'écouter': 'il écoute',
-                    'lire': 'il lit',
-                    'écrire': 'il écrit',
-                    'chanter': 'il chante',
-                    'danser': 'il danse',
-                    'travailler': 'il travaille',
-                    'aimer': 'il aime'
-                },
-                'nous': {
-                    'parler': 'nous parlons',
-                    'manger': 'nous mangeons',
-                    'jouer': 'nous jouons',
-                    'marcher': 'nous marchons',
-                    'courir': 'nous courons',
-                    'dormir': 'nous dormons',
-                    'boire': 'nous buvons',
-                    'voir': 'nous voyons',
-                    'avoir': 'nous avons',
-                    'être': 'nous sommes',
-                    'faire': 'nous faisons',
-                    'aller': 'nous allons',
-                    'venir': 'nous venons',
-                    'prendre': 'nous prenons',
-                    'donner': 'nous donnons',
-                    'regarder': 'nous regardons',
-                    'écouter': 'nous écoutons',
-                    'lire': 'nous lisons',
-                    'écrire': 'nous écrivons',
-                    'chanter': 'nous chantons',
-                    'danser': 'nous dansons',
-                    'travailler': 'nous travaillons',
-                    'aimer': 'nous aimons'
-                },
-                'vous': {
-                    'parler': 'vous parlez',
-                    'manger': 'vous mangez',
-                    'jouer': 'vous jouez',
-                    'marcher': 'vous marchez',
-                    'courir': 'vous courez',
-                    'dormir': 'vous dormez',
-                    'boire': 'vous buvez',
-                    'voir': 'vous voyez',
-                    'avoir': 'vous avez',
-                    'être': 'vous êtes',
-                    'faire': 'vous faites',
-                    'aller': 'vous allez',
-                    'venir': 'vous venez',
-                    'prendre': 'vous prenez',
-                    'donner': 'vous donnez',
-                    'regarder': 'vous regardez',
-                    'écouter': 'vous écoutez',
-                    'lire': 'vous lisez',
-                    'écrire': 'vous écrivez',
-                    'chanter': 'vous chantez',
-                    'danser': 'vous dansez',
-                    'travailler': 'vous travaillez',
-                    'aimer': 'vous aimez'
-                },
-                'ils': {
-                    'parler': 'ils parlent',
-                    'manger': 'ils mangent',
-                    'jouer': 'ils jouent',
-                    'marcher': 'ils marchent',
-                    'courir': 'ils courent',
-                    'dormir': 'ils dorment',
-                    'boire': 'ils boivent',
-                    'voir': 'ils voient',
-                    'avoir': 'ils ont',
-                    'être': 'ils sont',
-                    'faire': 'ils font',
-                    'aller': 'ils vont',
-                    'venir': 'ils viennent',
-                    'prendre': 'ils prennent',
-                    'donner': 'ils donnent',
-                    'regarder': 'ils regardent',
-                    'écouter': 'ils écoutent',
-                    'lire': 'ils lisent',
-                    'écrire': 'ils écrivent',
-                    'chanter': 'ils chantent',
-                    'danser': 'ils dansent',
-                    'travailler': 'ils travaillent',
-                    'aimer': 'ils aiment'
-                }
-            }
+        # DICTIONNAIRE COMPLET DE CONJUGAISONS FRANÇAISES (table partagée)
+        self.french_conjugation = FRENCH_CONJUGATIONS
+        
+        # Têtes de phrase précalculées pour la conjugaison par lots :
+        # pronom shimaoré + préfixe du temps, pronom kibouchi
+        self.shimaore_heads = {
+            (tense, pronoun): f"{self.pronouns['shimaore'][pronoun]} {prefix}"
+            for tense, prefixes in self.shimaore_conjugation.items()
+            for pronoun, prefix in prefixes.items()
+        }
+        self.kibouchi_heads = {
+            pronoun: f"{kibouchi_pronoun} " for pronoun, kibouchi_pronoun in self.kibouchi_pronouns.items()
         }
     
     def get_shimaore_radical(self, infinitive):
@@ -307,16 +170,15 @@ class ConjugationEngine:
     def conjugate_kibouchi(self, infinitive, pronoun, tense='present'):
         """
         Conjugue un verbe kibouchi selon les règles:
-        - PRÉSENT: supprimer le 'm' du verbe
+        - PRÉSENT: garder l'infinitif (avec le 'm')
         - PASSÉ: remplacer 'm' par 'n'
         - FUTUR: remplacer 'm' par 'Mbou'
         """
         pronoun_kibouchi = self.kibouchi_pronouns.get(pronoun, pronoun)
         
         if tense == 'present':
-            # Supprimer le 'm' initial
-            verb_conjugated = self.get_kibouchi_radical(infinitive)
-            return f"{pronoun_kibouchi} {verb_conjugated}"
+            # Le verbe reste à l'infinitif (cf. corriger_present_kibouchi.py)
+            return f"{pronoun_kibouchi} {infinitive}"
         
         elif tense == 'past':
             # Remplacer 'm' par 'n'
@@ -332,25 +194,53 @@ class ConjugationEngine:
     
     def conjugate_french(self, verb_fr, pronoun, tense='present'):
         """Conjugue un verbe français correctement"""
-        verb_normalized = verb_fr.lower()
-        
-        # Utiliser le dictionnaire de conjugaisons
-        if tense in self.french_conjugation and pronoun in self.french_conjugation[tense]:
-            if verb_normalized in self.french_conjugation[tense][pronoun]:
-                return self.french_conjugation[tense][pronoun][verb_normalized]
-        
-        # Conjugaison automatique basique pour les verbes du premier groupe
-        if verb_normalized.endswith('er') and tense == 'present':
-            radical = verb_normalized[:-2]
-            endings = {
-                'je': 'e', 'tu': 'es', 'il': 'e',
-                'nous': 'ons', 'vous': 'ez', 'ils': 'ent'
-            }
-            if pronoun in endings:
-                return f"{pronoun} {radical}{endings[pronoun]}"
-        
-        # Fallback 
-        return f"{pronoun} {verb_normalized}"
+        return conjugate_french(verb_fr, pronoun, tense)
+    
+    def kibouchi_forms(self, infinitive):
+        """Formes kibouchi d'un verbe pour chaque temps (sans pronom)"""
+        return {
+            'present': infinitive,
+            'past': self.conjugate_kibouchi_past(infinitive),
+            'future': self.conjugate_kibouchi_future(infinitive)
+        }
+    
+    def conjugate_batch(self, verbs, pronouns=SENTENCE_PRONOUNS, tenses=SENTENCE_TENSES):
+        """
+        Conjugue tous les verbes pour tous les pronoms et temps en une passe
+        Radicaux et formes kibouchi calculés une fois par verbe, têtes de phrase
+        précalculées : chaque phrase n'est plus qu'une concaténation.
+        Générateur de documents prêts à insérer dans la collection sentences.
+        MissingConjugationError si un verbe n'a pas sa conjugaison française.
+        """
+        for verb in verbs:
+            verb_fr = verb.get('french', '')
+            verb_shimaore = verb.get('shimaore', '')
+            verb_kibouchi = verb.get('kibouchi', '')
+            if not verb_fr or not verb_shimaore or not verb_kibouchi:
+                continue
+            
+            shimaore_radical = self.get_shimaore_radical(verb_shimaore)
+            kibouchi_forms = self.kibouchi_forms(verb_kibouchi)
+            
+            for tense in tenses:
+                for pronoun in pronouns:
+                    french = conjugate_french(verb_fr, pronoun, tense, strict=True)
+                    shimaore = self.shimaore_heads[(tense, pronoun)] + shimaore_radical
+                    kibouchi = self.kibouchi_heads[pronoun] + kibouchi_forms[tense]
+                    yield {
+                        'id': str(uuid.uuid4()),
+                        'type': 'conjugated_corrected',
+                        'french': french,
+                        'shimaore': shimaore,
+                        'kibouchi': kibouchi,
+                        'tense': tense,
+                        'subject': pronoun,
+                        'verb_infinitive_fr': verb_fr,
+                        'difficulty': TENSE_DIFFICULTY[tense],
+                        'french_words': french.split(),
+                        'shimaore_words': shimaore.split(),
+                        'kibouchi_words': kibouchi.split()
+                    }
     
     def create_sentence(self, subject_fr, verb_fr, verb_shimaore, verb_kibouchi, object_fr=None, object_shimaore=None, object_kibouchi=None, tense='present'):
         """Crée une phrase complète en français, shimaoré et kibouchi"""
@@ -395,6 +285,24 @@ def get_available_verbs():
     
     return verbs
 
+def check_french_conjugations(verbs):
+    """Arrête la génération (avant toute suppression) si un verbe n'a pas sa table française"""
+    missing = missing_conjugations(verb['french'] for verb in verbs if verb.get('french'))
+    if missing:
+        print(f"❌ {len(missing)} verbes sans conjugaison française : {', '.join(missing)}")
+        raise MissingConjugationError(f"Conjugaisons manquantes: {', '.join(missing)}")
+
+def insert_sentences(sentences_collection, sentences, chunk_size=SENTENCE_INSERT_CHUNK):
+    """Insère les phrases par lots bornés au fur et à mesure de leur génération"""
+    total = 0
+    sentences = iter(sentences)
+    while True:
+        chunk = list(islice(sentences, chunk_size))
+        if not chunk:
+            return total
+        sentences_collection.insert_many(chunk, ordered=False)
+        total += len(chunk)
+
 def create_sentence_database():
     """Crée une base de données de phrases conjuguées correctement"""
     print("🏗️ Création de la base de données de phrases avec conjugaison correcte...")
@@ -402,9 +310,6 @@ def create_sentence_database():
     db = get_database()
     sentences_collection = db.sentences
     
-    # Supprimer toutes les phrases existantes
-    sentences_collection.delete_many({})
-    
     # Obtenir les verbes
     verbs = get_available_verbs()
     if not verbs:
@@ -412,49 +317,17 @@ def create_sentence_database():
         return 0
     
     print(f"📝 {len(verbs)} verbes trouvés")
+    check_french_conjugations(verbs)
     
-    # Moteur de conjugaison
-    engine = ConjugationEngine()
-    
-    sentences_to_insert = []
-    pronouns = ['je', 'tu', 'il', 'nous', 'vous', 'ils']
-    tenses = ['present']  # Commencer par le présent
-    
-    # Créer des phrases simples (sujet + verbe)
-    for verb in verbs[:10]:  # Limiter à 10 verbes pour commencer
-        for pronoun in pronouns:
-            for tense in tenses:
-                try:
-                    # Phrase sans objet
-                    sentence = engine.create_sentence(
-                        subject_fr=pronoun,
-                        verb_fr=verb['french'],
-                        verb_shimaore=verb['shimaore'],
-                        verb_kibouchi=verb.get('kibouchi', ''),
-                        tense=tense
-                    )
-                    
-                    sentence_doc = {
-                        'id': str(uuid.uuid4()),
-                        'type': 'simple_corrected',
-                        'difficulty': 1,
-                        'french': sentence['french'],
-                        'shimaore': sentence['shimaore'],
-                        'kibouchi': sentence['kibouchi'],
-                        'tense': tense,
-                        'shimaore_words': sentence['words']['shimaore'],
-                        'kibouchi_words': sentence['words']['kibouchi']
-                    }
-                    sentences_to_insert.append(sentence_doc)
-                except Exception as e:
-                    print(f"⚠️ Erreur pour {verb['french']} + {pronoun}: {str(e)}")
+    # Supprimer toutes les phrases existantes
+    sentences_collection.delete_many({})
     
-    # Insérer dans la base de données
-    if sentences_to_insert:
-        sentences_collection.insert_many(sentences_to_insert)
-        print(f"✅ {len(sentences_to_insert)} phrases créées avec conjugaison correcte")
+    # Tous les verbes, tous les pronoms, tous les temps
+    engine = ConjugationEngine()
+    total = insert_sentences(sentences_collection, engine.conjugate_batch(verbs))
+    print(f"✅ {total} phrases créées avec conjugaison correcte")
     
-    return len(sentences_to_insert)
+    return total
 
 def test_conjugation():
     """Test du moteur de conjugaison"""
@@ -499,4 +372,4 @@ def main():
     # print(f"\n✅ {sentences_count} phrases créées")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
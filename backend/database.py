@@ -0,0 +1,431 @@
+"""
+Couche d'accès asynchrone à MongoDB (Motor) pour Kwezi
+Un pool de connexions partagé par tout le processus et un dépôt par
+collection, utilisés par tous les endpoints pour ne plus bloquer la
+boucle d'événements d'uvicorn
+"""
+import os
+import threading
+from collections import defaultdict
+from typing import List, Optional
+
+from bson import ObjectId
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient, ReturnDocument, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from metrics import mongo_command_listener
+from tracing import trace_command_listener
+from write_behind import APPLIED_EVENTS_FIELD
+
+load_dotenv()
+
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+DB_NAME = os.getenv("DB_NAME", "mayotte_app")
+
+# Réglages du pool (une seule instance Render, quelques dizaines de requêtes simultanées)
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Compteurs d'activité des pools de connexions (par serveur)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: defaultdict(int))
+
+    def _inc(self, event, key, delta=1):
+        with self._lock:
+            self._stats[f"{event.address[0]}:{event.address[1]}"][key] += delta
+
+    def pool_created(self, event):
+        self._inc(event, "pools_created")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._inc(event, "pools_cleared")
+
+    def pool_closed(self, event):
+        self._inc(event, "pools_closed")
+
+    def connection_created(self, event):
+        self._inc(event, "connections_created")
+        self._inc(event, "connections_open")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._inc(event, "connections_closed")
+        self._inc(event, "connections_open", -1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._inc(event, "checkout_failures")
+
+    def connection_checked_out(self, event):
+        self._inc(event, "checkouts")
+        self._inc(event, "connections_in_use")
+
+    def connection_checked_in(self, event):
+        self._inc(event, "connections_in_use", -1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {address: dict(counters) for address, counters in self._stats.items()}
+
+
+pool_stats_listener = PoolStatsListener()
+
+CLIENT_OPTIONS = {
+    "maxPoolSize": MONGO_MAX_POOL_SIZE,
+    "minPoolSize": MONGO_MIN_POOL_SIZE,
+    "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+    "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    "event_listeners": [pool_stats_listener, mongo_command_listener, trace_command_listener],
+}
+
+client = AsyncIOMotorClient(MONGO_URL, **CLIENT_OPTIONS)
+db = client[DB_NAME]
+
+# Client synchrone partagé pour le code qui tourne hors de la boucle
+# d'événements (DatabaseProtector, moteur de conjugaison, threads)
+_sync_client: Optional[MongoClient] = None
+_sync_client_lock = threading.Lock()
+
+
+def get_sync_client() -> MongoClient:
+    """Client pymongo partagé (créé à la première utilisation)"""
+    global _sync_client
+    if _sync_client is None:
+        with _sync_client_lock:
+            if _sync_client is None:
+                _sync_client = MongoClient(MONGO_URL, **CLIENT_OPTIONS)
+    return _sync_client
+
+
+def get_sync_db():
+    return get_sync_client()[DB_NAME]
+
+
+def close_clients():
+    """Ferme les pools de connexions (arrêt du serveur)"""
+    global _sync_client
+    client.close()
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+
+
+def get_pool_stats() -> dict:
+    """Statistiques des pools de connexions MongoDB"""
+    return {
+        "settings": {
+            "max_pool_size": MONGO_MAX_POOL_SIZE,
+            "min_pool_size": MONGO_MIN_POOL_SIZE,
+            "max_idle_time_ms": MONGO_MAX_IDLE_TIME_MS,
+            "wait_queue_timeout_ms": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        },
+        "sync_client_open": _sync_client is not None,
+        "servers": pool_stats_listener.snapshot(),
+    }
+
+
+# Dépendances FastAPI
+def get_client() -> AsyncIOMotorClient:
+    return client
+
+
+def get_db():
+    return db
+
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def to_object_id(value: str) -> Optional[ObjectId]:
+    """Convertit un identifiant en ObjectId, None s'il est invalide"""
+    if ObjectId.is_valid(value):
+        return ObjectId(value)
+    return None
+
+
+class WordsRepository:
+    """Accès à la collection words"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find_all(self) -> List[dict]:
+        return await self.collection.find({}).to_list(length=None)
+
+    async def find_sorted(self, query: dict, sort: list) -> List[dict]:
+        return await self.collection.find(query).sort(sort).to_list(length=None)
+
+    async def find_by_id(self, word_id: str) -> Optional[dict]:
+        object_id = to_object_id(word_id)
+        if object_id is None:
+            return None
+        return await self.collection.find_one({"_id": object_id})
+
+    async def find_by_legacy_id(self, word_id: str) -> Optional[dict]:
+        """Anciens documents identifiés par un champ 'id' texte"""
+        return await self.collection.find_one({"id": word_id})
+
+    async def count(self, query: Optional[dict] = None) -> int:
+        return await self.collection.count_documents(query or {})
+
+    async def insert(self, word: dict):
+        return await self.collection.insert_one(word)
+
+    async def insert_many(self, words: List[dict]):
+        return await self.collection.insert_many(words)
+
+    async def update(self, word_id: str, fields: dict):
+        return await self.collection.update_one({"_id": ObjectId(word_id)}, {"$set": fields})
+
+    async def delete(self, word_id: str):
+        return await self.collection.delete_one({"_id": ObjectId(word_id)})
+
+
+class SentencesRepository:
+    """Accès à la collection sentences"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find(self, query: Optional[dict] = None) -> List[dict]:
+        return await self.collection.find(query or {}).to_list(length=None)
+
+    async def count(self, query: Optional[dict] = None) -> int:
+        return await self.collection.count_documents(query or {})
+
+    async def sample(self, query: dict, size: int) -> List[dict]:
+        pipeline = [{"$match": query}, {"$sample": {"size": size}}]
+        return await self.collection.aggregate(pipeline).to_list(length=None)
+
+    async def sample_distinct(self, query: dict, size: int, field: str, limit: int) -> List[dict]:
+        """Échantillon aléatoire avec au plus un document par valeur de `field`"""
+        pipeline = [
+            {"$match": query},
+            {"$sample": {"size": size}},
+            {"$group": {"_id": f"${field}", "doc": {"$first": "$$ROOT"}}},
+            {"$replaceRoot": {"newRoot": "$doc"}},
+            {"$limit": limit},
+        ]
+        return await self.collection.aggregate(pipeline).to_list(length=None)
+
+
+class ExercisesRepository:
+    """Accès à la collection exercises"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find_all(self) -> List[dict]:
+        return await self.collection.find().to_list(length=None)
+
+    async def insert(self, exercise: dict):
+        return await self.collection.insert_one(exercise)
+
+    async def insert_many(self, exercises: List[dict]):
+        return await self.collection.insert_many(exercises)
+
+
+class UsersRepository:
+    """Accès à la collection users (système premium et Stripe)"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find_by_user_id(self, user_id: str) -> Optional[dict]:
+        # Identifiants internes de la file write-behind : jamais renvoyés aux clients
+        return await self.collection.find_one({"user_id": user_id}, {APPLIED_EVENTS_FIELD: 0})
+
+    async def find_by_customer_id(self, customer_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"stripe_customer_id": customer_id})
+
+    async def insert(self, user: dict):
+        return await self.collection.insert_one(user)
+
+    async def update_by_user_id(self, user_id: str, update: dict, upsert: bool = False):
+        return await self.collection.update_one({"user_id": user_id}, update, upsert=upsert)
+
+    async def update_by_id(self, object_id, update: dict):
+        return await self.collection.update_one({"_id": object_id}, update)
+
+    async def update_where(self, query: dict, update: dict, upsert: bool = False):
+        return await self.collection.update_one(query, update, upsert=upsert)
+
+    async def find_expired_premium_ids(self, now) -> List[str]:
+        documents = await self.collection.find(
+            {"is_premium": True, "premium_expires_at": {"$lt": now}}, {"user_id": 1}
+        ).to_list(length=None)
+        return [document["user_id"] for document in documents if "user_id" in document]
+
+    async def revoke_expired_premium(self, user_ids: List[str], now):
+        """Retire le premium sans toucher un abonnement renouvelé entre-temps"""
+        return await self.collection.update_many(
+            {"user_id": {"$in": user_ids}, "is_premium": True, "premium_expires_at": {"$lt": now}},
+            {"$set": {"is_premium": False, "updated_at": now}},
+        )
+
+    async def find_by_user_ids(self, user_ids: List[str]) -> List[dict]:
+        return await self.collection.find({"user_id": {"$in": user_ids}}).to_list(length=None)
+
+    async def bulk_write(self, operations: list):
+        return await self.collection.bulk_write(operations, ordered=False)
+
+
+class ProgressRepository:
+    """Accès à la collection user_progress"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find_by_user(self, user_name: str) -> List[dict]:
+        return await self.collection.find({"user_name": user_name}).to_list(length=None)
+
+    async def insert(self, progress: dict):
+        return await self.collection.insert_one(progress)
+
+    async def insert_many_once(self, progress: List[dict]):
+        """Insertion idempotente : les documents déjà présents (même _id) sont ignorés"""
+        try:
+            await self.collection.insert_many(progress, ordered=False)
+        except BulkWriteError as e:
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in e.details.get("writeErrors", [])):
+                raise
+
+
+class UserStatsRepository:
+    """Accès à la collection user_stats (statistiques agrégées par utilisateur)"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find_by_user(self, user_name: str) -> Optional[dict]:
+        return await self.collection.find_one({"user_name": user_name}, {APPLIED_EVENTS_FIELD: 0})
+
+    async def update_by_user(self, user_name: str, update: dict):
+        """Mise à jour d'un document existant (pas de création)"""
+        return await self.collection.update_one({"user_name": user_name}, update)
+
+    async def find_applied_events(self, user_names: List[str]) -> List[dict]:
+        """Documents existants de la liste : user_name et événements write-behind déjà comptés"""
+        return await self.collection.find(
+            {"user_name": {"$in": user_names}}, {"user_name": 1, APPLIED_EVENTS_FIELD: 1}
+        ).to_list(length=None)
+
+    async def bulk_write(self, operations: list):
+        return await self.collection.bulk_write(operations, ordered=False)
+
+    async def insert_if_absent(self, user_name: str, stats: dict):
+        return await self.collection.update_one(
+            {"user_name": user_name}, {"$setOnInsert": stats}, upsert=True
+        )
+
+
+class BadgesRepository:
+    """Accès à la collection user_badges"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find_by_user(self, user_name: str) -> Optional[dict]:
+        return await self.collection.find_one({"user_name": user_name})
+
+    async def insert(self, user_badges: dict):
+        return await self.collection.insert_one(user_badges)
+
+    async def update_by_user(self, user_name: str, update: dict):
+        return await self.collection.update_one({"user_name": user_name}, update)
+
+    async def add_badges(self, user_name: str, badge_ids: List[str], now) -> Optional[dict]:
+        """
+        Ajoute des badges en une seule écriture atomique ($addToSet, crée le
+        document si besoin) et retourne le document tel qu'il était avant
+        """
+        return await self.collection.find_one_and_update(
+            {"user_name": user_name},
+            {
+                "$addToSet": {"badges": {"$each": badge_ids}},
+                "$set": {"updated_at": now},
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+        )
+
+
+class StripeEventsRepository:
+    """Accès à la collection stripe_events (webhooks reçus, _id = id Stripe)"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def insert_if_new(self, event: dict) -> bool:
+        """False si l'événement a déjà été enregistré (renvoi par Stripe)"""
+        try:
+            await self.collection.insert_one(event)
+        except DuplicateKeyError:
+            return False
+        return True
+
+    async def claim_next(self, worker_id: str, now, lease_until) -> Optional[dict]:
+        """
+        Réserve le prochain événement disponible (en attente, ou en cours chez
+        un worker dont la réservation a expiré) ; available_at sert d'échéance
+        """
+        return await self.collection.find_one_and_update(
+            {"status": {"$in": ["pending", "processing"]}, "available_at": {"$lte": now}},
+            {
+                "$set": {"status": "processing", "worker": worker_id, "available_at": lease_until},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("available_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    @staticmethod
+    def _leased(event_id: str, worker_id: str) -> dict:
+        # Seul le worker qui détient encore la réservation peut conclure :
+        # après expiration, l'événement a pu être repris par un autre worker
+        return {"_id": event_id, "worker": worker_id, "status": "processing"}
+
+    async def mark_done(self, event_id: str, worker_id: str, outcome: str, now):
+        return await self.collection.update_one(
+            self._leased(event_id, worker_id),
+            {"$set": {"status": "done", "outcome": outcome, "processed_at": now}},
+        )
+
+    async def release(self, event_id: str, worker_id: str, error: str, retry_at):
+        return await self.collection.update_one(
+            self._leased(event_id, worker_id),
+            {"$set": {"status": "pending", "last_error": error, "available_at": retry_at}},
+        )
+
+    async def mark_failed(self, event_id: str, worker_id: str, error: str):
+        return await self.collection.update_one(
+            self._leased(event_id, worker_id), {"$set": {"status": "failed", "last_error": error}}
+        )
+
+
+words_repository = WordsRepository(db.words)
+sentences_repository = SentencesRepository(db.sentences)
+exercises_repository = ExercisesRepository(db.exercises)
+users_repository = UsersRepository(db.users)
+progress_repository = ProgressRepository(db.user_progress)
+badges_repository = BadgesRepository(db.user_badges)
+user_stats_repository = UserStatsRepository(db.user_stats)
+stripe_events_repository = StripeEventsRepository(db.stripe_events)
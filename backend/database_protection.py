@@ -12,24 +12,44 @@ Fonctionnalités :
 - Restauration d'urgence
 - Blocage des opérations dangereuses
 - Alertes en cas de tentative de suppression massive
+
+Format des sauvegardes : fichiers NDJSON compressés (gzip) écrits en flux
+depuis le curseur MongoDB (json_util, types BSON conservés). Une sauvegarde
+de base contient tous les mots ; les suivantes ne contiennent que les mots
+ajoutés, modifiés ou supprimés depuis la précédente (empreinte par document).
+La restauration rejoue la base puis les deltas jusqu'au fichier demandé.
+Les anciennes sauvegardes .json restent restaurables.
 """
 
 import os
 import json
+import time
+import threading
+import gzip
+import hashlib
 import datetime
+from contextlib import contextmanager
 from functools import wraps
-from pymongo import MongoClient
+from bson import BSON, json_util
 from dotenv import load_dotenv
 
 # Charger les variables d'environnement
 load_dotenv()
 
+# Pool de connexions partagé avec le serveur
+from database import DB_NAME, get_sync_client
+
 # Configuration
-MONGO_URL = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
-DB_NAME = os.getenv('DB_NAME', 'mayotte_app')
-BACKUP_DIR = '/app/backup_authentic_db'
+BACKUP_DIR = os.getenv('BACKUP_DIR', '/app/backup_authentic_db')
+BACKUP_STATE_FILE = 'backup_state.json'
+BACKUP_EXTENSION = '.ndjson.gz'
+# Nouvelle sauvegarde complète après ce nombre de deltas
+BACKUP_FULL_EVERY = int(os.getenv('BACKUP_FULL_EVERY', '50'))
+BACKUP_BATCH_SIZE = 500
 MIN_WORDS_THRESHOLD = 500  # Seuil minimum de mots pour considérer la DB comme valide
 MIN_CATEGORIES_THRESHOLD = 15  # Seuil minimum de catégories
+# Durée de vie des statistiques de santé (secondes) : invalidées à chaque écriture sur words
+HEALTH_STATS_TTL = int(os.getenv('HEALTH_STATS_TTL', '30'))
 
 # Créer le répertoire de sauvegarde
 os.makedirs(BACKUP_DIR, exist_ok=True)
@@ -38,31 +58,92 @@ class DatabaseProtector:
     """Classe de protection de la base de données"""
     
     def __init__(self):
-        self.client = MongoClient(MONGO_URL)
+        self.client = get_sync_client()
         self.db = self.client[DB_NAME]
         self.words_collection = self.db.words
         self.last_backup_file = None
+        # _health_lock protège les champs (tenu brièvement) ; _health_compute_lock
+        # évite plusieurs calculs simultanés sans bloquer invalidate_stats()
+        self._health_lock = threading.Lock()
+        self._health_compute_lock = threading.Lock()
+        self._health = None
+        self._health_loaded_at = None
+        self._health_generation = 0
     
-    def get_database_stats(self):
-        """Obtient les statistiques de la base de données"""
-        total_words = self.words_collection.count_documents({})
-        categories = self.words_collection.distinct("category")
-        
+    def _compute_health(self):
+        """
+        Statistiques et signature 'Au revoir' en une seule agrégation
+        (un $group par catégorie au lieu d'un count_documents par catégorie)
+        """
+        pipeline = [{"$group": {
+            "_id": "$category",
+            "count": {"$sum": 1},
+            # Kibouchi de "au revoir" (insensible à la casse), null si absent
+            "au_revoir_kibouchi": {"$max": {"$cond": [
+                {"$eq": [{"$toLower": {"$ifNull": ["$french", ""]}}, "au revoir"]},
+                {"$ifNull": ["$kibouchi", ""]},
+                None
+            ]}}
+        }}]
+        total_words = 0
         category_counts = {}
-        for category in categories:
-            count = self.words_collection.count_documents({"category": category})
-            category_counts[category] = count
+        au_revoir_kibouchi = None
+        for group in self.words_collection.aggregate(pipeline):
+            total_words += group["count"]
+            if group["_id"] is not None:
+                category_counts[group["_id"]] = group["count"]
+            if group.get("au_revoir_kibouchi") is not None:
+                au_revoir_kibouchi = group["au_revoir_kibouchi"]
         
-        return {
+        stats = {
             "total_words": total_words,
-            "total_categories": len(categories),
+            "total_categories": len(category_counts),
             "categories": category_counts,
             "timestamp": datetime.datetime.utcnow().isoformat()
         }
+        return stats, au_revoir_kibouchi
+    
+    def _cached_health(self):
+        # Appelé avec _health_lock
+        if self._health is not None and time.monotonic() - self._health_loaded_at <= HEALTH_STATS_TTL:
+            return self._health
+        return None
+    
+    def _current_health(self):
+        """Statistiques en cache (recalculées après expiration ou invalidation)"""
+        with self._health_lock:
+            health = self._cached_health()
+        if health is not None:
+            return health
+        with self._health_compute_lock:
+            with self._health_lock:
+                # Calculées par un autre thread pendant l'attente
+                health = self._cached_health()
+                generation = self._health_generation
+            if health is not None:
+                return health
+            health = self._compute_health()
+            with self._health_lock:
+                # Une écriture pendant le calcul : ne pas garder un résultat périmé
+                if generation == self._health_generation:
+                    self._health = health
+                    self._health_loaded_at = time.monotonic()
+            return health
+    
+    def invalidate_stats(self):
+        """À appeler après toute écriture sur la collection words"""
+        with self._health_lock:
+            self._health_generation += 1
+            self._health = None
+    
+    def get_database_stats(self):
+        """Obtient les statistiques de la base de données"""
+        stats, _ = self._current_health()
+        return dict(stats, categories=dict(stats["categories"]))
     
     def is_database_healthy(self):
         """Vérifie si la base de données contient des données authentiques"""
-        stats = self.get_database_stats()
+        stats, au_revoir_kibouchi = self._current_health()
         
         # Vérifications de base
         if stats["total_words"] < MIN_WORDS_THRESHOLD:
@@ -82,56 +163,205 @@ class DatabaseProtector:
             return False, f"Catégories essentielles manquantes: {missing_categories}"
         
         # Vérifier que "Au revoir" = "maeva" ou "maèva" (signature authentique)
-        au_revoir = self.words_collection.find_one({"french": {"$regex": "^au revoir$", "$options": "i"}})
-        if au_revoir:
-            kibouchi_au_revoir = au_revoir.get("kibouchi", "").lower()
+        if au_revoir_kibouchi is not None:
+            kibouchi_au_revoir = au_revoir_kibouchi.lower()
             if kibouchi_au_revoir not in ["maeva", "maèva"]:
                 return False, f"Traduction incorrecte pour 'Au revoir' - devrait être 'maeva' ou 'maèva'"
         
         return True, "Base de données authentique confirmée"
     
-    def create_backup(self, reason="manual"):
-        """Crée une sauvegarde complète de la base de données"""
-        timestamp = datetime.datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"backup_authentic_db_{timestamp}_{reason}.json"
-        backup_path = os.path.join(BACKUP_DIR, backup_filename)
+    # Sauvegardes incrémentales
+    
+    @staticmethod
+    def _fingerprint(word):
+        return hashlib.sha1(BSON.encode(word)).hexdigest()
+    
+    @staticmethod
+    def _path(filename):
+        return os.path.join(BACKUP_DIR, filename)
+    
+    def _load_state(self):
+        """Chaîne courante (base + deltas) et empreintes de la dernière sauvegarde"""
+        try:
+            with open(self._path(BACKUP_STATE_FILE), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        # Chaîne inutilisable si un de ses fichiers a disparu
+        if not all(os.path.exists(self._path(name)) for name in state.get("chain", [])):
+            return None
+        return state
+    
+    def _save_state(self, state):
+        tmp_path = self._path(BACKUP_STATE_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self._path(BACKUP_STATE_FILE))
+    
+    def _reset_state(self):
+        try:
+            os.remove(self._path(BACKUP_STATE_FILE))
+        except FileNotFoundError:
+            pass
+    
+    def create_backup(self, reason="manual", full=False):
+        """
+        Crée une sauvegarde en flux : complète (première, forcée ou tous les
+        BACKUP_FULL_EVERY deltas) ou delta des mots changés depuis la précédente
+        Sans changement, aucun fichier n'est écrit et la dernière sauvegarde est retournée
+        """
+        timestamp = datetime.datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
+        state = None if full else self._load_state()
+        if state and len(state["chain"]) > BACKUP_FULL_EVERY:
+            state = None
+        kind = "delta" if state else "base"
+        backup_filename = f"backup_authentic_db_{timestamp}_{reason}.{kind}{BACKUP_EXTENSION}"
+        backup_path = self._path(backup_filename)
+        tmp_path = backup_path + '.tmp'
+        
+        previous = state["fingerprints"] if state else {}
+        fingerprints = {}
+        changed = 0
+        watermark = None
         
         try:
-            # Exporter toutes les données
-            words = list(self.words_collection.find({}))
-            
-            # Convertir ObjectId en string et gérer les dates
-            for word in words:
-                if "_id" in word:
-                    word["_id"] = str(word["_id"])
-                if "created_at" in word:
-                    word["created_at"] = word["created_at"].isoformat() if hasattr(word["created_at"], 'isoformat') else str(word["created_at"])
-            
-            # Sauvegarder avec métadonnées
-            backup_data = {
-                "metadata": {
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                header = {
+                    "type": kind,
                     "timestamp": timestamp,
                     "reason": reason,
-                    "total_words": len(words),
-                    "db_name": DB_NAME
-                },
-                "words": words
-            }
+                    "db_name": DB_NAME,
+                    "parent": state["chain"][-1] if state else None,
+                }
+                f.write(json_util.dumps({"_meta": header}) + "\n")
+                
+                cursor = self.words_collection.find({}).sort("_id", 1).batch_size(BACKUP_BATCH_SIZE)
+                for word in cursor:
+                    # Clé JSON étendue : l'_id exact (ObjectId ou texte) est retrouvé pour les suppressions
+                    key = json_util.dumps(word["_id"])
+                    fingerprint = self._fingerprint(word)
+                    fingerprints[key] = fingerprint
+                    updated_at = word.get("updated_at")
+                    if isinstance(updated_at, datetime.datetime) and (watermark is None or updated_at > watermark):
+                        watermark = updated_at
+                    if previous.get(key) != fingerprint:
+                        f.write(json_util.dumps({"op": "upsert", "doc": word}, ensure_ascii=False) + "\n")
+                        changed += 1
+                
+                deleted = [key for key in previous if key not in fingerprints]
+                for key in deleted:
+                    f.write(json_util.dumps({"op": "delete", "_id": json_util.loads(key)}) + "\n")
+                
+                # Fin de fichier : permet de détecter une sauvegarde tronquée
+                f.write(json_util.dumps({"_end": {
+                    "total_words": len(fingerprints),
+                    "changed": changed,
+                    "deleted": len(deleted),
+                    "watermark": watermark,
+                }}) + "\n")
             
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, ensure_ascii=False, indent=2)
+            if kind == "delta" and not changed and not deleted:
+                os.remove(tmp_path)
+                self.last_backup_file = self._path(state["chain"][-1])
+                print(f"✅ Aucun changement depuis {state['chain'][-1]}")
+                return self.last_backup_file
+            
+            os.replace(tmp_path, backup_path)
+            chain = (state["chain"] if state else []) + [backup_filename]
+            self._save_state({
+                "chain": chain,
+                "fingerprints": fingerprints,
+                "watermark": watermark.isoformat() if watermark else None,
+            })
             
             self.last_backup_file = backup_path
-            print(f"✅ Sauvegarde créée: {backup_path}")
-            print(f"📊 {len(words)} mots sauvegardés")
+            print(f"✅ Sauvegarde {kind} créée: {backup_path}")
+            print(f"📊 {len(fingerprints)} mots, {changed} écrits, {len(deleted)} supprimés")
             return backup_path
             
         except Exception as e:
             print(f"❌ Erreur lors de la sauvegarde: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
             return None
     
+    @staticmethod
+    @contextmanager
+    def _open_backup(backup_path):
+        """En-tête et enregistrements d'une sauvegarde NDJSON (lecture en flux)"""
+        with gzip.open(backup_path, 'rt', encoding='utf-8') as f:
+            header = json_util.loads(f.readline())["_meta"]
+            
+            def records():
+                complete = False
+                for line in f:
+                    record = json_util.loads(line)
+                    if "_end" in record:
+                        complete = True
+                        break
+                    yield record
+                if not complete:
+                    raise ValueError(f"Sauvegarde tronquée: {backup_path}")
+            
+            yield header, records()
+    
+    def _backup_chain(self, backup_path):
+        """Fichiers à rejouer : la sauvegarde de base puis les deltas jusqu'à backup_path"""
+        chain = []
+        path = backup_path
+        while path:
+            chain.append(path)
+            with self._open_backup(path) as (header, _):
+                parent = header.get("parent")
+            path = self._path(parent) if parent else None
+        return list(reversed(chain))
+    
+    def _apply_backup(self, backup_path):
+        """Rejoue une sauvegarde par lots ; retourne le nombre d'opérations"""
+        from pymongo import DeleteOne, ReplaceOne
+        
+        count = 0
+        with self._open_backup(backup_path) as (_, records):
+            batch = []
+            for record in records:
+                if record["op"] == "upsert":
+                    doc = record["doc"]
+                    batch.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+                else:
+                    batch.append(DeleteOne({"_id": record["_id"]}))
+                if len(batch) >= BACKUP_BATCH_SIZE:
+                    self.words_collection.bulk_write(batch, ordered=True)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                self.words_collection.bulk_write(batch, ordered=True)
+                count += len(batch)
+        return count
+    
+    def _restore_legacy_backup(self, backup_path):
+        """Anciennes sauvegardes JSON complètes (avant le format incrémental)"""
+        with open(backup_path, 'r', encoding='utf-8') as f:
+            backup_data = json.load(f)
+        
+        words = backup_data.get("words", [])
+        if not words:
+            print("❌ Sauvegarde vide")
+            return False
+        
+        # Restaurer les données
+        self.words_collection.delete_many({})
+        
+        # Retirer les _id pour éviter les conflits
+        for word in words:
+            if "_id" in word:
+                del word["_id"]
+        
+        self.words_collection.insert_many(words)
+        print(f"📊 {len(words)} mots restaurés")
+        return True
+    
     def restore_from_backup(self, backup_path=None):
-        """Restaure la base de données depuis une sauvegarde"""
+        """Restaure la base de données depuis une sauvegarde (base + deltas)"""
         if not backup_path:
             backup_path = self.last_backup_file
         
@@ -140,27 +370,29 @@ class DatabaseProtector:
             return False
         
         try:
-            with open(backup_path, 'r', encoding='utf-8') as f:
-                backup_data = json.load(f)
-            
-            words = backup_data.get("words", [])
-            if not words:
-                print("❌ Sauvegarde vide")
-                return False
-            
-            # Restaurer les données
-            self.words_collection.delete_many({})
-            
-            # Retirer les _id pour éviter les conflits
-            for word in words:
-                if "_id" in word:
-                    del word["_id"]
-            
-            self.words_collection.insert_many(words)
+            if not backup_path.endswith(BACKUP_EXTENSION):
+                restored = self._restore_legacy_backup(backup_path)
+            else:
+                chain = self._backup_chain(backup_path)
+                # Vérifier toute la chaîne avant d'effacer quoi que ce soit
+                for path in chain:
+                    with self._open_backup(path) as (_, records):
+                        for _ in records:
+                            pass
+                
+                self.words_collection.delete_many({})
+                for path in chain:
+                    count = self._apply_backup(path)
+                    print(f"   ↳ {os.path.basename(path)}: {count} opérations")
+                print(f"📊 {self.words_collection.count_documents({})} mots restaurés")
+                restored = True
             
-            print(f"✅ Base de données restaurée depuis: {backup_path}")
-            print(f"📊 {len(words)} mots restaurés")
-            return True
+            self.invalidate_stats()
+            if restored:
+                # La base ne correspond plus aux empreintes : prochaine sauvegarde complète
+                self._reset_state()
+                print(f"✅ Base de données restaurée depuis: {backup_path}")
+            return restored
             
         except Exception as e:
             print(f"❌ Erreur lors de la restauration: {e}")
@@ -178,6 +410,7 @@ class DatabaseProtector:
                 text=True
             )
             
+            self.invalidate_stats()
             if result.returncode == 0:
                 print("✅ Restauration d'urgence réussie")
                 return True
@@ -217,6 +450,7 @@ def protect_database(operation_name="unknown"):
             try:
                 # Exécuter l'opération protégée
                 result = func(*args, **kwargs)
+                db_protector.invalidate_stats()
                 
                 # Vérifier l'état après l'opération
                 is_healthy_after, status_after = db_protector.is_database_healthy()
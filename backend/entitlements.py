@@ -0,0 +1,118 @@
+"""
+Droits premium des utilisateurs de Kwezi
+Le statut premium (is_premium, premium_expires_at) est gardé dans un cache
+LRU : une entrée vit au plus ENTITLEMENT_CACHE_TTL secondes et jamais
+au-delà de l'expiration de l'abonnement. Les écritures (achat, webhook
+Stripe) invalident l'entrée ; la révocation des abonnements expirés en base
+est faite par un balayage périodique, plus jamais pendant une lecture.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from database import users_repository
+
+ENTITLEMENT_CACHE_TTL = int(os.getenv("ENTITLEMENT_CACHE_TTL", "300"))
+ENTITLEMENT_CACHE_SIZE = int(os.getenv("ENTITLEMENT_CACHE_SIZE", "10000"))
+
+# Intervalle du balayage des abonnements expirés (secondes)
+ENTITLEMENT_SWEEP_INTERVAL = int(os.getenv("ENTITLEMENT_SWEEP_INTERVAL", "300"))
+
+
+class Entitlement(NamedTuple):
+    is_premium: bool
+    expires_at: Optional[datetime] = None
+
+    def active(self, now: datetime) -> bool:
+        return self.is_premium and (self.expires_at is None or self.expires_at >= now)
+
+
+def entitlement_from_user(user: Optional[dict]) -> Entitlement:
+    if not user:
+        return Entitlement(False)
+    return Entitlement(bool(user.get("is_premium")), user.get("premium_expires_at"))
+
+
+def is_premium_active(user: Optional[dict], now: Optional[datetime] = None) -> bool:
+    """Premium actif : abonnement présent et pas encore expiré (sans écriture)"""
+    return entitlement_from_user(user).active(now or datetime.utcnow())
+
+
+class EntitlementService:
+    """Cache LRU + TTL des droits premium et balayage des abonnements expirés"""
+
+    def __init__(
+        self,
+        ttl: int = ENTITLEMENT_CACHE_TTL,
+        max_size: int = ENTITLEMENT_CACHE_SIZE,
+        sweep_interval: int = ENTITLEMENT_SWEEP_INTERVAL,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.sweep_interval = sweep_interval
+        # user_id -> (droit, instant d'expiration de l'entrée en time.monotonic())
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    def _store(self, user_id: str, entitlement: Entitlement):
+        ttl = self.ttl
+        if entitlement.is_premium and entitlement.expires_at is not None:
+            # Ne pas servir un premium au-delà de la fin de l'abonnement
+            ttl = min(ttl, max((entitlement.expires_at - datetime.utcnow()).total_seconds(), 0))
+        self._entries[user_id] = (entitlement, time.monotonic() + ttl)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, user_id: str) -> Entitlement:
+        cached = self._entries.get(user_id)
+        if cached is not None and cached[1] > time.monotonic():
+            self._entries.move_to_end(user_id)
+            return cached[0]
+        entitlement = entitlement_from_user(await users_repository.find_by_user_id(user_id))
+        self._store(user_id, entitlement)
+        return entitlement
+
+    async def is_premium(self, user_id: str) -> bool:
+        return (await self.get(user_id)).active(datetime.utcnow())
+
+    def invalidate(self, user_id: Optional[str]):
+        """À appeler après tout changement d'abonnement d'un utilisateur"""
+        if user_id:
+            self._entries.pop(user_id, None)
+
+    async def sweep_expired(self) -> int:
+        """Révoque en base les abonnements premium expirés"""
+        now = datetime.utcnow()
+        user_ids = await users_repository.find_expired_premium_ids(now)
+        if not user_ids:
+            return 0
+        await users_repository.revoke_expired_premium(user_ids, now)
+        for user_id in user_ids:
+            self.invalidate(user_id)
+        print(f"⌛ Premium expiré révoqué pour {len(user_ids)} utilisateurs")
+        return len(user_ids)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep_expired()
+            except Exception as e:
+                print(f"⚠️ Balayage des abonnements expirés en échec: {e}")
+            await asyncio.sleep(self.sweep_interval)
+
+    def start(self):
+        """Démarre le balayage périodique (démarrage du serveur)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+entitlements = EntitlementService()
@@ -0,0 +1,214 @@
+"""
+Réponses HTTP mises en cache pour Kwezi
+- Corps JSON sérialisés une seule fois, pré-compressés en gzip,
+  servis avec un ETag et des réponses 304 Not Modified
+- Fichiers servis avec requêtes partielles (Range), GET conditionnel
+  (If-None-Match / If-Modified-Since, If-Range) et Cache-Control de l'appelant
+"""
+import gzip
+import hashlib
+import json
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+from urllib.parse import quote
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, Response
+from starlette.concurrency import run_in_threadpool
+
+from metrics import count_fs
+from tracing import span
+
+# En dessous de cette taille la compression ne rapporte rien
+GZIP_MIN_SIZE = 512
+
+
+class EncodedBody:
+    """Corps JSON encodé (brut + gzip) avec son ETag de contenu"""
+
+    def __init__(self, payload):
+        # Même encodage que JSONResponse de FastAPI
+        with span("serialize", "json"):
+            self.raw = json.dumps(
+                jsonable_encoder(payload),
+                ensure_ascii=False,
+                allow_nan=False,
+                indent=None,
+                separators=(",", ":"),
+            ).encode("utf-8")
+        with span("serialize", "gzip", size=len(self.raw)):
+            self.gzip = gzip.compress(self.raw, compresslevel=6) if len(self.raw) >= GZIP_MIN_SIZE else None
+        # ETag faible : les variantes brute et gzip sont sémantiquement identiques
+        self.etag = 'W/"' + hashlib.sha256(self.raw).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """Compare un en-tête If-None-Match avec un ETag (comparaison faible)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+def encoded_json_response(request: Request, body: EncodedBody, headers: dict = None) -> Response:
+    """Sert un corps pré-encodé, ou 304 si le client a déjà cette version"""
+    response_headers = {
+        "ETag": body.etag,
+        # Le client garde sa copie mais revalide à chaque visite
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if headers:
+        response_headers.update(headers)
+
+    if etag_matches(request.headers.get("if-none-match"), body.etag):
+        return Response(status_code=304, headers=response_headers)
+
+    if body.gzip is not None and accepts_gzip(request):
+        response_headers["Content-Encoding"] = "gzip"
+        return Response(content=body.gzip, media_type="application/json", headers=response_headers)
+
+    return Response(content=body.raw, media_type="application/json", headers=response_headers)
+
+
+def file_content_hash(path: str) -> str:
+    """Empreinte SHA-256 du contenu d'un fichier"""
+    digest = hashlib.sha256()
+    count_fs("open")
+    with span("fs", "hash", path=path), open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_byte_range(range_header: Optional[str], size: int):
+    """
+    Analyse un en-tête Range à un seul intervalle
+    Retourne (début, fin incluse), None pour servir le fichier entier,
+    ou False si l'intervalle est insatisfiable
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+    ranges = range_header[len("bytes="):].strip()
+    if "," in ranges:
+        # Plusieurs intervalles : on sert le fichier entier (autorisé par la RFC 9110)
+        return None
+    start_text, _, end_text = ranges.partition("-")
+    try:
+        if start_text == "":
+            # Suffixe : les N derniers octets
+            length = int(end_text)
+            if length <= 0:
+                return False
+            return max(size - length, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return False
+    return start, min(end, size - 1)
+
+
+def _not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # If-None-Match a priorité sur If-Modified-Since
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(last_modified) <= int(parsedate_to_datetime(if_modified_since).timestamp())
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def inline_content_disposition(filename: str) -> str:
+    """En-tête Content-Disposition identique à celui de FileResponse"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"inline; filename*=utf-8''{quoted}"
+    return f'inline; filename="{filename}"'
+
+
+def _read_range(path: str, start: int, length: int) -> bytes:
+    count_fs("open")
+    with span("fs", "read", path=path, length=length), open(path, "rb") as f:
+        f.seek(start)
+        return f.read(length)
+
+
+async def file_response(
+    request: Request,
+    path: str,
+    stat_result: os.stat_result,
+    etag: str,
+    media_type: str,
+    filename: Optional[str] = None,
+    cache_control: Optional[str] = None,
+    headers: dict = None,
+) -> Response:
+    """
+    Sert un fichier avec ETag fort, Last-Modified, 304 et réponses partielles 206
+    stat_result et etag sont fournis par l'appelant (index déjà construit)
+    """
+    size = stat_result.st_size
+    extra_headers = headers
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+    }
+    if extra_headers:
+        headers.update(extra_headers)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+
+    if _not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != etag:
+        # La copie partielle du client est périmée : renvoyer le fichier entier,
+        # même si l'intervalle demandé n'existe plus (pas de 416)
+        byte_range = None
+    else:
+        byte_range = parse_byte_range(request.headers.get("range"), size)
+
+    if byte_range is False:
+        headers["Content-Range"] = f"bytes */{size}"
+        return Response(status_code=416, headers=headers)
+
+    if byte_range:
+        start, end = byte_range
+        content = await run_in_threadpool(_read_range, path, start, end - start + 1)
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        if filename:
+            headers["Content-Disposition"] = inline_content_disposition(filename)
+        return Response(content=content, status_code=206, media_type=media_type, headers=headers)
+
+    # Fichier ouvert par FileResponse à l'envoi (stat déjà fourni)
+    count_fs("open")
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        content_disposition_type="inline",
+        stat_result=stat_result,
+        headers=headers,
+    )
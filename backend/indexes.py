@@ -0,0 +1,134 @@
+"""
+Index MongoDB de Kwezi
+Les index nécessaires aux requêtes fréquentes sont déclarés ici et créés au
+démarrage (create_index est sans effet quand l'index existe déjà). Un
+contrôle des plans d'exécution (explain) signale ensuite toute requête
+fréquente qui parcourt encore toute la collection (COLLSCAN).
+"""
+import os
+from typing import List, NamedTuple, Optional, Tuple
+
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure
+
+# Contrôle des plans au démarrage (désactivable si explain n'est pas autorisé)
+CHECK_QUERY_PLANS = os.getenv("MONGO_CHECK_QUERY_PLANS", "1") == "1"
+
+
+class IndexSpec(NamedTuple):
+    collection: str
+    keys: List[Tuple[str, int]]
+    name: str
+    unique: bool = False
+    sparse: bool = False
+
+
+class HotQuery(NamedTuple):
+    collection: str
+    filter: dict
+    sort: Optional[List[Tuple[str, int]]] = None
+    description: str = ""
+
+
+REQUIRED_INDEXES: List[IndexSpec] = [
+    # Système premium et Stripe
+    IndexSpec("users", [("user_id", ASCENDING)], "user_id_unique", unique=True),
+    IndexSpec("users", [("stripe_customer_id", ASCENDING)], "stripe_customer_id", sparse=True),
+    # Progression, badges et statistiques par utilisateur
+    IndexSpec("user_progress", [("user_name", ASCENDING), ("completed_at", ASCENDING)], "user_name_completed_at"),
+    IndexSpec("user_badges", [("user_name", ASCENDING)], "user_name_unique", unique=True),
+    IndexSpec("user_stats", [("user_name", ASCENDING)], "user_name_unique", unique=True),
+    # Webhooks Stripe en attente de traitement
+    IndexSpec("stripe_events", [("status", ASCENDING), ("available_at", ASCENDING)], "status_available_at"),
+    # Vocabulaire (servi par le snapshot mémoire) : scripts de maintenance et recherches
+    IndexSpec("words", [("category", ASCENDING), ("difficulty", ASCENDING), ("_id", ASCENDING)], "category_difficulty_id"),
+    IndexSpec("words", [("section", ASCENDING)], "section", sparse=True),
+    IndexSpec("words", [("french", ASCENDING)], "french"),
+    IndexSpec("words", [("id", ASCENDING)], "legacy_id", sparse=True),
+    # Phrases du jeu 'Construire des phrases'
+    IndexSpec("sentences", [("difficulty", ASCENDING), ("tense", ASCENDING)], "difficulty_tense"),
+    IndexSpec("sentences", [("tense", ASCENDING)], "tense"),
+]
+
+# Requêtes fréquentes dont le plan doit utiliser un index
+HOT_QUERIES: List[HotQuery] = [
+    HotQuery("users", {"user_id": ""}, description="get_user"),
+    HotQuery("users", {"stripe_customer_id": ""}, description="webhook Stripe"),
+    HotQuery("user_progress", {"user_name": ""}, description="GET /api/progress"),
+    HotQuery("user_badges", {"user_name": ""}, description="GET /api/badges"),
+    HotQuery("user_stats", {"user_name": ""}, description="GET /api/stats"),
+    HotQuery("stripe_events", {"status": {"$in": ["pending", "processing"]}, "available_at": {"$lte": 0}},
+             [("available_at", ASCENDING)], "workers webhook Stripe"),
+    HotQuery("words", {"id": ""}, description="mot par ancien identifiant"),
+    HotQuery("sentences", {"difficulty": 1, "tense": "present"}, description="phrases filtrées"),
+    HotQuery("sentences", {"tense": "present"}, description="phrases par temps"),
+]
+
+
+async def ensure_indexes(db) -> dict:
+    """
+    Crée les index manquants ; un index impossible à créer (doublons pour un
+    index unique, options différentes d'un index existant) est signalé sans
+    bloquer le démarrage
+    """
+    created, failed = [], []
+    for spec in REQUIRED_INDEXES:
+        options = {"name": spec.name, "background": True}
+        if spec.unique:
+            options["unique"] = True
+        if spec.sparse:
+            options["sparse"] = True
+        try:
+            await db[spec.collection].create_index(spec.keys, **options)
+            created.append(f"{spec.collection}.{spec.name}")
+        except OperationFailure as e:
+            failed.append(f"{spec.collection}.{spec.name}")
+            print(f"⚠️ Index {spec.collection}.{spec.name} non créé: {e}")
+    print(f"🗂️ Index MongoDB vérifiés: {len(created)} ok, {len(failed)} en échec")
+    return {"indexes": created, "failed": failed}
+
+
+def _plan_stages(plan: dict):
+    """Étapes d'un plan d'exécution (arbre inputStage / inputStages)"""
+    yield plan.get("stage")
+    if "inputStage" in plan:
+        yield from _plan_stages(plan["inputStage"])
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+
+def winning_plan_stages(explain: dict) -> List[str]:
+    planner = explain.get("queryPlanner", {})
+    plan = planner.get("winningPlan", {})
+    # Moteur de requêtes SBE (MongoDB 7+) : plan classique sous queryPlan
+    plan = plan.get("queryPlan", plan)
+    return [stage for stage in _plan_stages(plan) if stage]
+
+
+async def check_query_plans(db) -> List[str]:
+    """Avertit pour chaque requête fréquente exécutée en COLLSCAN"""
+    collection_scans = []
+    for query in HOT_QUERIES:
+        cursor = db[query.collection].find(query.filter)
+        if query.sort:
+            cursor = cursor.sort(query.sort)
+        try:
+            explain = await cursor.explain()
+        except Exception as e:
+            # Même cause pour toutes les requêtes (droits, serveur) : un seul message
+            print(f"⚠️ Contrôle des plans impossible ({query.collection}, {query.description}): {e}")
+            break
+        if "COLLSCAN" in winning_plan_stages(explain):
+            collection_scans.append(f"{query.collection}: {query.description}")
+            print(
+                f"⚠️ COLLSCAN sur {query.collection} pour {query.description} "
+                f"(filtre {list(query.filter)}, tri {query.sort}) : index manquant ?"
+            )
+    return collection_scans
+
+
+async def bootstrap_indexes(db):
+    """Index au démarrage du serveur, puis contrôle des plans"""
+    await ensure_indexes(db)
+    if CHECK_QUERY_PLANS:
+        await check_query_plans(db)
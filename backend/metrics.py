@@ -0,0 +1,247 @@
+"""
+Métriques de Kwezi au format Prometheus (/metrics)
+- middleware ASGI : requêtes, durées, codes HTTP et tailles de réponse par route
+- CommandListener pymongo : durée de chaque commande MongoDB par collection
+- compteurs d'accès disque (stat, open) des routes audio
+Sans dépendance : histogrammes à seuils fixes, rendus au format texte
+"""
+import contextvars
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import monitoring
+
+# Seuils des histogrammes (secondes, octets)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Accès disque de la requête en cours, étiquetés par sa route à la fin de la requête
+# (le dictionnaire est partagé avec les threads lancés par run_in_threadpool)
+current_fs_operations: contextvars.ContextVar[Optional[Dict[str, int]]] = contextvars.ContextVar(
+    "current_fs_operations", default=None
+)
+
+BACKGROUND_ROUTE = "background"
+
+UNMATCHED_ROUTE = "unmatched"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    labels = list(labels)
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(labels)} {value:g}")
+        return lines
+
+
+class Gauge(Counter):
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...]):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        # labels -> [compteurs par seuil..., +Inf], somme
+        self.values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, labels: Labels, value: float):
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = entry
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        total[0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total[0]:g}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Toutes les métriques du processus (protégées par un verrou : threads pymongo)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.http_requests = Counter("kwezi_http_requests_total", "Requêtes HTTP par route, méthode et code")
+        self.http_duration = Histogram(
+            "kwezi_http_request_duration_seconds", "Durée des requêtes HTTP", LATENCY_BUCKETS
+        )
+        self.http_response_size = Histogram(
+            "kwezi_http_response_size_bytes", "Taille des réponses HTTP", SIZE_BUCKETS
+        )
+        self.http_in_progress = Gauge("kwezi_http_requests_in_progress", "Requêtes HTTP en cours")
+        self.mongo_duration = Histogram(
+            "kwezi_mongo_command_duration_seconds", "Durée des commandes MongoDB", LATENCY_BUCKETS
+        )
+        self.mongo_failures = Counter("kwezi_mongo_command_failures_total", "Commandes MongoDB en échec")
+        self.fs_operations = Counter("kwezi_fs_operations_total", "Accès disque (stat, open) par route")
+
+    def observe_request(
+        self, method: str, route: str, status: int, duration: float, size: int,
+        fs_operations: Optional[Dict[str, int]] = None,
+    ):
+        with self.lock:
+            self.http_requests.inc(_labels(method=method, route=route, status=status))
+            self.http_duration.observe(_labels(method=method, route=route), duration)
+            self.http_response_size.observe(_labels(method=method, route=route), size)
+            for operation, count in (fs_operations or {}).items():
+                self.fs_operations.inc(_labels(route=route, operation=operation), count)
+
+    def request_started(self, delta: int):
+        with self.lock:
+            self.http_in_progress.inc((), delta)
+
+    def observe_command(self, collection: str, command: str, duration: float, failed: bool = False):
+        labels = _labels(collection=collection, command=command)
+        with self.lock:
+            self.mongo_duration.observe(labels, duration)
+            if failed:
+                self.mongo_failures.inc(labels)
+
+    def count_fs(self, operation: str, amount: int = 1):
+        operations = current_fs_operations.get()
+        if operations is not None:
+            operations[operation] = operations.get(operation, 0) + amount
+            return
+        # Hors requête (surveillant de dossiers, démarrage)
+        with self.lock:
+            self.fs_operations.inc(_labels(route=BACKGROUND_ROUTE, operation=operation), amount)
+
+    def render(self, extra: Optional[Dict[str, float]] = None) -> str:
+        """Exposition au format texte Prometheus ; `extra` : jauges calculées à la demande"""
+        with self.lock:
+            lines = []
+            for metric in (
+                self.http_requests, self.http_duration, self.http_response_size, self.http_in_progress,
+                self.mongo_duration, self.mongo_failures, self.fs_operations,
+            ):
+                lines.extend(metric.render())
+        for name, value in sorted((extra or {}).items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def count_fs(operation: str, amount: int = 1):
+    """Compte un accès disque (stat, open) pour la route en cours"""
+    metrics.count_fs(operation, amount)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI : une mesure par requête HTTP, étiquetée par le modèle de route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        metrics.request_started(1)
+        fs_operations: Dict[str, int] = {}
+        token = current_fs_operations.set(fs_operations)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_fs_operations.reset(token)
+            # Modèle de route (/api/words/{word_id}) : cardinalité bornée
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            metrics.request_started(-1)
+            metrics.observe_request(
+                scope["method"], route_path, status, time.perf_counter() - start, size, fs_operations
+            )
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Durée des commandes MongoDB par collection et par commande"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections: Dict[Tuple, str] = {}
+
+    @staticmethod
+    def _key(event):
+        return (event.connection_id, event.request_id)
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else event.database_name
+        with self._lock:
+            self._collections[self._key(event)] = collection
+
+    def _finish(self, event, failed: bool):
+        with self._lock:
+            collection = self._collections.pop(self._key(event), "unknown")
+        metrics.observe_command(collection, event.command_name, event.duration_micros / 1e6, failed)
+
+    def succeeded(self, event):
+        self._finish(event, False)
+
+    def failed(self, event):
+        self._finish(event, True)
+
+
+mongo_command_listener = MongoCommandListener()
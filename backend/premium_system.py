@@ -3,32 +3,25 @@ Système de gestion Premium pour Kwezi
 Gère les utilisateurs, abonnements et limitations
 """
 from fastapi import HTTPException
-from pymongo import MongoClient
 from datetime import datetime, timedelta
-from typing import Optional
-import os
+from typing import List, Optional
 
-# MongoDB connection
-MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
-client = MongoClient(MONGO_URL)
-DB_NAME = os.getenv("DB_NAME", "mayotte_app")
-db = client[DB_NAME]
+from pymongo import UpdateOne
 
-users_collection = db.users
-words_collection = db.words
+from database import users_repository
+from entitlements import entitlements, is_premium_active
+from write_behind import APPLIED_EVENTS_FIELD, applied_events_push, unapplied_events, write_behind_queue
 
 # Configuration
 FREE_WORDS_LIMIT = 250
 PREMIUM_MONTHLY_PRICE = 2.90  # EUR
 PREMIUM_YEARLY_PRICE = 29.00  # EUR
 
-def create_user(user_id: str, email: Optional[str] = None):
-    """Créer un nouvel utilisateur gratuit"""
-    existing = users_collection.find_one({"user_id": user_id})
-    if existing:
-        return existing
-    
-    user_data = {
+ACTIVITY_EVENT = "activity"
+
+def new_user_document(user_id: str, email: Optional[str] = None) -> dict:
+    """Document d'un nouvel utilisateur gratuit"""
+    return {
         "user_id": user_id,
         "email": email,
         "is_premium": False,
@@ -41,33 +34,47 @@ def create_user(user_id: str, email: Optional[str] = None):
         "streak_days": 0,
         "last_activity_date": None
     }
+
+async def create_user(user_id: str, email: Optional[str] = None):
+    """Créer un nouvel utilisateur gratuit"""
+    existing = await users_repository.find_by_user_id(user_id)
+    if existing:
+        return existing
     
-    result = users_collection.insert_one(user_data)
+    user_data = new_user_document(user_id, email)
+    
+    result = await users_repository.insert(user_data)
     user_data["_id"] = result.inserted_id
+    entitlements.invalidate(user_id)
     return user_data
 
-def get_user(user_id: str):
-    """Récupérer les informations d'un utilisateur"""
-    user = users_collection.find_one({"user_id": user_id})
-    if not user:
-        # Créer automatiquement l'utilisateur s'il n'existe pas
-        return create_user(user_id)
-    
-    # Vérifier si l'abonnement premium est expiré
-    if user.get("is_premium") and user.get("premium_expires_at"):
-        if user["premium_expires_at"] < datetime.utcnow():
-            # Abonnement expiré, révoquer le premium
-            users_collection.update_one(
-                {"user_id": user_id},
-                {"$set": {"is_premium": False}}
-            )
-            user["is_premium"] = False
-    
+async def get_user(user_id: str):
+    """
+    Récupérer les informations d'un utilisateur (lecture seule)
+    Retourne None si l'utilisateur n'existe pas
+    """
+    # Écrire d'abord l'activité en attente de cet utilisateur
+    await write_behind_queue.flush_key(ACTIVITY_EVENT, user_id)
+    user = await users_repository.find_by_user_id(user_id)
+    return _with_premium_status(user) if user else None
+
+def _with_premium_status(user: dict) -> dict:
+    # Abonnement expiré : premium retiré dans la réponse, la base est
+    # mise à jour par le balayage périodique (entitlements)
+    if user.get("is_premium") and not is_premium_active(user):
+        user["is_premium"] = False
     return user
 
-def upgrade_to_premium(user_id: str, subscription_type: str = "monthly"):
+async def _get_or_create_user(user_id: str):
+    """Pour les écritures : l'utilisateur est créé s'il n'existe pas"""
+    user = await users_repository.find_by_user_id(user_id)
+    if not user:
+        return await create_user(user_id)
+    return _with_premium_status(user)
+
+async def upgrade_to_premium(user_id: str, subscription_type: str = "monthly"):
     """Simuler l'achat Premium (pour tests)"""
-    user = get_user(user_id)
+    await _get_or_create_user(user_id)
     
     # Calculer la date d'expiration
     if subscription_type == "monthly":
@@ -78,8 +85,8 @@ def upgrade_to_premium(user_id: str, subscription_type: str = "monthly"):
         raise HTTPException(status_code=400, detail="Type d'abonnement invalide")
     
     # Mettre à jour l'utilisateur
-    users_collection.update_one(
-        {"user_id": user_id},
+    await users_repository.update_by_user_id(
+        user_id,
         {"$set": {
             "is_premium": True,
             "premium_expires_at": expires_at,
@@ -87,35 +94,18 @@ def upgrade_to_premium(user_id: str, subscription_type: str = "monthly"):
             "last_login": datetime.utcnow()
         }}
     )
+    entitlements.invalidate(user_id)
     
-    updated_user = get_user(user_id)
+    updated_user = await get_user(user_id)
     return updated_user
 
-def get_words_for_user(user_id: Optional[str] = None, category: Optional[str] = None):
-    """Récupérer les mots accessibles pour un utilisateur"""
-    # Si pas d'user_id fourni, retourner version limitée pour invité
-    is_premium = False
-    if user_id:
-        user = get_user(user_id)
-        is_premium = user.get("is_premium", False)
-    
-    # Construire la requête MongoDB
-    query = {}
-    if category:
-        query["category"] = category
-    
-    # Récupérer les mots
-    words = list(words_collection.find(query).sort([("difficulty", 1), ("_id", 1)]))
-    
+def premium_words_response(vocabulary, category: Optional[str], is_premium: bool) -> dict:
+    """Réponse de /api/premium/words à partir du snapshot du vocabulaire"""
+    words = vocabulary.ranked_words(category)
     # Limiter si utilisateur gratuit
     if not is_premium:
         words = words[:FREE_WORDS_LIMIT]
     
-    # Formater les résultats
-    for word in words:
-        word["id"] = str(word["_id"])
-        del word["_id"]
-    
     return {
         "words": words,
         "total": len(words),
@@ -123,11 +113,23 @@ def get_words_for_user(user_id: Optional[str] = None, category: Optional[str] =
         "limit_reached": not is_premium and len(words) >= FREE_WORDS_LIMIT
     }
 
-def update_user_activity(user_id: str, words_learned: int = 0, score: int = 0):
-    """Mettre à jour l'activité utilisateur"""
-    user = get_user(user_id)
-    
-    today = datetime.utcnow().date()
+async def get_words_for_user(vocabulary_snapshot, user_id: Optional[str] = None, category: Optional[str] = None):
+    """
+    Récupérer les mots accessibles pour un utilisateur
+    Liste pré-triée et réponse pré-encodée par version du snapshot : un appel
+    coûte une lecture du statut premium (en cache) quel que soit le nombre de mots
+    """
+    # Si pas d'user_id fourni, retourner version limitée pour invité
+    is_premium = await entitlements.is_premium(user_id) if user_id else False
+    return await vocabulary_snapshot.encoded(
+        ("premium_words", category, is_premium),
+        lambda data: premium_words_response(data, category, is_premium)
+    )
+
+def apply_activity(user: dict, activity: dict) -> dict:
+    """Applique un événement d'activité à un utilisateur (série, compteurs, dates)"""
+    at = activity["at"]
+    today = at.date()
     last_activity = user.get("last_activity_date")
     
     # Calculer la série (streak)
@@ -146,25 +148,90 @@ def update_user_activity(user_id: str, words_learned: int = 0, score: int = 0):
         # Premier jour
         streak_days = 1
     
-    # Mettre à jour
-    users_collection.update_one(
-        {"user_id": user_id},
-        {"$set": {
-            "last_activity_date": datetime.utcnow(),
-            "streak_days": streak_days,
-            "last_login": datetime.utcnow()
-        },
-        "$inc": {
-            "words_learned": words_learned,
-            "total_score": score
-        }}
-    )
-    
-    return get_user(user_id)
+    user["last_activity_date"] = at
+    user["streak_days"] = streak_days
+    user["last_login"] = at
+    user["words_learned"] = user.get("words_learned", 0) + activity.get("words_learned", 0)
+    user["total_score"] = user.get("total_score", 0) + activity.get("score", 0)
+    return user
+
+async def update_user_activity(user_id: str, words_learned: int = 0, score: int = 0):
+    """
+    Mettre à jour l'activité utilisateur
+    L'écriture passe par la file write-behind : l'utilisateur retourné inclut
+    les activités pas encore écrites en base
+    """
+    user = await _get_or_create_user(user_id)
+    write_behind_queue.enqueue(ACTIVITY_EVENT, user_id, {
+        "words_learned": words_learned,
+        "score": score,
+        "at": datetime.utcnow()
+    })
+    for activity in write_behind_queue.pending_events(ACTIVITY_EVENT, user_id):
+        apply_activity(user, activity)
+    return user
 
-def get_user_stats(user_id: str):
+async def flush_activity_events(events: List[dict]):
+    """
+    Écrit un lot d'activités (gestionnaire de la file write-behind) : une
+    lecture des utilisateurs concernés puis une mise à jour par utilisateur
+    en un seul bulk_write
+    Idempotent : chaque utilisateur garde les identifiants des événements
+    déjà appliqués, un lot rejoué n'incrémente pas deux fois les compteurs
+    """
+    by_user = {}
+    for event in events:
+        by_user.setdefault(event["key"], []).append(event)
+    
+    users = {user["user_id"]: user for user in await users_repository.find_by_user_ids(list(by_user))}
+    operations = []
+    for user_id, user_events in by_user.items():
+        user = users.get(user_id)
+        user_events = unapplied_events(user_events, user)
+        if not user_events:
+            continue
+        user = user or new_user_document(user_id)
+        state = {
+            "last_activity_date": user.get("last_activity_date"),
+            "streak_days": user.get("streak_days", 0),
+            "words_learned": 0,
+            "total_score": 0
+        }
+        for event in user_events:
+            apply_activity(state, event["data"])
+        
+        update = {
+            "$set": {
+                "last_activity_date": state["last_activity_date"],
+                "streak_days": state["streak_days"],
+                "last_login": state["last_login"]
+            },
+            "$inc": {
+                "words_learned": state["words_learned"],
+                "total_score": state["total_score"]
+            },
+            "$push": applied_events_push(user_events)
+        }
+        if user_id in users:
+            # Garde : aucun de ces événements n'a été appliqué entre-temps
+            operations.append(UpdateOne(
+                {"user_id": user_id, APPLIED_EVENTS_FIELD: {"$nin": [event["id"] for event in user_events]}},
+                update
+            ))
+        else:
+            defaults = new_user_document(user_id)
+            for field in ("last_activity_date", "streak_days", "last_login", "words_learned", "total_score"):
+                del defaults[field]
+            update["$setOnInsert"] = defaults
+            operations.append(UpdateOne({"user_id": user_id}, update, upsert=True))
+    if operations:
+        await users_repository.bulk_write(operations)
+
+async def get_user_stats(user_id: str):
     """Récupérer les statistiques d'un utilisateur"""
-    user = get_user(user_id)
+    user = await get_user(user_id)
+    if not user:
+        return None
     
     return {
         "user_id": user["user_id"],
@@ -176,3 +243,5 @@ def get_user_stats(user_id: str):
         "created_at": user.get("created_at"),
         "subscription_type": user.get("subscription_type")
     }
+
+write_behind_queue.register(ACTIVITY_EVENT, flush_activity_events)
@@ -0,0 +1,201 @@
+"""
+Profileur statistique à la demande pour Kwezi
+Un thread relève toutes les `interval` secondes la pile de chaque thread du
+processus (sys._current_frames) pendant la durée demandée, puis renvoie les
+piles agrégées au format « collapsed » (flamegraph.pl, speedscope) :
+    thread;fonction (fichier:ligne);... nombre_d_échantillons
+
+Limité à une route, seuls les échantillons des requêtes de cette route sont
+gardés : la tâche asyncio en cours sur la boucle d'événements, ou le
+contexte copié par run_in_threadpool pour les threads du pool.
+Hors profilage, le middleware ne coûte qu'un test de booléen par requête.
+"""
+import asyncio
+import contextvars
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+PROFILE_DEFAULT_SECONDS = 10
+PROFILE_MAX_SECONDS = 60
+PROFILE_DEFAULT_INTERVAL_MS = 5
+PROFILE_MIN_INTERVAL_MS = 1
+PROFILE_MAX_INTERVAL_MS = 100
+
+# Profondeur maximale des piles relevées (les plus anciens cadres sont coupés)
+PROFILE_MAX_DEPTH = 128
+
+# Scope ASGI de la requête en cours (seulement pendant un profilage)
+current_request_scope: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar(
+    "current_request_scope", default=None
+)
+
+# Pile en attente (boucle d'événements au repos, pool de threads inoccupé)
+IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+}
+
+
+class ProfilerBusy(Exception):
+    """Un profilage est déjà en cours"""
+
+
+def _short_filename(filename: str) -> str:
+    # Assez pour distinguer server.py de starlette/routing.py
+    parts = filename.replace("\\", "/").split("/")
+    return "/".join(parts[-2:])
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({_short_filename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _scope_matches(scope: Optional[dict], route: str) -> bool:
+    if scope is None:
+        return False
+    template = getattr(scope.get("route"), "path", None)
+    return route in (scope.get("path"), template)
+
+
+class Profile:
+    """Résultat d'un profilage : piles agrégées et nombre d'échantillons"""
+
+    def __init__(self, stacks: Counter, samples: int, duration: float, interval: float, route: Optional[str]):
+        self.stacks = stacks
+        self.samples = samples
+        self.duration = duration
+        self.interval = interval
+        self.route = route
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def to_dict(self) -> dict:
+        return {
+            "route": self.route,
+            "duration_seconds": round(self.duration, 3),
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "stacks": [{"stack": stack, "count": count} for stack, count in self.stacks.most_common()],
+        }
+
+
+class SamplingProfiler:
+    """Échantillonneur de piles (un seul profilage à la fois)"""
+
+    def __init__(self):
+        self.active = False
+        self._lock = threading.Lock()
+        self._tasks: Dict[asyncio.Task, dict] = {}
+
+    # Suivi des requêtes (middleware), utile au filtrage par route
+    def track(self, task: Optional[asyncio.Task], scope: dict):
+        if task is not None:
+            self._tasks[task] = scope
+
+    def untrack(self, task: Optional[asyncio.Task]):
+        self._tasks.pop(task, None)
+
+    def _thread_scope(self, frame, loop, loop_thread_id: int, thread_id: int) -> Optional[dict]:
+        if thread_id == loop_thread_id:
+            return self._tasks.get(asyncio.current_task(loop))
+        # Thread du pool : le contexte de la requête est passé à Context.run()
+        while frame is not None:
+            if frame.f_code.co_name == "run":
+                context = frame.f_locals.get("context")
+                if isinstance(context, contextvars.Context):
+                    return context.get(current_request_scope)
+            frame = frame.f_back
+        return None
+
+    @staticmethod
+    def _stack(frame, thread_name: str) -> str:
+        labels: List[str] = []
+        while frame is not None and len(labels) < PROFILE_MAX_DEPTH:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        labels.append(thread_name)
+        return ";".join(reversed(labels))
+
+    def run(
+        self,
+        seconds: float,
+        interval: float,
+        route: Optional[str] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        loop_thread_id: Optional[int] = None,
+        idle: bool = False,
+    ) -> Profile:
+        """
+        Profilage bloquant (à lancer hors de la boucle d'événements)
+        ProfilerBusy si un autre profilage est en cours
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("Un profilage est déjà en cours")
+        try:
+            self.active = True
+            own_thread = threading.get_ident()
+            stacks: Counter = Counter()
+            samples = 0
+            start = time.perf_counter()
+            deadline = start + seconds
+            while True:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread:
+                        continue
+                    if route and not _scope_matches(self._thread_scope(frame, loop, loop_thread_id, thread_id), route):
+                        continue
+                    leaf = frame.f_code
+                    if not idle and (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_LEAVES:
+                        continue
+                    stack = self._stack(frame, names.get(thread_id, f"thread-{thread_id}"))
+                    stacks[stack] += 1
+                    samples += 1
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                time.sleep(min(interval, deadline - now))
+            duration = time.perf_counter() - start
+            print(f"🔬 Profilage {route or 'global'}: {samples} échantillons en {duration:.1f}s")
+            return Profile(stacks, samples, duration, interval, route)
+        finally:
+            self.active = False
+            self._lock.release()
+
+    async def profile(self, seconds: float, interval: float, route: Optional[str] = None, idle: bool = False) -> Profile:
+        """Profile le processus depuis un thread du pool (appel depuis la boucle d'événements)"""
+        loop = asyncio.get_running_loop()
+        return await run_in_threadpool(self.run, seconds, interval, route, loop, threading.get_ident(), idle)
+
+
+profiler = SamplingProfiler()
+
+
+class ProfilerMiddleware:
+    """Middleware ASGI : rattache chaque requête à sa tâche pendant un profilage"""
+
+    def __init__(self, app, sampling_profiler: SamplingProfiler = profiler):
+        self.app = app
+        self.profiler = sampling_profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.profiler.active:
+            await self.app(scope, receive, send)
+            return
+        task = asyncio.current_task()
+        self.profiler.track(task, scope)
+        token = current_request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request_scope.reset(token)
+            self.profiler.untrack(task)
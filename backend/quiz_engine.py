@@ -0,0 +1,243 @@
+"""
+Générateur de quiz pour Kwezi
+Questions à choix multiples prêtes à jouer (français → shimaoré, français →
+kibouchi, audio → mot français) construites côté serveur à partir du
+snapshot du vocabulaire. Les distracteurs viennent d'un index précalculé une
+fois par version du snapshot : pour chaque mot et chaque langue, les mots les
+plus faciles à confondre (même catégorie et même difficulté d'abord,
+orthographe proche), sans jamais proposer deux fois la même réponse.
+"""
+import random
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+QUIZ_DEFAULT_QUESTIONS = 10
+QUIZ_MAX_QUESTIONS = 50
+QUIZ_DEFAULT_OPTIONS = 4
+QUIZ_MIN_OPTIONS = 2
+QUIZ_MAX_OPTIONS = 6
+
+# Candidats gardés par mot et par langue (tirage parmi eux à chaque question)
+DISTRACTOR_POOL_SIZE = 8
+
+LANGUAGE_LABELS = {"french": "Français", "shimaore": "Shimaoré", "kibouchi": "Kibouchi"}
+
+# type de quiz -> (langue de la consigne, langue des réponses)
+QUIZ_TYPES = {
+    "fr-shimaore": ("french", "shimaore"),
+    "fr-kibouchi": ("french", "kibouchi"),
+    "audio-shimaore": ("shimaore", "french"),
+    "audio-kibouchi": ("kibouchi", "french"),
+}
+# Types composés : une question tirée au hasard parmi ces types
+QUIZ_MIXES = {
+    "mixed": ("fr-shimaore", "fr-kibouchi"),
+    "audio": ("audio-shimaore", "audio-kibouchi"),
+}
+
+
+def lazy_permutation(n: int):
+    """
+    Indices 0..n-1 dans un ordre aléatoire, tirés à la demande (Fisher-Yates
+    partiel, échanges gardés dans un dict) : k tirages coûtent O(k), pas O(n)
+    """
+    swapped: Dict[int, int] = {}
+    for i in range(n):
+        j = random.randrange(i, n)
+        yield swapped.get(j, j)
+        swapped[j] = swapped.get(i, i)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _similarity(a: str, b: str) -> int:
+    """Proximité d'orthographe bon marché : préfixe et suffixe communs, longueur"""
+    prefix = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        prefix += 1
+    suffix = 0
+    for x, y in zip(reversed(a), reversed(b)):
+        if x != y:
+            break
+        suffix += 1
+    return 2 * prefix + suffix - abs(len(a) - len(b))
+
+
+class DistractorIndex:
+    """Distracteurs plausibles par (mot, langue des réponses), pour une version du vocabulaire"""
+
+    def __init__(self, words: List[dict]):
+        self.pools: Dict[Tuple[str, str], List[dict]] = {}
+        for language in LANGUAGE_LABELS:
+            self._build_language(words, language)
+
+    def _build_language(self, words: List[dict], language: str):
+        eligible = [word for word in words if isinstance(word.get(language), str) and word[language].strip()]
+        by_category: Dict[Optional[str], List[dict]] = {}
+        by_difficulty: Dict[Optional[int], List[dict]] = {}
+        for word in eligible:
+            by_category.setdefault(word.get("category"), []).append(word)
+            by_difficulty.setdefault(word.get("difficulty"), []).append(word)
+
+        for word in eligible:
+            answer = _normalize(word[language])
+            same_category = by_category[word.get("category")]
+            # Même catégorie : même difficulté d'abord, puis orthographe la plus proche
+            ranked = sorted(
+                (other for other in same_category if other is not word),
+                key=lambda other: (
+                    other.get("difficulty") != word.get("difficulty"),
+                    -_similarity(answer, _normalize(other[language])),
+                ),
+            )
+            pool = []
+            seen = {answer}
+            for other in ranked:
+                text = _normalize(other[language])
+                if text not in seen:
+                    seen.add(text)
+                    pool.append(other)
+                    if len(pool) == DISTRACTOR_POOL_SIZE:
+                        break
+            if len(pool) < DISTRACTOR_POOL_SIZE:
+                # Petite catégorie : compléter avec des mots de même difficulté
+                candidates = by_difficulty[word.get("difficulty")]
+                for other in random.sample(candidates, min(len(candidates), 4 * DISTRACTOR_POOL_SIZE)):
+                    text = _normalize(other[language])
+                    if text not in seen:
+                        seen.add(text)
+                        pool.append(other)
+                        if len(pool) == DISTRACTOR_POOL_SIZE:
+                            break
+            self.pools[(word["id"], language)] = pool
+
+    def distractors(self, word: dict, language: str, count: int) -> List[dict]:
+        pool = self.pools.get((word["id"], language), [])
+        return random.sample(pool, min(count, len(pool)))
+
+
+class QuizEngine:
+    """Quiz tirés du snapshot du vocabulaire (index des distracteurs par version)"""
+
+    def __init__(self, vocabulary_snapshot, audio_index):
+        self.vocabulary_snapshot = vocabulary_snapshot
+        self.audio_index = audio_index
+        self._lock = threading.Lock()
+        self._index: Tuple[int, Optional[DistractorIndex]] = (-1, None)
+
+    def distractor_index(self, vocabulary) -> DistractorIndex:
+        """Index de la version courante (construit une fois, appel bloquant)"""
+        version, index = self._index
+        if version != vocabulary.version or index is None:
+            with self._lock:
+                version, index = self._index
+                if version != vocabulary.version or index is None:
+                    index = DistractorIndex(vocabulary.words)
+                    self._index = (vocabulary.version, index)
+                    print(f"❓ Index des distracteurs v{vocabulary.version}: {len(index.pools)} entrées")
+        return index
+
+    def prepare(self, vocabulary, audio: bool) -> DistractorIndex:
+        """
+        Index des distracteurs et, pour les quiz audio, table des fichiers
+        audio par mot (appel bloquant, une fois par version)
+        """
+        index = self.distractor_index(vocabulary)
+        if audio:
+            self.audio_index.word_files(vocabulary)
+        return index
+
+    def _has_audio(self, vocabulary, word: dict, language: str) -> bool:
+        return self.audio_index.find_for_word(vocabulary, word["id"], language) is not None
+
+    def _question(self, vocabulary, index: DistractorIndex, word: dict, quiz_type: str, options: int) -> Optional[dict]:
+        prompt_language, answer_language = QUIZ_TYPES[quiz_type]
+        distractors = index.distractors(word, answer_language, options - 1)
+        if not distractors:
+            return None
+        choices = [{"word_id": word["id"], "text": word[answer_language], "is_correct": True}]
+        choices += [{"word_id": other["id"], "text": other[answer_language], "is_correct": False} for other in distractors]
+        random.shuffle(choices)
+
+        # Langue locale travaillée par la question (la consigne ou les réponses)
+        language = prompt_language if answer_language == "french" else answer_language
+        if quiz_type.startswith("audio-"):
+            # Route générique : sert l'audio dual comme l'ancien format (même
+            # résolution que _has_audio), contrairement à /api/words/{id}/audio
+            prompt = {
+                "audio_url": f"/api/audio/{word['id']}/{prompt_language}",
+                "language": prompt_language,
+            }
+        else:
+            prompt = {"text": word[prompt_language], "language": prompt_language}
+        return {
+            "type": quiz_type,
+            "word_id": word["id"],
+            "prompt": prompt,
+            "language": language,
+            "language_label": LANGUAGE_LABELS[language],
+            "image_url": word.get("image_url"),
+            "options": choices,
+            "correct_answer": word[answer_language],
+        }
+
+    async def generate(
+        self,
+        quiz_type: str = "mixed",
+        count: int = QUIZ_DEFAULT_QUESTIONS,
+        category: Optional[str] = None,
+        difficulty: Optional[int] = None,
+        options: int = QUIZ_DEFAULT_OPTIONS,
+    ) -> dict:
+        """
+        Série de `count` questions (mots distincts)
+        ValueError si le type de quiz est inconnu
+        """
+        if quiz_type not in QUIZ_TYPES and quiz_type not in QUIZ_MIXES:
+            raise ValueError(f"Type de quiz inconnu: {quiz_type}")
+        types = QUIZ_MIXES.get(quiz_type, (quiz_type,))
+
+        vocabulary = await self.vocabulary_snapshot.current()
+        audio = any(question_type.startswith("audio-") for question_type in types)
+        version, index = self._index
+        if (
+            version != vocabulary.version
+            or index is None
+            or (audio and not self.audio_index.word_files_ready(vocabulary))
+        ):
+            # Construction (une fois par version du vocabulaire ou de l'index
+            # audio) hors de la boucle d'événements
+            index = await run_in_threadpool(self.prepare, vocabulary, audio)
+        words = vocabulary.words_by_category(category) if category else vocabulary.words
+        if difficulty is not None:
+            words = [word for word in words if word.get("difficulty") == difficulty]
+
+        questions = []
+        # Ordre aléatoire paresseux : on s'arrête dès que `count` questions sont prêtes
+        for position in lazy_permutation(len(words)):
+            word = words[position]
+            question_type = random.choice(types)
+            prompt_language, answer_language = QUIZ_TYPES[question_type]
+            if not word.get(answer_language) or not word.get(prompt_language):
+                continue
+            if question_type.startswith("audio-") and not self._has_audio(vocabulary, word, prompt_language):
+                continue
+            question = self._question(vocabulary, index, word, question_type, options)
+            if question is not None:
+                questions.append(question)
+                if len(questions) == count:
+                    break
+
+        return {
+            "type": quiz_type,
+            "category": category,
+            "difficulty": difficulty,
+            "total": len(questions),
+            "questions": questions,
+        }
@@ -0,0 +1,181 @@
+"""
+Réserve de phrases pour le jeu 'Construire des phrases' (Kwezi)
+Les phrases sont chargées une fois, indexées par verbe, temps et difficulté,
+et chaque tirage de `limit` phrases à verbes distincts coûte O(limit) quelle
+que soit la taille de la collection
+"""
+import asyncio
+import os
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Durée de vie de la réserve (secondes), comme le snapshot du vocabulaire
+SENTENCE_POOL_TTL = int(os.getenv("SENTENCE_POOL_TTL", "300"))
+
+# Au-delà, la réserve n'est plus gardée en mémoire : tirage par $sample MongoDB
+SENTENCE_POOL_MAX_SIZE = int(os.getenv("SENTENCE_POOL_MAX_SIZE", "20000"))
+
+# Marge du $sample pour trouver assez de verbes distincts après regroupement
+SAMPLE_OVERSAMPLING = 4
+
+TENSES = ("present", "past", "future")
+
+
+def sentence_verb(sentence: dict) -> str:
+    """Verbe d'une phrase (infinitif français), pour garantir la variété"""
+    verb = sentence.get("verb_infinitive_fr") or sentence.get("verb")
+    if verb:
+        return str(verb).lower()
+    # Anciennes phrases sans infinitif : dernier mot de la phrase française
+    words = sentence.get("french", "").split()
+    return words[-1].lower() if words else ""
+
+
+class SentenceBucket:
+    """Phrases d'un filtre (difficulté, temps) regroupées par verbe"""
+
+    def __init__(self):
+        self.by_verb: Dict[str, List[dict]] = {}
+        self.verbs: List[str] = []
+        self.sentences: List[dict] = []
+        self.size = 0
+
+    def add(self, verb: str, sentence: dict):
+        sentences = self.by_verb.get(verb)
+        if sentences is None:
+            sentences = self.by_verb[verb] = []
+            self.verbs.append(verb)
+        sentences.append(sentence)
+        self.sentences.append(sentence)
+        self.size += 1
+
+    def sample(self, limit: int) -> List[dict]:
+        """
+        `limit` phrases au hasard, un verbe différent par phrase tant que
+        possible, puis un second tour sur les verbes et enfin le reste de la
+        réserve : au plus un passage sur les verbes, O(limit)
+        """
+        limit = min(limit, self.size)
+        if limit <= 0:
+            return []
+        verbs = random.sample(self.verbs, min(limit, len(self.verbs)))
+        picked = [random.choice(self.by_verb[verb]) for verb in verbs]
+        if len(picked) < limit:
+            # Plus de phrases demandées que de verbes (donc len(verbs) < limit) :
+            # un seul second tour, une autre phrase de chaque verbe qui en a
+            chosen = {id(sentence) for sentence in picked}
+            for verb in random.sample(self.verbs, len(self.verbs)):
+                sentences = self.by_verb[verb]
+                # Une seule phrase de ce verbe est déjà prise : deux tirages suffisent
+                for sentence in random.sample(sentences, min(2, len(sentences))):
+                    if id(sentence) not in chosen:
+                        chosen.add(id(sentence))
+                        picked.append(sentence)
+                        break
+                if len(picked) == limit:
+                    break
+            if len(picked) < limit:
+                # Compléter en une fois : parmi missing + len(chosen) phrases
+                # distinctes, au plus len(chosen) sont déjà prises
+                missing = limit - len(picked)
+                candidates = random.sample(self.sentences, min(self.size, missing + len(chosen)))
+                picked += [sentence for sentence in candidates if id(sentence) not in chosen][:missing]
+        random.shuffle(picked)
+        return picked
+
+
+class SentencePoolData:
+    """Une version immuable de la réserve"""
+
+    def __init__(self, sentences: List[dict]):
+        self.sentences = sentences
+        # Un seau par combinaison de filtres : (difficulté | None, temps | None)
+        self.buckets: Dict[Tuple[Optional[int], Optional[str]], SentenceBucket] = {}
+        for sentence in sentences:
+            verb = sentence_verb(sentence)
+            difficulty = sentence.get("difficulty")
+            tense = sentence.get("tense")
+            for key in {(None, None), (difficulty, None), (None, tense), (difficulty, tense)}:
+                bucket = self.buckets.get(key)
+                if bucket is None:
+                    bucket = self.buckets[key] = SentenceBucket()
+                bucket.add(verb, sentence)
+
+    def sample(self, limit: int, difficulty: Optional[int] = None, tense: Optional[str] = None) -> List[dict]:
+        bucket = self.buckets.get((difficulty, tense))
+        return bucket.sample(limit) if bucket else []
+
+
+class SentencePool:
+    """Réserve de phrases rechargée après init-sentences ou expiration"""
+
+    def __init__(self, repository, ttl: int = SENTENCE_POOL_TTL, max_size: int = SENTENCE_POOL_MAX_SIZE):
+        self.repository = repository
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = asyncio.Lock()
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        # None quand la collection est trop grande pour être gardée en mémoire
+        self._data: Optional[SentencePoolData] = None
+
+    def _is_fresh(self):
+        if self._loaded_at is None:
+            return False
+        if self.ttl and time.monotonic() - self._loaded_at > self.ttl:
+            return False
+        return True
+
+    async def _load(self):
+        generation = self._generation
+        count = await self.repository.count()
+        if count > self.max_size:
+            self._data = None
+            print(f"💬 {count} phrases : tirage direct par $sample MongoDB")
+        else:
+            sentences = await self.repository.find()
+            for sentence in sentences:
+                sentence["_id"] = str(sentence["_id"])
+            self._data = SentencePoolData(sentences)
+            print(f"💬 Réserve de phrases: {len(sentences)} phrases chargées")
+        if generation == self._generation:
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """À appeler après toute écriture sur la collection sentences"""
+        self._generation += 1
+        self._loaded_at = None
+
+    async def sample(self, limit: int, difficulty: Optional[int] = None, tense: Optional[str] = None) -> List[dict]:
+        if limit <= 0:
+            # $sample refuse une taille nulle
+            return []
+        if not self._is_fresh():
+            async with self._lock:
+                if not self._is_fresh():
+                    await self._load()
+        data = self._data
+        if data is not None:
+            return data.sample(limit, difficulty, tense)
+        return await self._sample_from_database(limit, difficulty, tense)
+
+    async def _sample_from_database(self, limit: int, difficulty: Optional[int], tense: Optional[str]) -> List[dict]:
+        """Tirage stratifié par verbe côté MongoDB ($sample puis un document par verbe)"""
+        query = {}
+        if difficulty:
+            query["difficulty"] = difficulty
+        if tense:
+            query["tense"] = tense
+        sentences = await self.repository.sample_distinct(
+            query, limit * SAMPLE_OVERSAMPLING, "verb_infinitive_fr", limit
+        )
+        if len(sentences) < limit:
+            # Pas assez de verbes distincts : compléter sans contrainte de verbe
+            seen = {sentence["_id"] for sentence in sentences}
+            for sentence in await self.repository.sample(query, limit):
+                if sentence["_id"] not in seen and len(sentences) < limit:
+                    sentences.append(sentence)
+        for sentence in sentences:
+            sentence["_id"] = str(sentence["_id"])
+        return sentences
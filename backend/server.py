@@ -1,8 +1,8 @@
 import os
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from pymongo import MongoClient
+from fastapi.responses import FileResponse, Response
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
@@ -19,6 +19,37 @@ from conjugation_engine import create_sentence_database
 from database_protection import protect_database, db_protector, check_database_integrity
 from stripe_routes import router as stripe_router
 
+# Cache mémoire du vocabulaire et réponses pré-encodées
+from vocabulary_cache import VocabularySnapshot, project_words
+from http_cache import encoded_json_response, file_response
+
+# Moteur de badges (règles évaluées côté serveur)
+from badge_engine import evaluate_badges, unlock_badges
+from user_stats import record_progress, get_user_progress as find_user_progress, get_user_stats as compute_badge_stats
+from write_behind import write_behind_queue
+from indexes import bootstrap_indexes
+from entitlements import entitlements
+from stripe_events import stripe_event_processor
+from metrics import metrics, MetricsMiddleware, METRICS_CONTENT_TYPE
+from tracing import TraceMiddleware, slow_traces, TRACE_SAMPLE_RATE
+from admin_auth import require_admin
+from profiler import (
+    ProfilerMiddleware, ProfilerBusy, profiler, PROFILE_DEFAULT_SECONDS, PROFILE_MAX_SECONDS,
+    PROFILE_DEFAULT_INTERVAL_MS, PROFILE_MIN_INTERVAL_MS, PROFILE_MAX_INTERVAL_MS
+)
+
+# Réserve de phrases du jeu 'Construire des phrases'
+from sentence_pool import SentencePool
+
+# Index des fichiers audio
+from audio_index import AudioIndex, LANGUAGES as AUDIO_LANGUAGES
+from audio_manifest import AudioManifest, MANIFEST_DEFAULT_LIMIT, MANIFEST_MAX_LIMIT
+from audio_packs import AudioPacks
+from quiz_engine import (
+    QuizEngine, QUIZ_DEFAULT_QUESTIONS, QUIZ_MAX_QUESTIONS,
+    QUIZ_DEFAULT_OPTIONS, QUIZ_MIN_OPTIONS, QUIZ_MAX_OPTIONS
+)
+
 app = FastAPI(title="Mayotte Language Learning API")
 
 # Inclure les routes Stripe
@@ -37,30 +68,103 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Total-Count", "X-Next-Cursor", "X-Manifest-Version"],
 )
 
-# MongoDB connection
-MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
-client = MongoClient(MONGO_URL)
-# Use the correct database name from environment variable
-DB_NAME = os.getenv("DB_NAME", "shimaoré_app")
-db = client[DB_NAME]
-
-# Collections
-words_collection = db.words
-exercises_collection = db.exercises
-user_progress_collection = db.user_progress
-sentences_collection = db.sentences
-users_collection = db.users
-
-# Debug: Test database connection
-try:
-    print(f"Connected to database: {DB_NAME}")
-    print(f"Collections: {db.list_collection_names()}")
-    count = words_collection.count_documents({})
-    print(f"Total words in collection: {count}")
-except Exception as e:
-    print(f"Database connection error: {e}")
+# Rattachement des requêtes à leur tâche pendant un profilage (/api/admin/profile)
+app.add_middleware(ProfilerMiddleware)
+
+# Traces échantillonnées des requêtes (spans MongoDB, disque, sérialisation)
+app.add_middleware(TraceMiddleware)
+
+# Mesures par route (durée, code, taille) pour /metrics ; ajouté en dernier = couche externe
+app.add_middleware(MetricsMiddleware)
+
+# MongoDB connection - shared async data layer (Motor) and connection pool
+from database import (
+    DB_NAME, db, get_client, close_clients, get_pool_stats,
+    words_repository, sentences_repository, exercises_repository,
+    badges_repository
+)
+
+# Snapshot du vocabulaire partagé par tout le processus
+vocabulary_snapshot = VocabularySnapshot(words_repository)
+WORDS_MAX_LIMIT = 1000
+sentence_pool = SentencePool(sentences_repository)
+
+def invalidate_word_caches():
+    """À appeler après toute écriture sur words (snapshot et statistiques de santé)"""
+    vocabulary_snapshot.invalidate()
+    db_protector.invalidate_stats()
+
+@app.on_event("startup")
+async def check_database_connection():
+    """Debug: Test database connection"""
+    try:
+        print(f"Connected to database: {DB_NAME}")
+        print(f"Collections: {await db.list_collection_names()}")
+        count = await words_repository.count()
+        print(f"Total words in collection: {count}")
+    except Exception as e:
+        print(f"Database connection error: {e}")
+
+@app.on_event("startup")
+async def create_database_indexes():
+    """Index des requêtes fréquentes (idempotent) et alerte sur les COLLSCAN"""
+    try:
+        await bootstrap_indexes(db)
+    except Exception as e:
+        print(f"⚠️ Index MongoDB non vérifiés: {e}")
+
+# File d'écriture différée (progression, activité) : rejouée au démarrage,
+# vidée avant la fermeture des connexions MongoDB
+@app.on_event("startup")
+async def start_write_behind_queue():
+    await write_behind_queue.start()
+
+@app.on_event("shutdown")
+async def stop_write_behind_queue():
+    await write_behind_queue.stop()
+
+# Révocation périodique des abonnements premium expirés (hors des lectures)
+@app.on_event("startup")
+async def start_entitlement_sweeper():
+    entitlements.start()
+
+@app.on_event("shutdown")
+async def stop_entitlement_sweeper():
+    entitlements.stop()
+
+# Traitement des webhooks Stripe enregistrés (file stripe_events)
+@app.on_event("startup")
+async def start_stripe_event_workers():
+    stripe_event_processor.start()
+
+@app.on_event("shutdown")
+async def stop_stripe_event_workers():
+    stripe_event_processor.stop()
+
+@app.on_event("shutdown")
+async def close_database_connections():
+    """Close the shared MongoDB connection pools"""
+    close_clients()
+
+# Index audio partagé : construit au démarrage, rafraîchi par le surveillant de dossiers
+audio_index = AudioIndex()
+audio_manifest = AudioManifest(audio_index)
+audio_packs = AudioPacks(audio_manifest)
+quiz_engine = QuizEngine(vocabulary_snapshot, audio_index)
+
+@app.on_event("startup")
+async def build_audio_index():
+    await run_in_threadpool(audio_index.build)
+    audio_index.start_watcher()
+    # Empreintes calculées dès le démarrage plutôt qu'à la première requête
+    await run_in_threadpool(audio_manifest.current)
+
+@app.on_event("shutdown")
+async def stop_audio_index_watcher():
+    audio_index.stop_watcher()
 
 # Pydantic models
 class Word(BaseModel):
@@ -146,6 +250,52 @@ def dict_to_word(word_dict):
         del word_dict['_id']
     return Word(**word_dict)
 
+# Un fichier adressé par son nom peut être réécrit sur place (nouvel
+# enregistrement) : cache court, puis revalidation par l'ETag de contenu (304).
+# Un audio adressé par mot peut pointer vers un autre fichier après une
+# correction : même principe.
+AUDIO_FILE_CACHE_CONTROL = "public, max-age=3600, must-revalidate"
+WORD_AUDIO_CACHE_CONTROL = "public, max-age=86400"
+
+async def audio_file_response(request: Request, audio_file, cache_control: str = AUDIO_FILE_CACHE_CONTROL):
+    """
+    Sert un fichier de l'index audio (stat déjà connu, pas de nouvelle sonde disque)
+    avec ETag de contenu, 304 et requêtes partielles (Range)
+    """
+    if audio_file.etag is None:
+        # Première demande de ce fichier : empreinte calculée hors de la boucle
+        await run_in_threadpool(audio_file.content_hash)
+    return await file_response(
+        request,
+        audio_file.path,
+        audio_file.stat,
+        audio_file.etag,
+        media_type="audio/mp4",
+        filename=audio_file.filename,
+        cache_control=cache_control
+    )
+
+async def word_audio_response(request: Request, word_id: str, lang: str, require_dual_audio: bool = False):
+    """Sert l'audio d'un mot dans une langue via l'index audio"""
+    vocabulary = await vocabulary_snapshot.current()
+    word_doc = vocabulary.get_word(word_id)
+    if word_doc:
+        if require_dual_audio and not word_doc.get("dual_audio_system", False):
+            raise HTTPException(status_code=400, detail="Ce mot n'utilise pas le système audio dual")
+        audio_file = audio_index.find_for_word(vocabulary, word_id, lang)
+    else:
+        # Anciens documents identifiés par un champ 'id' texte
+        word_doc = await words_repository.find_by_legacy_id(word_id)
+        if not word_doc:
+            raise HTTPException(status_code=404, detail=f"Mot non trouvé avec id: {word_id}")
+        if require_dual_audio and not word_doc.get("dual_audio_system", False):
+            raise HTTPException(status_code=400, detail="Ce mot n'utilise pas le système audio dual")
+        audio_file = audio_index.resolve_word(word_doc, lang)
+    
+    if audio_file is None:
+        raise HTTPException(status_code=404, detail=f"Pas d'audio disponible en {lang} pour ce mot")
+    return await audio_file_response(request, audio_file, WORD_AUDIO_CACHE_CONTROL)
+
 def dict_to_exercise(exercise_dict):
     """Convert MongoDB document to Exercise model"""
     if '_id' in exercise_dict:
@@ -164,26 +314,17 @@ async def test_audio_page():
     return FileResponse("/app/backend/test_audio.html")
 
 @app.get("/api/vocabulary")
-async def get_vocabulary(section: str = Query(None, description="Filter by section")):
+async def get_vocabulary(request: Request, section: str = Query(None, description="Filter by section")):
     """Get vocabulary by section"""
     try:
-        # Build query based on section parameter
-        query = {}
+        # Served from the in-memory snapshot (no MongoDB round trip), pre-encoded with ETag
         if section:
-            query["section"] = section
-        
-        # Execute query
-        cursor = words_collection.find(query)
-        words = []
-        for word_doc in cursor:
-            # Convert MongoDB document to dictionary
-            word_dict = dict(word_doc)
-            if '_id' in word_dict:
-                word_dict['id'] = str(word_dict['_id'])
-                del word_dict['_id']
-            words.append(word_dict)
-        
-        return words
+            body = await vocabulary_snapshot.encoded(
+                ("vocabulary", section), lambda data: data.words_by_section(section)
+            )
+        else:
+            body = await vocabulary_snapshot.encoded(("vocabulary", None), lambda data: data.all_words())
+        return encoded_json_response(request, body)
     except Exception as e:
         print(f"Error in get_vocabulary: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -192,8 +333,8 @@ async def get_vocabulary(section: str = Query(None, description="Filter by secti
 async def get_vocabulary_sections():
     """Get all available vocabulary sections"""
     try:
-        # Get distinct sections from the vocabulary collection
-        sections = words_collection.distinct("section")
+        # Get distinct sections from the vocabulary snapshot
+        sections = await vocabulary_snapshot.sections()
         return {"sections": sections}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -202,68 +343,151 @@ async def get_vocabulary_sections():
 async def get_word(word_id: str):
     """Get a specific word by ID"""
     try:
-        word_doc = words_collection.find_one({"_id": ObjectId(word_id)})
-        if not word_doc:
+        word_dict = await vocabulary_snapshot.get_word(word_id)
+        if not word_dict:
             raise HTTPException(status_code=404, detail="Word not found")
         
-        # Convert to dict and replace _id
-        word_dict = dict(word_doc)
-        word_dict['id'] = str(word_dict['_id'])
-        del word_dict['_id']
-        
         return word_dict
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/words")
-async def get_words(category: str = Query(None, description="Filter by category")):
+async def get_words(
+    request: Request,
+    category: str = Query(None, description="Filter by category"),
+    limit: int = Query(None, ge=1, le=WORDS_MAX_LIMIT, description="Maximum number of words"),
+    offset: int = Query(0, ge=0, description="Number of words to skip"),
+    cursor: str = Query(None, description="Keyset cursor from X-Next-Cursor (takes precedence over offset)"),
+    fields: str = Query(None, description="Comma-separated fields to return (id is always included)")
+):
     """Get words (compatible with frontend expectations) - SORTED ALPHABETICALLY"""
     try:
-        # Build query based on category parameter
-        query = {}
-        if category:
-            query["category"] = category
+        # Served from the in-memory snapshot, already sorted by french word, pre-encoded with ETag
+        if limit is None and not offset and not cursor and not fields:
+            if category:
+                body = await vocabulary_snapshot.encoded(
+                    ("words", category), lambda data: data.words_by_category(category)
+                )
+            else:
+                body = await vocabulary_snapshot.encoded(
+                    ("words", None), lambda data: data.all_words(sort_by_french=True)
+                )
+            return encoded_json_response(request, body)
         
-        # Execute query with alphabetical sorting by french word
-        cursor = words_collection.find(query).sort("french", 1)  # 1 = ascending order
-        words = []
-        for word_doc in cursor:
-            # Convert MongoDB document to dictionary
-            word_dict = dict(word_doc)
-            if '_id' in word_dict:
-                word_dict['id'] = str(word_dict['_id'])
-                del word_dict['_id']
-            
-            words.append(word_dict)
+        # Pagination (offset ou curseur sur french + id) et projection des champs
+        field_list = tuple(field.strip() for field in fields.split(",") if field.strip()) if fields else None
+        data = await vocabulary_snapshot.current()
+        try:
+            words, total, next_cursor = data.page_words(category, offset, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        body = data.encode(
+            ("words_page", category, offset, limit, cursor, field_list),
+            lambda _: project_words(words, field_list)
+        )
         
-        return words
+        headers = {"X-Total-Count": str(total)}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return encoded_json_response(request, body, headers)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in get_words: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/audio/{section}/{filename}")
-async def get_audio(section: str, filename: str):
-    """Serve audio files from assets/audio directory"""
+@app.get("/api/quiz")
+async def get_quiz(
+    type: str = Query("mixed", description="fr-shimaore, fr-kibouchi, audio-shimaore, audio-kibouchi, mixed or audio"),
+    count: int = Query(QUIZ_DEFAULT_QUESTIONS, ge=1, le=QUIZ_MAX_QUESTIONS),
+    category: str = Query(None, description="Filter by category"),
+    difficulty: int = Query(None, description="Filter by difficulty"),
+    options: int = Query(QUIZ_DEFAULT_OPTIONS, ge=QUIZ_MIN_OPTIONS, le=QUIZ_MAX_OPTIONS),
+):
+    """Ready-to-play multiple-choice questions with distractors from the same category"""
     try:
-        from fastapi.responses import FileResponse
-        import os
-        
-        # Construct the file path
-        audio_path = f"/app/frontend/assets/audio/{section}/{filename}"
-        
-        # Check if file exists
-        if not os.path.exists(audio_path):
-            raise HTTPException(status_code=404, detail=f"Audio file not found: {filename}")
-        
-        # Return the file
-        return FileResponse(
-            path=audio_path,
-            media_type="audio/m4a",
-            filename=filename
-        )
+        return await quiz_engine.generate(type, count, category, difficulty, options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/audio/manifest")
+async def get_audio_manifest(
+    request: Request,
+    category: str = Query(None, description="Filter by audio section"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(MANIFEST_DEFAULT_LIMIT, ge=1, le=MANIFEST_MAX_LIMIT)
+):
+    """
+    Manifeste des fichiers audio (taille et empreinte SHA-256 de chaque fichier)
+    Le client compare les empreintes à ses fichiers locaux et ne télécharge que les différences
+    """
+    try:
+        manifest, body = await run_in_threadpool(audio_manifest.encoded_page, category, offset, limit)
+        return encoded_json_response(request, body, {"X-Manifest-Version": manifest.version})
+    except Exception as e:
+        print(f"Error in get_audio_manifest: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/audio/packs")
+async def list_audio_packs():
+    """Paquets audio disponibles pour le mode hors ligne"""
+    try:
+        return await run_in_threadpool(audio_packs.list_packs)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/audio/packs/{category}")
+async def get_audio_pack(
+    request: Request,
+    category: str,
+    since: str = Query(None, description="Manifest version already downloaded (delta pack)")
+):
+    """
+    Archive zip des fichiers audio d'une catégorie ('all' pour tout le manifeste)
+    Avec since=<version>, seuls les fichiers ajoutés ou modifiés depuis cette version
+    sont inclus ; manifest.json dans l'archive liste aussi les fichiers supprimés.
+    """
+    try:
+        pack = await run_in_threadpool(audio_packs.get_pack, category, since)
+    except Exception as e:
+        print(f"Error in get_audio_pack: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if pack is None:
+        raise HTTPException(status_code=404, detail=f"Catégorie audio inconnue: {category}")
+    return await file_response(
+        request,
+        pack.path,
+        pack.stat,
+        pack.etag,
+        media_type="application/zip",
+        filename=pack.filename,
+        # Range + If-Range : reprise d'un téléchargement interrompu
+        cache_control="no-cache",
+        headers={
+            "X-Manifest-Version": pack.version,
+            "X-Pack-Since": pack.since or "",
+            "X-Pack-Files": str(pack.file_count),
+        }
+    )
+
+@app.get("/api/audio/{section}/{filename}")
+async def get_audio(request: Request, section: str, filename: str):
+    """
+    Route audio unique : sert tous les fichiers depuis l'index audio
+    - /api/audio/{section}/{filename} : frontend/assets/audio/<section>/<filename>
+    - /api/audio/{word_id}/{lang} : audio d'un mot (shimaore ou kibouchi)
+    """
+    audio_file = audio_index.find(section, filename)
+    if audio_file is None and filename in AUDIO_LANGUAGES:
+        return await word_audio_response(request, section, filename)
+    if audio_file is None:
+        raise HTTPException(status_code=404, detail=f"Audio file not found: {filename}")
+    return await audio_file_response(request, audio_file)
+
 @app.post("/api/init-base-content")
 async def init_base_content():
     """Initialize the database with base vocabulary and exercises"""
@@ -774,8 +998,8 @@ async def init_base_content():
     ]
     
     # Insert words into database
-    for word_data in base_words:
-        words_collection.insert_one(word_data)
+    await words_repository.insert_many(base_words)
+    invalidate_word_caches()
     
     # Base exercises
     base_exercises = [
@@ -802,32 +1026,20 @@ async def init_base_content():
     ]
     
     # Insert exercises into database
-    for exercise_data in base_exercises:
-        exercises_collection.insert_one(exercise_data)
+    await exercises_repository.insert_many(base_exercises)
     
     return {"message": "Base content initialized successfully", "words_count": len(base_words), "exercises_count": len(base_exercises)}
 
 # Words endpoints
-@app.get("/api/words")
-async def get_words(category: Optional[str] = Query(None)):
-    """Get all words or filter by category"""
-    query = {}
-    if category:
-        query["category"] = category
-    
-    words = list(words_collection.find(query))
-    return [dict_to_word(word).dict() for word in words]
-
 @app.get("/api/words/{word_id}")
 async def get_word(word_id: str):
     """Get a specific word by ID"""
-    try:
-        word = words_collection.find_one({"_id": ObjectId(word_id)})
-        if word:
-            return dict_to_word(word).dict()
-        raise HTTPException(status_code=404, detail="Word not found")
-    except:
+    word = await vocabulary_snapshot.get_word(word_id)
+    if word:
+        return dict_to_word(dict(word)).dict()
+    if not ObjectId.is_valid(word_id):
         raise HTTPException(status_code=400, detail="Invalid word ID")
+    raise HTTPException(status_code=404, detail="Word not found")
 
 @app.get("/api/sentences")
 async def get_sentences(difficulty: int = None, tense: str = None, limit: int = 20):
@@ -836,51 +1048,8 @@ async def get_sentences(difficulty: int = None, tense: str = None, limit: int =
     Par défaut, retourne un MIX VARIÉ de tous les temps et de TOUS les verbes
     """
     try:
-        import random
-        
-        # Si aucun filtre spécifique, charger un MIX VRAIMENT VARIÉ
-        if not difficulty and not tense:
-            # Charger TOUTES les phrases disponibles
-            all_sentences_cursor = sentences_collection.find({})
-            all_sentences = list(all_sentences_cursor)
-            
-            # Mélanger COMPLÈTEMENT pour avoir des verbes variés
-            random.shuffle(all_sentences)
-            
-            # Prendre seulement le nombre demandé
-            sentences = all_sentences[:limit]
-            
-            # Vérifier qu'on a bien de la variété (différents verbes français)
-            # Si on a beaucoup de phrases du même verbe, remélanger
-            french_words = [s.get('french', '').split()[0] for s in sentences]
-            unique_verbs = len(set(french_words))
-            
-            # Si moins de 50% de verbes uniques, remélanger jusqu'à avoir de la variété
-            attempts = 0
-            while unique_verbs < limit * 0.5 and attempts < 5:
-                random.shuffle(all_sentences)
-                sentences = all_sentences[:limit]
-                french_words = [s.get('french', '').split()[0] for s in sentences]
-                unique_verbs = len(set(french_words))
-                attempts += 1
-        else:
-            # Construire le filtre si spécifié
-            filter_query = {}
-            if difficulty:
-                filter_query["difficulty"] = difficulty
-            if tense:
-                filter_query["tense"] = tense
-            
-            # Récupérer toutes les phrases correspondantes puis mélanger
-            all_sentences = list(sentences_collection.find(filter_query))
-            random.shuffle(all_sentences)
-            sentences = all_sentences[:limit]
-        
-        # Convertir ObjectId en string
-        for sentence in sentences:
-            sentence["_id"] = str(sentence["_id"])
-        
-        return sentences
+        # Tirage dans la réserve en mémoire : un verbe différent par phrase tant que possible
+        return await sentence_pool.sample(limit, difficulty or None, tense or None)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -891,7 +1060,8 @@ async def initialize_sentences():
         # Exécuter la création de phrases dans un thread séparé pour éviter les problèmes d'async
         import asyncio
         await asyncio.get_event_loop().run_in_executor(None, create_sentence_database)
-        count = sentences_collection.count_documents({})
+        sentence_pool.invalidate()
+        count = await sentences_repository.count()
         return {"message": f"Sentences database initialized successfully with {count} sentences"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -900,8 +1070,9 @@ async def initialize_sentences():
 async def get_database_status():
     """Get database integrity status and statistics"""
     try:
-        is_healthy, message = db_protector.is_database_healthy()
-        stats = db_protector.get_database_stats()
+        # DatabaseProtector is synchronous: keep it off the event loop
+        is_healthy, message = await run_in_threadpool(db_protector.is_database_healthy)
+        stats = await run_in_threadpool(db_protector.get_database_stats)
         
         return {
             "healthy": is_healthy,
@@ -911,11 +1082,67 @@ async def get_database_status():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics: HTTP routes, MongoDB commands, filesystem access, pools and queues"""
+    extra = {"kwezi_write_behind_pending_events": write_behind_queue.pending_count}
+    pool_totals = {}
+    for counters in get_pool_stats()["servers"].values():
+        for key, value in counters.items():
+            pool_totals[key] = pool_totals.get(key, 0) + value
+    for key, value in pool_totals.items():
+        extra[f"kwezi_mongo_pool_{key}"] = value
+    return Response(content=metrics.render(extra), media_type=METRICS_CONTENT_TYPE)
+
+@app.get("/api/admin/traces", dependencies=[Depends(require_admin)])
+async def get_slow_traces(
+    limit: int = Query(20, ge=1, le=200),
+    route: str = Query(None, description="Route template or path, e.g. /api/sentences"),
+):
+    """Slowest sampled request traces with their MongoDB, filesystem and serialization spans"""
+    return {
+        "sample_rate": TRACE_SAMPLE_RATE,
+        "capacity": slow_traces.capacity,
+        "traces": slow_traces.slowest(limit, route),
+    }
+
+@app.delete("/api/admin/traces", dependencies=[Depends(require_admin)])
+async def clear_slow_traces():
+    """Empty the slow trace buffer"""
+    slow_traces.clear()
+    return {"message": "Traces effacées"}
+
+@app.get("/api/admin/profile", dependencies=[Depends(require_admin)])
+async def profile_process(
+    seconds: float = Query(PROFILE_DEFAULT_SECONDS, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(PROFILE_DEFAULT_INTERVAL_MS, ge=PROFILE_MIN_INTERVAL_MS, le=PROFILE_MAX_INTERVAL_MS),
+    route: str = Query(None, description="Only keep samples of this route, e.g. /api/sentences"),
+    format: str = Query("collapsed", pattern="^(collapsed|json)$"),
+    idle: bool = Query(False, description="Keep samples of idle threads"),
+):
+    """Sampling profile of the running worker, as collapsed stacks (flamegraph.pl, speedscope)"""
+    try:
+        profile = await profiler.profile(seconds, interval_ms / 1000, route, idle)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if format == "json":
+        return profile.to_dict()
+    return Response(
+        content=profile.collapsed(),
+        media_type="text/plain; charset=utf-8",
+        headers={"X-Profile-Samples": str(profile.samples)},
+    )
+
+@app.get("/api/database-pool-stats")
+async def get_database_pool_stats():
+    """Get MongoDB connection pool settings and statistics"""
+    return get_pool_stats()
+
 @app.post("/api/create-backup")
 async def create_database_backup():
     """Create a manual backup of the database"""
     try:
-        backup_path = db_protector.create_backup("manual_api_call")
+        backup_path = await run_in_threadpool(db_protector.create_backup, "manual_api_call")
         if backup_path:
             return {"message": "Backup created successfully", "backup_path": backup_path}
         else:
@@ -927,7 +1154,8 @@ async def create_database_backup():
 async def emergency_database_restore():
     """Emergency restore of the authentic database"""
     try:
-        if db_protector.emergency_restore():
+        if await run_in_threadpool(db_protector.emergency_restore):
+            invalidate_word_caches()
             return {"message": "Emergency restore completed successfully"}
         else:
             raise HTTPException(status_code=500, detail="Emergency restore failed")
@@ -939,8 +1167,10 @@ async def create_word(word: WordCreate):
     """Create a new word"""
     word_dict = word.dict()
     word_dict["created_at"] = datetime.utcnow()
-    result = words_collection.insert_one(word_dict)
+    result = await words_repository.insert(word_dict)
+    invalidate_word_caches()
     word_dict["id"] = str(result.inserted_id)
+    del word_dict["_id"]
     return word_dict
 
 @app.put("/api/words/{word_id}")
@@ -948,12 +1178,10 @@ async def update_word(word_id: str, word: WordCreate):
     """Update a word"""
     try:
         word_dict = word.dict()
-        result = words_collection.update_one(
-            {"_id": ObjectId(word_id)},
-            {"$set": word_dict}
-        )
+        result = await words_repository.update(word_id, word_dict)
         if result.matched_count:
-            updated_word = words_collection.find_one({"_id": ObjectId(word_id)})
+            invalidate_word_caches()
+            updated_word = await words_repository.find_by_id(word_id)
             return dict_to_word(updated_word).dict()
         raise HTTPException(status_code=404, detail="Word not found")
     except:
@@ -963,8 +1191,9 @@ async def update_word(word_id: str, word: WordCreate):
 async def delete_word(word_id: str):
     """Delete a word"""
     try:
-        result = words_collection.delete_one({"_id": ObjectId(word_id)})
+        result = await words_repository.delete(word_id)
         if result.deleted_count:
+            invalidate_word_caches()
             return {"message": "Word deleted successfully"}
         raise HTTPException(status_code=404, detail="Word not found")
     except:
@@ -974,7 +1203,7 @@ async def delete_word(word_id: str):
 @app.get("/api/exercises")
 async def get_exercises():
     """Get all exercises"""
-    exercises = list(exercises_collection.find())
+    exercises = await exercises_repository.find_all()
     return [dict_to_exercise(exercise).dict() for exercise in exercises]
 
 @app.post("/api/exercises")
@@ -982,7 +1211,7 @@ async def create_exercise(exercise: Exercise):
     """Create a new exercise"""
     exercise_dict = exercise.dict(exclude={"id"})
     exercise_dict["created_at"] = datetime.utcnow()
-    result = exercises_collection.insert_one(exercise_dict)
+    result = await exercises_repository.insert(exercise_dict)
     exercise_dict["id"] = str(result.inserted_id)
     return exercise_dict
 
@@ -991,7 +1220,7 @@ async def create_exercise(exercise: Exercise):
 async def get_user_progress(user_name: str):
     """Get progress for a specific user"""
     try:
-        progress = list(user_progress_collection.find({"user_name": user_name}))
+        progress = await find_user_progress(user_name)
         for p in progress:
             p["id"] = str(p["_id"])
             del p["_id"]
@@ -1008,11 +1237,12 @@ async def create_progress(progress: UserProgress):
     try:
         progress_dict = progress.dict(exclude={"id"})
         progress_dict["completed_at"] = datetime.utcnow()
-        result = user_progress_collection.insert_one(progress_dict)
+        # Écriture différée et groupée (user_progress + user_stats) : pas d'attente MongoDB
+        progress_dict = record_progress(progress_dict)
         
         # Create a clean response dict for JSON serialization
         response_dict = {
-            "id": str(result.inserted_id),
+            "id": str(progress_dict["_id"]),
             "user_name": progress_dict["user_name"],
             "exercise_id": progress_dict["exercise_id"],
             "score": progress_dict["score"],
@@ -1027,8 +1257,7 @@ async def create_progress(progress: UserProgress):
 async def get_user_badges(user_name: str):
     """Get badges for a specific user"""
     try:
-        badges_collection = db.user_badges
-        user_badges = badges_collection.find_one({"user_name": user_name})
+        user_badges = await badges_repository.find_by_user(user_name)
         
         if user_badges:
             user_badges["id"] = str(user_badges["_id"])
@@ -1043,34 +1272,22 @@ async def get_user_badges(user_name: str):
 async def unlock_badge(user_name: str, badge_id: str):
     """Unlock a badge for a user"""
     try:
-        badges_collection = db.user_badges
-        
-        # Check if user already has badges record
-        user_badges = badges_collection.find_one({"user_name": user_name})
-        
-        if user_badges:
-            # User exists, add badge if not already unlocked
-            if badge_id not in user_badges.get("badges", []):
-                badges_collection.update_one(
-                    {"user_name": user_name},
-                    {
-                        "$push": {"badges": badge_id},
-                        "$set": {"updated_at": datetime.utcnow()}
-                    }
-                )
-                return {"message": f"Badge {badge_id} unlocked for {user_name}"}
-            else:
-                return {"message": f"Badge {badge_id} already unlocked"}
-        else:
-            # Create new user badges record
-            badges_collection.insert_one({
-                "user_name": user_name,
-                "badges": [badge_id],
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            })
+        # Single atomic $addToSet (creates the user badges record if needed)
+        result = await unlock_badges(user_name, [badge_id])
+        if result["newly_unlocked"]:
             return {"message": f"Badge {badge_id} unlocked for {user_name}"}
-            
+        return {"message": f"Badge {badge_id} already unlocked"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/badges/{user_name}/evaluate")
+async def evaluate_user_badges(user_name: str):
+    """
+    Évalue toutes les règles de badges côté serveur et débloque en une écriture
+    tous les badges gagnés (remplace stats + badges + un unlock par badge)
+    """
+    try:
+        return await evaluate_badges(user_name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1078,614 +1295,31 @@ async def unlock_badge(user_name: str, badge_id: str):
 async def get_user_stats(user_name: str):
     """Get comprehensive stats for a user for badge calculations"""
     try:
-        # Get user progress
-        progress = list(user_progress_collection.find({"user_name": user_name}))
-        
-        # Calculate basic stats
-        total_score = sum(p.get("score", 0) for p in progress)
-        completed_exercises = len(progress)
-        average_score = total_score / completed_exercises if completed_exercises > 0 else 0
-        best_score = max((p.get("score", 0) for p in progress), default=0)
-        perfect_scores = len([p for p in progress if p.get("score", 0) >= 100])
-        
-        # Calculate learning streaks (simplified)
-        learning_days = len(set(p.get("completed_at", datetime.utcnow()).date() for p in progress))
-        
-        return {
-            "user_name": user_name,
-            "total_score": total_score,
-            "completed_exercises": completed_exercises,
-            "average_score": round(average_score, 1),
-            "best_score": best_score,
-            "perfect_scores": perfect_scores,
-            "learning_days": learning_days,
-            "words_learned": completed_exercises  # Simplified assumption
-        }
+        return await compute_badge_stats(user_name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-# Routes audio authentiques
-@app.get("/api/audio/famille/{filename}")
-async def get_famille_audio(filename: str):
-    """Sert un fichier audio famille"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/famille", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio famille non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/nature/{filename}")
-async def get_nature_audio(filename: str):
-    """Sert un fichier audio nature"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/nature", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio nature non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/nombres/{filename}")
-async def get_nombres_audio(filename: str):
-    """Sert un fichier audio nombres"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/nombres", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio nombres non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/animaux/{filename}")
-async def get_animaux_audio(filename: str):
-    """Sert un fichier audio animaux"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/animaux", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio animaux non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/vetements/{filename}")
-async def get_vetements_audio(filename: str):
-    """Sert un fichier audio vetements"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/vetements", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio vetements non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/maison/{filename}")
-async def get_maison_audio(filename: str):
-    """Sert un fichier audio maison"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/maison", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio maison non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/tradition/{filename}")
-async def get_tradition_audio(filename: str):
-    """Sert un fichier audio tradition"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/tradition", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio tradition non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/transport/{filename}")
-async def get_transport_audio(filename: str):
-    """Sert un fichier audio transport"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/transport", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio transport non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/adjectifs/{filename}")
-async def get_adjectifs_audio(filename: str):
-    """Sert un fichier audio adjectifs"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/adjectifs", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio adjectifs non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/expressions/{filename}")
-async def get_expressions_audio(filename: str):
-    """Sert un fichier audio expressions"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/expressions", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio expressions non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/verbes/{filename}")
-async def get_verbes_audio(filename: str):
-    """Sert un fichier audio verbes"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/verbes", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio verbes non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/salutations/{filename}")
-async def get_salutations_audio(filename: str):
-    """Sert un fichier audio salutations"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/salutations", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio salutations non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/couleurs/{filename}")
-async def get_couleurs_audio(filename: str):
-    """Sert un fichier audio couleurs"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/couleurs", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio couleurs non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/grammaire/{filename}")
-async def get_grammaire_audio(filename: str):
-    """Sert un fichier audio grammaire"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/grammaire", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio grammaire non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/nourriture/{filename}")
-async def get_nourriture_audio(filename: str):
-    """Sert un fichier audio nourriture"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/nourriture", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio nourriture non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
-@app.get("/api/audio/corps/{filename}")
-async def get_corps_audio(filename: str):
-    """Sert un fichier audio corps"""
-    import os
-    from fastapi.responses import FileResponse
-    
-    file_path = os.path.join("/app/frontend/assets/audio/corps", filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"Fichier audio corps non trouvé: {filename}")
-    
-    if not filename.endswith('.m4a'):
-        raise HTTPException(status_code=400, detail="Seuls les fichiers .m4a sont supportés")
-    
-    return FileResponse(
-        file_path,
-        media_type="audio/mp4",
-        headers={"Content-Disposition": f"inline; filename={filename}"}
-    )
-
 @app.get("/api/audio/info")
-async def get_audio_info():
+async def get_audio_info(request: Request):
     """Information sur les fichiers audio disponibles"""
-    import os
-    
-    famille_dir = "/app/frontend/assets/audio/famille"
-    nature_dir = "/app/frontend/assets/audio/nature"
-    nombres_dir = "/app/frontend/assets/audio/nombres"
-    animaux_dir = "/app/frontend/assets/audio/animaux"
-    corps_dir = "/app/frontend/assets/audio/corps"
-    salutations_dir = "/app/frontend/assets/audio/salutations"
-    couleurs_dir = "/app/frontend/assets/audio/couleurs"
-    grammaire_dir = "/app/frontend/assets/audio/grammaire"
-    nourriture_dir = "/app/frontend/assets/audio/nourriture"
-    verbes_dir = "/app/frontend/assets/audio/verbes"
-    expressions_dir = "/app/frontend/assets/audio/expressions"
-    adjectifs_dir = "/app/frontend/assets/audio/adjectifs"
-    vetements_dir = "/app/frontend/assets/audio/vetements"
-    maison_dir = "/app/frontend/assets/audio/maison"
-    tradition_dir = "/app/frontend/assets/audio/tradition"
-    transport_dir = "/app/frontend/assets/audio/transport"
-    
-    famille_files = []
-    nature_files = []
-    nombres_files = []
-    animaux_files = []
-    corps_files = []
-    salutations_files = []
-    couleurs_files = []
-    grammaire_files = []
-    nourriture_files = []
-    verbes_files = []
-    expressions_files = []
-    adjectifs_files = []
-    vetements_files = []
-    maison_files = []
-    tradition_files = []
-    transport_files = []
-    
-    if os.path.exists(famille_dir):
-        famille_files = [f for f in os.listdir(famille_dir) if f.endswith('.m4a')]
-    
-    if os.path.exists(nature_dir):
-        nature_files = [f for f in os.listdir(nature_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(nombres_dir):
-        nombres_files = [f for f in os.listdir(nombres_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(animaux_dir):
-        animaux_files = [f for f in os.listdir(animaux_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(corps_dir):
-        corps_files = [f for f in os.listdir(corps_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(salutations_dir):
-        salutations_files = [f for f in os.listdir(salutations_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(couleurs_dir):
-        couleurs_files = [f for f in os.listdir(couleurs_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(grammaire_dir):
-        grammaire_files = [f for f in os.listdir(grammaire_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(nourriture_dir):
-        nourriture_files = [f for f in os.listdir(nourriture_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(verbes_dir):
-        verbes_files = [f for f in os.listdir(verbes_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(expressions_dir):
-        expressions_files = [f for f in os.listdir(expressions_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(adjectifs_dir):
-        adjectifs_files = [f for f in os.listdir(adjectifs_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(vetements_dir):
-        vetements_files = [f for f in os.listdir(vetements_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(maison_dir):
-        maison_files = [f for f in os.listdir(maison_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(tradition_dir):
-        tradition_files = [f for f in os.listdir(tradition_dir) if f.endswith('.m4a')]
-        
-    if os.path.exists(transport_dir):
-        transport_files = [f for f in os.listdir(transport_dir) if f.endswith('.m4a')]
-    
-    return {
-        "service": "Audio API intégré - Système Dual Étendu",
-        "famille": {
-            "count": len(famille_files),
-            "files": sorted(famille_files)
-        },
-        "nature": {
-            "count": len(nature_files),
-            "files": sorted(nature_files)
-        },
-        "nombres": {
-            "count": len(nombres_files),
-            "files": sorted(nombres_files)
-        },
-        "animaux": {
-            "count": len(animaux_files),
-            "files": sorted(animaux_files)
-        },
-        "corps": {
-            "count": len(corps_files),
-            "files": sorted(corps_files)
-        },
-        "salutations": {
-            "count": len(salutations_files),
-            "files": sorted(salutations_files)
-        },
-        "couleurs": {
-            "count": len(couleurs_files),
-            "files": sorted(couleurs_files)
-        },
-        "grammaire": {
-            "count": len(grammaire_files),
-            "files": sorted(grammaire_files)
-        },
-        "nourriture": {
-            "count": len(nourriture_files),
-            "files": sorted(nourriture_files)
-        },
-        "verbes": {
-            "count": len(verbes_files),
-            "files": sorted(verbes_files)
-        },
-        "expressions": {
-            "count": len(expressions_files),
-            "files": sorted(expressions_files)
-        },
-        "adjectifs": {
-            "count": len(adjectifs_files),
-            "files": sorted(adjectifs_files)
-        },
-        "vetements": {
-            "count": len(vetements_files),
-            "files": sorted(vetements_files)
-        },
-        "maison": {
-            "count": len(maison_files),
-            "files": sorted(maison_files)
-        },
-        "tradition": {
-            "count": len(tradition_files),
-            "files": sorted(tradition_files)
-        },
-        "transport": {
-            "count": len(transport_files),
-            "files": sorted(transport_files)
-        },
-        "endpoints": {
-            "famille": "/api/audio/famille/{filename}",
-            "nature": "/api/audio/nature/{filename}",
-            "nombres": "/api/audio/nombres/{filename}",
-            "animaux": "/api/audio/animaux/{filename}",
-            "corps": "/api/audio/corps/{filename}",
-            "salutations": "/api/audio/salutations/{filename}",
-            "couleurs": "/api/audio/couleurs/{filename}",
-            "grammaire": "/api/audio/grammaire/{filename}",
-            "nourriture": "/api/audio/nourriture/{filename}",
-            "verbes": "/api/audio/verbes/{filename}",
-            "expressions": "/api/audio/expressions/{filename}",
-            "adjectifs": "/api/audio/adjectifs/{filename}",
-            "vetements": "/api/audio/vetements/{filename}",
-            "maison": "/api/audio/maison/{filename}",
-            "tradition": "/api/audio/tradition/{filename}",
-            "transport": "/api/audio/transport/{filename}",
-            "dual_system": "/api/words/{word_id}/audio/{lang}"
-        },
-        "total_categories": 16,
-        "total_files": len(famille_files) + len(nature_files) + len(nombres_files) + len(animaux_files) + len(corps_files) + len(salutations_files) + len(couleurs_files) + len(grammaire_files) + len(nourriture_files) + len(verbes_files) + len(expressions_files) + len(adjectifs_files) + len(vetements_files) + len(maison_files) + len(tradition_files) + len(transport_files)
-    }
+    # Servi depuis le manifeste audio, reconstruit seulement quand les dossiers changent
+    manifest = await run_in_threadpool(audio_manifest.current)
+    return encoded_json_response(request, manifest.audio_info())
 
 # Nouveaux endpoints pour le système audio dual
 @app.get("/api/words/{word_id}/audio/{lang}")
-async def get_word_audio_by_language(word_id: str, lang: str):
+async def get_word_audio_by_language(request: Request, word_id: str, lang: str):
     """
     Récupère l'audio d'un mot dans une langue spécifique
     lang: 'shimaore' ou 'kibouchi'
     """
-    if lang not in ['shimaore', 'kibouchi']:
+    if lang not in AUDIO_LANGUAGES:
         raise HTTPException(status_code=400, detail="Langue doit être 'shimaore' ou 'kibouchi'")
     
     try:
-        # Récupérer le mot - accepter à la fois 'id' (string) et '_id' (ObjectId)
-        try:
-            word_doc = words_collection.find_one({"_id": ObjectId(word_id)})
-        except Exception as e:
-            word_doc = words_collection.find_one({"id": word_id})
-        
-        if not word_doc:
-            raise HTTPException(status_code=404, detail=f"Mot non trouvé avec id: {word_id}")
-        
-        # Vérifier si le système dual est activé
-        if not word_doc.get("dual_audio_system", False):
-            raise HTTPException(status_code=400, detail="Ce mot n'utilise pas le système audio dual")
-        
-        # Récupérer le nom du fichier selon la langue - GÉRER LES DEUX FORMATS
-        if lang == "shimaore":
-            # Format 1: shimoare_audio_filename (anciennes catégories)
-            # Format 2: audio_filename_shimaore (nouveaux mots)
-            filename = word_doc.get("shimoare_audio_filename") or word_doc.get("audio_filename_shimaore")
-            has_audio = word_doc.get("shimoare_has_audio", False) or bool(filename)
-        else:  # kibouchi
-            # Format 1: kibouchi_audio_filename (anciennes catégories)
-            # Format 2: audio_filename_kibouchi (nouveaux mots)
-            filename = word_doc.get("kibouchi_audio_filename") or word_doc.get("audio_filename_kibouchi")
-            has_audio = word_doc.get("kibouchi_has_audio", False) or bool(filename)
-        
-        if not filename:
-            raise HTTPException(status_code=404, detail=f"Pas d'audio disponible en {lang} pour ce mot")
-        
-        # Servir le fichier
-        import os
-        from fastapi.responses import FileResponse
-        
-        # Détecter automatiquement la catégorie du mot pour utiliser le bon dossier
-        word_category = word_doc.get("section") or word_doc.get("category", "famille")
-        audio_dirs = {
-            "famille": "/app/backend/audio_assets/famille",
-            "nature": "/app/backend/audio_assets/nature", 
-            "nombres": "/app/backend/audio_assets/nombres",
-            "animaux": "/app/backend/audio_assets/animaux",
-            "corps": "/app/backend/audio_assets/corps",
-            "salutations": "//app/backend/audio_assets/salutations",
-            "couleurs": "/app/backend/audio_assets/couleurs",
-            "grammaire": "/app/backend/audio_assets/grammaire",
-            "nourriture": "/app/backend/audio_assets/nourriture",
-            "verbes": "/app/backend/audio_assets/verbes",
-            "expressions": "/app/backend/audio_assets/expressions",
-            "adjectifs": "/app/backend/audio_assets/adjectifs",
-            "vetements": "/app/backend/audio_assets/vetements",
-            "maison": "/app/backend/audio_assets/maison",
-            "tradition": "/app/backend/audio_assets/traditions",
-            "transport": "/app/backend/audio_assets/transport"
-        }
-        
-        # Chercher d'abord à la racine (nouveaux fichiers), puis dans le sous-dossier
-        file_path_root = os.path.join("/app/frontend/assets/audio", filename)
-        audio_dir = audio_dirs.get(word_category, audio_dirs["famille"])
-        file_path_category = os.path.join(audio_dir, filename)
-        
-        # Essayer les deux emplacements
-        if os.path.exists(file_path_root):
-            file_path = file_path_root
-        elif os.path.exists(file_path_category):
-            file_path = file_path_category
-        else:
-            raise HTTPException(status_code=404, detail=f"Fichier audio non trouvé: {filename} (cherché à la racine et dans {word_category})")
-        
-        return FileResponse(
-            file_path,
-            media_type="audio/mp4",
-            headers={"Content-Disposition": f"inline; filename={filename}"}
-        )
-        
-    except ValueError:
-        raise HTTPException(status_code=400, detail="ID de mot invalide")
+        return await word_audio_response(request, word_id, lang, require_dual_audio=True)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1695,7 +1329,7 @@ async def get_word_audio_info(word_id: str):
     Récupère les informations audio d'un mot (système dual)
     """
     try:
-        word_doc = words_collection.find_one({"_id": ObjectId(word_id)})
+        word_doc = await words_repository.find_by_id(word_id)
         if not word_doc:
             raise HTTPException(status_code=404, detail="Mot non trouvé")
         
@@ -1873,7 +1507,7 @@ async def download_server_file():
 
 
 @app.get("/api/debug/audio/{word_id}/{lang}")
-async def debug_audio_route(word_id: str, lang: str):
+async def debug_audio_route(word_id: str, lang: str, client=Depends(get_client)):
     """Route de debug pour l'audio"""
     try:
         from bson import ObjectId
@@ -1882,11 +1516,8 @@ async def debug_audio_route(word_id: str, lang: str):
         # Log de debug
         print(f"DEBUG: word_id={word_id}, lang={lang}")
         
-        # Connexion DB
-        mongo_url = os.getenv('MONGO_URL', 'mongodb://localhost:27017/')
-        client = MongoClient(mongo_url)
-        db = client['shimaoré_app']
-        collection = db['vocabulary']
+        # Connexion DB (pool partagé)
+        collection = client['shimaoré_app']['vocabulary']
         
         # Récupérer document
         try:
@@ -1894,7 +1525,7 @@ async def debug_audio_route(word_id: str, lang: str):
         except Exception as e:
             return {"error": f"Invalid ObjectId: {e}"}
             
-        word_doc = collection.find_one({"_id": obj_id})
+        word_doc = await collection.find_one({"_id": obj_id})
         if not word_doc:
             return {"error": "Document not found"}
         
@@ -1933,56 +1564,6 @@ async def debug_audio_route(word_id: str, lang: str):
         return {"error": f"Exception: {e}", "traceback": traceback.format_exc()}
 
 
-@app.get("/api/audio/{word_id}/{lang}")
-async def get_audio_file(word_id: str, lang: str):
-    """Route audio simplifiée et fonctionnelle"""
-    try:
-        from pymongo import MongoClient
-        from bson import ObjectId
-        from fastapi.responses import FileResponse
-        from fastapi import HTTPException
-        import os
-        
-        # Validation langue
-        if lang not in ["shimaore", "kibouchi"]:
-            raise HTTPException(status_code=400, detail="Langue non supportée")
-        
-        # Connexion DB
-        mongo_url = os.getenv('MONGO_URL', 'mongodb://localhost:27017/')
-        client = MongoClient(mongo_url)
-        db = client['shimaoré_app']
-        collection = db['vocabulary']
-        
-        # Récupérer le mot
-        try:
-            obj_id = ObjectId(word_id)
-        except:
-            raise HTTPException(status_code=400, detail="ID invalide")
-            
-        word_doc = collection.find_one({"_id": obj_id})
-        if not word_doc:
-            raise HTTPException(status_code=404, detail="Mot non trouvé")
-        
-        # Récupérer le fichier audio
-        if lang == "shimaore":
-            filename = word_doc.get("audio_shimaoré_filename")
-            has_audio = word_doc.get("has_shimaoré_audio", False)
-        else:
-            filename = word_doc.get("audio_kibouchi_filename")
-            has_audio = word_doc.get("has_kibouchi_audio", False)
-        
-        if not filename or not has_audio:
-            raise HTTPException(status_code=404, detail=f"Pas d'audio {lang}")
-        
-        # Retourner le fichier
-        file_path = os.path.join("/app/frontend/assets/audio", filename)
-        if not os.path.exists(file_path):
-            raise HTTPException(status_code=404, detail="Fichier audio introuvable")
-        
-        return FileResponse(file_path, media_type="audio/m4a")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
 # ============================================
 # SYSTÈME PREMIUM - Endpoints Utilisateurs
 # ============================================
@@ -1996,7 +1577,7 @@ from premium_system import (
 async def register_user(user_data: UserCreate):
     """Créer un nouvel utilisateur gratuit"""
     try:
-        user = create_user(user_data.user_id, user_data.email)
+        user = await create_user(user_data.user_id, user_data.email)
         # Convertir ObjectId en string
         user["id"] = str(user["_id"])
         del user["_id"]
@@ -2008,7 +1589,7 @@ async def register_user(user_data: UserCreate):
 async def get_user_info(user_id: str):
     """Récupérer les informations d'un utilisateur"""
     try:
-        user = get_user(user_id)
+        user = await get_user(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
         
@@ -2016,6 +1597,8 @@ async def get_user_info(user_id: str):
         user["id"] = str(user["_id"])
         del user["_id"]
         return user
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -2023,7 +1606,7 @@ async def get_user_info(user_id: str):
 async def upgrade_user_premium(user_id: str, upgrade_data: UpgradeRequest):
     """Simuler l'achat Premium (POUR TESTS - À remplacer par Stripe en production)"""
     try:
-        user = upgrade_to_premium(user_id, upgrade_data.subscription_type)
+        user = await upgrade_to_premium(user_id, upgrade_data.subscription_type)
         # Convertir ObjectId en string
         user["id"] = str(user["_id"])
         del user["_id"]
@@ -2040,8 +1623,12 @@ async def upgrade_user_premium(user_id: str, upgrade_data: UpgradeRequest):
 async def get_user_statistics(user_id: str):
     """Récupérer les statistiques d'un utilisateur"""
     try:
-        stats = get_user_stats(user_id)
+        stats = await get_user_stats(user_id)
+        if stats is None:
+            raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
         return stats
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -2049,7 +1636,7 @@ async def get_user_statistics(user_id: str):
 async def update_activity(user_id: str, words_learned: int = 0, score: int = 0):
     """Mettre à jour l'activité d'un utilisateur"""
     try:
-        user = update_user_activity(user_id, words_learned, score)
+        user = await update_user_activity(user_id, words_learned, score)
         # Convertir ObjectId en string
         user["id"] = str(user["_id"])
         del user["_id"]
@@ -2059,14 +1646,13 @@ async def update_activity(user_id: str, words_learned: int = 0, score: int = 0):
 
 # Endpoint pour récupérer les mots avec le système premium
 @app.get("/api/premium/words")
-async def get_words_premium(user_id: Optional[str] = None, category: Optional[str] = None):
+async def get_words_premium(request: Request, user_id: Optional[str] = None, category: Optional[str] = None):
     """Récupérer les mots avec limitation selon le statut premium"""
     try:
-        result = get_words_for_user(user_id, category)
-        return result
+        body = await get_words_for_user(vocabulary_snapshot, user_id, category)
+        return encoded_json_response(request, body)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-        raise HTTPException(status_code=500, detail=f"Erreur serveur: {str(e)}")
 
 
 # Route pour servir le document de vérification HTML
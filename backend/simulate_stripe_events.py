@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Envoie des événements Stripe factices au webhook d'un backend local
+(STRIPE_WEBHOOK_SECRET non défini : pas de vérification de signature)
+
+Usage: python simulate_stripe_events.py [nombre_de_renouvellements]
+Simule un achat, une rafale de renouvellements (début de mois), un renvoi
+d'événement déjà reçu puis une résiliation.
+"""
+import os
+import sys
+import time
+
+import requests
+
+from stripe_events import FakeStripeEventSource
+
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8001")
+WEBHOOK_URL = f"{BACKEND_URL}/api/stripe/webhook"
+
+
+def post(event):
+    response = requests.post(WEBHOOK_URL, json=event, timeout=10)
+    return response.status_code, response.json().get("status")
+
+
+def main():
+    renewals = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    source = FakeStripeEventSource()
+    now = int(time.time())
+
+    checkout = source.checkout_completed("simulation_user", "cus_simulation", "sub_simulation", created=now)
+    print("🛒 Achat:", post(checkout))
+
+    start = time.perf_counter()
+    statuses = {}
+    for i in range(renewals):
+        event = source.subscription_updated(f"cus_simulation_{i % 50}", "active", created=now + 1)
+        code, status = post(event)
+        statuses[(code, status)] = statuses.get((code, status), 0) + 1
+    elapsed = time.perf_counter() - start
+    print(f"🔁 {renewals} renouvellements en {elapsed:.2f}s ({elapsed / max(renewals, 1) * 1000:.1f} ms/événement): {statuses}")
+
+    print("📨 Renvoi du même événement:", post(checkout))
+    print("❌ Résiliation:", post(source.subscription_deleted("cus_simulation", created=now + 2)))
+
+
+if __name__ == "__main__":
+    main()
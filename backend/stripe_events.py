@@ -0,0 +1,274 @@
+"""
+Traitement asynchrone des webhooks Stripe pour Kwezi
+Le webhook ne fait que vérifier la signature et enregistrer l'événement brut
+dans stripe_events (_id = identifiant Stripe, donc un événement renvoyé par
+Stripe n'est stocké qu'une fois), puis répond immédiatement. Des workers en
+tâche de fond appliquent ensuite les changements d'abonnement.
+
+Les mises à jour sont idempotentes : chaque écriture sur users est
+conditionnée à la date de l'événement (stripe_event_at), si bien qu'un
+événement rejoué ou arrivé dans le désordre ne revient jamais en arrière.
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from database import stripe_events_repository, users_repository
+from entitlements import entitlements
+
+STRIPE_WEBHOOK_WORKERS = int(os.getenv("STRIPE_WEBHOOK_WORKERS", "4"))
+
+# Attente maximale entre deux recherches d'événements (secondes)
+STRIPE_EVENTS_POLL_INTERVAL = float(os.getenv("STRIPE_EVENTS_POLL_INTERVAL", "5"))
+
+# Durée de réservation d'un événement par un worker (reprise après plantage)
+STRIPE_EVENT_LEASE = timedelta(seconds=60)
+
+STRIPE_EVENT_MAX_ATTEMPTS = 10
+
+EventHandler = Callable[[dict], Awaitable[str]]
+
+
+def _event_time(event: dict) -> datetime:
+    """Date de création de l'événement chez Stripe (ordre des changements)"""
+    created = event.get("created")
+    return datetime.utcfromtimestamp(created) if created else datetime.utcnow()
+
+
+def _not_newer_than(event_at: datetime) -> dict:
+    """Filtre : l'utilisateur n'a pas encore reçu d'événement plus récent"""
+    return {"$or": [
+        {"stripe_event_at": {"$exists": False}},
+        {"stripe_event_at": {"$lte": event_at}},
+    ]}
+
+
+async def apply_checkout_completed(event: dict) -> str:
+    """
+    Active Premium : mise à jour conditionnée à stripe_event_at si
+    l'utilisateur existe, création sinon (CRITIQUE: l'utilisateur peut ne
+    pas encore exister)
+    """
+    session = event["data"]["object"]
+    user_id = session.get("client_reference_id")
+    if not user_id:
+        return "ignored"
+    event_at = _event_time(event)
+    now = datetime.utcnow()
+    premium = {
+        "is_premium": True,
+        "stripe_customer_id": session.get("customer"),
+        "stripe_subscription_id": session.get("subscription"),
+        "premium_since": event_at,
+        "stripe_event_at": event_at,
+        "updated_at": now
+    }
+
+    user = await users_repository.find_by_user_id(user_id)
+    if user is None:
+        # Création seulement si absent ($setOnInsert) : un document créé
+        # entre-temps n'est pas touché et reçoit la mise à jour conditionnelle
+        result = await users_repository.update_where(
+            {"user_id": user_id},
+            {"$setOnInsert": {
+                "user_id": user_id,
+                **premium,
+                "created_at": now,
+                "words_learned": 0,
+                "total_score": 0
+            }},
+            upsert=True
+        )
+        if result.upserted_id is not None:
+            entitlements.invalidate(user_id)
+            print(f"✅ Utilisateur {user_id} créé et Premium activé")
+            return "applied"
+        user = await users_repository.find_by_user_id(user_id)
+
+    result = await users_repository.update_where(
+        {"_id": user["_id"], **_not_newer_than(event_at)},
+        {"$set": premium}
+    )
+    if not result.matched_count:
+        # L'utilisateur a déjà reçu un événement plus récent : rien à appliquer
+        return "stale"
+    entitlements.invalidate(user_id)
+    print(f"✅ Utilisateur {user_id} mis à jour: Premium activé")
+    return "applied"
+
+
+async def _update_by_customer(event: dict, fields: dict) -> str:
+    customer_id = event["data"]["object"].get("customer")
+    user = await users_repository.find_by_customer_id(customer_id) if customer_id else None
+    if not user:
+        return "ignored"
+    event_at = _event_time(event)
+    result = await users_repository.update_where(
+        {"_id": user["_id"], **_not_newer_than(event_at)},
+        {"$set": {**fields, "stripe_event_at": event_at, "updated_at": datetime.utcnow()}}
+    )
+    entitlements.invalidate(user.get("user_id"))
+    return "applied" if result.matched_count else "stale"
+
+
+async def apply_subscription_updated(event: dict) -> str:
+    subscription_status = event["data"]["object"].get("status")
+    # Mettre à jour le statut selon l'état de l'abonnement
+    is_premium = subscription_status in ["active", "trialing"]
+    return await _update_by_customer(event, {
+        "is_premium": is_premium,
+        "subscription_status": subscription_status
+    })
+
+
+async def apply_subscription_deleted(event: dict) -> str:
+    # Retirer le statut premium
+    return await _update_by_customer(event, {
+        "is_premium": False,
+        "subscription_status": "cancelled",
+        "premium_cancelled_at": _event_time(event)
+    })
+
+
+EVENT_HANDLERS: Dict[str, EventHandler] = {
+    "checkout.session.completed": apply_checkout_completed,
+    "customer.subscription.updated": apply_subscription_updated,
+    "customer.subscription.deleted": apply_subscription_deleted,
+}
+
+
+class StripeEventProcessor:
+    """Workers qui appliquent les événements enregistrés par le webhook"""
+
+    def __init__(self, workers: int = STRIPE_WEBHOOK_WORKERS, poll_interval: float = STRIPE_EVENTS_POLL_INTERVAL):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def ingest(self, event: dict) -> bool:
+        """
+        Enregistre un événement (dict JSON tel qu'envoyé par Stripe)
+        Retourne False si l'événement a déjà été reçu
+        """
+        inserted = await stripe_events_repository.insert_if_new({
+            "_id": event["id"],
+            "type": event.get("type"),
+            "created": event.get("created"),
+            "payload": event,
+            "status": "pending",
+            "attempts": 0,
+            "received_at": datetime.utcnow(),
+            "available_at": datetime.utcnow()
+        })
+        if inserted and self._wakeup is not None:
+            self._wakeup.set()
+        return inserted
+
+    async def process_next(self, worker_id: str) -> bool:
+        """Traite un événement en attente ; False s'il n'y en a aucun"""
+        now = datetime.utcnow()
+        record = await stripe_events_repository.claim_next(worker_id, now, now + STRIPE_EVENT_LEASE)
+        if record is None:
+            return False
+        event = record["payload"]
+        handler = EVENT_HANDLERS.get(record["type"])
+        try:
+            if handler is None:
+                print(f"⚠️ Événement non géré: {record['type']}")
+                outcome = "unhandled"
+            else:
+                outcome = await handler(event)
+            result = await stripe_events_repository.mark_done(record["_id"], worker_id, outcome, datetime.utcnow())
+            if not result.matched_count:
+                print(f"⚠️ Événement Stripe {record['_id']} repris par un autre worker (réservation expirée)")
+        except Exception as e:
+            attempts = record.get("attempts", 1)
+            print(f"❌ Erreur webhook Stripe {record['_id']} (essai {attempts}): {e}")
+            if attempts >= STRIPE_EVENT_MAX_ATTEMPTS:
+                await stripe_events_repository.mark_failed(record["_id"], worker_id, str(e))
+            else:
+                # Nouvel essai avec attente exponentielle (plafonnée à une heure)
+                retry_at = datetime.utcnow() + timedelta(seconds=min(2 ** attempts, 3600))
+                await stripe_events_repository.release(record["_id"], worker_id, str(e), retry_at)
+        return True
+
+    async def drain(self) -> int:
+        """Traite tous les événements disponibles (tests et outils locaux)"""
+        processed = 0
+        while await self.process_next("drain"):
+            processed += 1
+        return processed
+
+    async def _run(self, worker_id: str):
+        while True:
+            try:
+                while await self.process_next(worker_id):
+                    pass
+            except Exception as e:
+                print(f"⚠️ Worker Stripe {worker_id}: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self):
+        """Démarre les workers (démarrage du serveur)"""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        prefix = uuid.uuid4().hex[:8]
+        self._tasks = [asyncio.create_task(self._run(f"{prefix}-{i}")) for i in range(self.workers)]
+
+    def stop(self):
+        # Un événement en cours est repris après expiration de sa réservation
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+
+stripe_event_processor = StripeEventProcessor()
+
+
+class FakeStripeEventSource:
+    """
+    Source locale d'événements au format Stripe (développement et tests) :
+    les événements sont injectés directement dans le pipeline, sans signature
+    """
+
+    def __init__(self, processor: StripeEventProcessor = stripe_event_processor):
+        self.processor = processor
+
+    @staticmethod
+    def event(event_type: str, data_object: dict, created: Optional[int] = None, event_id: Optional[str] = None) -> dict:
+        return {
+            "id": event_id or f"evt_local_{uuid.uuid4().hex}",
+            "object": "event",
+            "type": event_type,
+            "created": created or int(datetime.utcnow().timestamp()),
+            "data": {"object": data_object},
+        }
+
+    def checkout_completed(self, user_id: str, customer_id: str, subscription_id: str, **kwargs) -> dict:
+        return self.event("checkout.session.completed", {
+            "object": "checkout.session",
+            "client_reference_id": user_id,
+            "customer": customer_id,
+            "subscription": subscription_id,
+        }, **kwargs)
+
+    def subscription_updated(self, customer_id: str, status: str = "active", **kwargs) -> dict:
+        return self.event("customer.subscription.updated", {
+            "object": "subscription", "customer": customer_id, "status": status,
+        }, **kwargs)
+
+    def subscription_deleted(self, customer_id: str, **kwargs) -> dict:
+        return self.event("customer.subscription.deleted", {
+            "object": "subscription", "customer": customer_id, "status": "canceled",
+        }, **kwargs)
+
+    async def send(self, *events: dict) -> List[bool]:
+        return [await self.processor.ingest(event) for event in events]
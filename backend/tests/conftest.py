@@ -0,0 +1,38 @@
+"""
+Configuration commune des tests du backend
+MongoDB est remplacé par mongomock-motor (en mémoire) avant l'import des
+modules du backend : database.py crée ses clients à l'import.
+"""
+import asyncio
+import os
+import sys
+
+import mongomock
+import mongomock_motor
+import motor.motor_asyncio
+import pymongo
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+pymongo.MongoClient = mongomock.MongoClient
+motor.motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+
+import database  # noqa: E402
+
+
+def run(coroutine):
+    """Exécute une coroutine dans une boucle neuve (pas de pytest-asyncio)"""
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    """Base vide pour chaque test"""
+    async def drop_all():
+        for name in await database.db.list_collection_names():
+            await database.db[name].drop()
+
+    run(drop_all())
+    yield
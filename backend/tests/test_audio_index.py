@@ -0,0 +1,60 @@
+"""Index audio : détection des fichiers réécrits sur place"""
+import os
+
+from audio_index import AudioIndex
+
+
+def write_audio(path, content, mtime_ns):
+    with open(path, "wb") as f:
+        f.write(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_in_place_overwrite_rebuilds_index(tmp_path):
+    frontend = tmp_path / "frontend"
+    (frontend / "famille").mkdir(parents=True)
+    backend = tmp_path / "backend"
+    backend.mkdir()
+    path = frontend / "famille" / "Mama.m4a"
+    write_audio(path, b"ancien", 1_000_000_000_000_000_000)
+
+    index = AudioIndex(str(frontend), str(backend), poll_seconds=0)
+    before = index.find("famille", "Mama.m4a")
+    hash_before = before.content_hash()
+    directory_mtime = os.stat(frontend / "famille").st_mtime_ns
+
+    # Copie par-dessus (shutil.copy2) : même dossier, nouveau contenu
+    write_audio(path, b"nouveau contenu", 1_000_000_000_000_000_000 + 1)
+    assert os.stat(frontend / "famille").st_mtime_ns == directory_mtime
+
+    assert index.refresh_if_changed()
+    after = index.find("famille", "Mama.m4a")
+    assert after.size == len(b"nouveau contenu")
+    assert after.content_hash() != hash_before
+    assert not index.refresh_if_changed()
+
+
+def test_word_audio_lookup_order(tmp_path):
+    frontend = tmp_path / "frontend"
+    frontend.mkdir()
+    backend = tmp_path / "backend"
+    for directory in ("famille", "animaux", "traditions"):
+        (backend / directory).mkdir(parents=True)
+    (frontend / "Racine.m4a").write_bytes(b"racine")
+    (backend / "animaux" / "Paka.m4a").write_bytes(b"paka")
+    (backend / "traditions" / "Mbiwi.m4a").write_bytes(b"mbiwi")
+    (backend / "famille" / "Mama.m4a").write_bytes(b"mama")
+    index = AudioIndex(str(frontend), str(backend), poll_seconds=0)
+
+    def resolve(category, filename):
+        word = {"category": category, "dual_audio_system": True, "shimoare_audio_filename": filename}
+        audio_file = index.resolve_word(word, "shimaore")
+        return audio_file and os.path.relpath(audio_file.path, tmp_path)
+
+    assert resolve("animaux", "Racine.m4a") == os.path.join("frontend", "Racine.m4a")
+    assert resolve("animaux", "Paka.m4a") == os.path.join("backend", "animaux", "Paka.m4a")
+    assert resolve("tradition", "Mbiwi.m4a") == os.path.join("backend", "traditions", "Mbiwi.m4a")
+    # Catégorie sans dossier : dossier famille par défaut, comme l'ancien handler
+    assert resolve("couleurs", "Mama.m4a") == os.path.join("backend", "famille", "Mama.m4a")
+    # Catégorie avec son propre dossier : pas de repli
+    assert resolve("animaux", "Mama.m4a") is None
@@ -0,0 +1,65 @@
+"""Paquets audio : deltas depuis toute version du manifeste reçue par un client"""
+import threading
+import zipfile
+
+from audio_index import AudioIndex
+from audio_manifest import AudioManifest
+from audio_packs import AudioPacks, PACK_MANIFEST_NAME
+
+
+def make_packs(tmp_path):
+    frontend = tmp_path / "frontend"
+    (frontend / "famille").mkdir(parents=True)
+    (frontend / "famille" / "Mama.m4a").write_bytes(b"mama")
+    index = AudioIndex(str(frontend), str(tmp_path / "backend"), poll_seconds=0)
+    manifest = AudioManifest(index)
+    packs = AudioPacks(manifest, packs_dir=str(tmp_path / "packs"))
+    return frontend / "famille", index, manifest, packs
+
+
+def add_file(directory, index, manifest, name):
+    (directory / name).write_bytes(name.encode())
+    assert index.refresh_if_changed()
+    return manifest.current().version
+
+
+def pack_files(pack):
+    with zipfile.ZipFile(pack.path) as archive:
+        return sorted(name for name in archive.namelist() if name != PACK_MANIFEST_NAME)
+
+
+def test_delta_from_a_version_built_between_packs(tmp_path):
+    directory, index, manifest, packs = make_packs(tmp_path)
+    packs.get_pack("famille")
+    # Versions vues par les clients via /api/audio/manifest, sans paquet construit
+    seen = add_file(directory, index, manifest, "Baba.m4a")
+    add_file(directory, index, manifest, "Zena.m4a")
+
+    pack = packs.get_pack("famille", since=seen)
+    assert pack.since == seen
+    assert pack_files(pack) == ["famille/Zena.m4a"]
+
+
+def test_history_recorded_for_manifest_built_before_packs(tmp_path):
+    directory, index, manifest, _ = make_packs(tmp_path)
+    first = manifest.current().version
+    packs = AudioPacks(manifest, packs_dir=str(tmp_path / "packs-2"))
+    add_file(directory, index, manifest, "Baba.m4a")
+    assert pack_files(packs.get_pack("famille", since=first)) == ["famille/Baba.m4a"]
+
+
+def test_concurrent_builds_keep_the_current_pack(tmp_path):
+    directory, index, manifest, packs = make_packs(tmp_path)
+    old = manifest.current().version
+    add_file(directory, index, manifest, "Baba.m4a")
+    results = []
+    threads = [
+        threading.Thread(target=lambda since=since: results.append(packs.get_pack("famille", since=since)))
+        for since in (None, old, None, old)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for pack in results:
+        assert zipfile.ZipFile(pack.path).testzip() is None
@@ -0,0 +1,47 @@
+"""Génération des phrases conjuguées : conjugaison française complète pour chaque verbe"""
+import os
+
+import bson
+import pytest
+
+from conjugation_engine import ConjugationEngine, check_french_conjugations
+from french_conjugations import MissingConjugationError, conjugate_french
+
+from tests.conftest import BACKEND_DIR
+
+SEED_WORDS = os.path.join(BACKEND_DIR, "db_backup", "mayotte_app", "words.bson")
+
+
+def seed_verbs():
+    with open(SEED_WORDS, "rb") as f:
+        return [word for word in bson.decode_all(f.read()) if word.get("category") == "verbes"]
+
+
+def test_every_seed_verb_has_a_french_conjugation():
+    verbs = seed_verbs()
+    check_french_conjugations(verbs)
+    sentences = list(ConjugationEngine().conjugate_batch(verbs))
+    assert len(sentences) == len(verbs) * 18
+    for sentence in sentences:
+        # Forme de repli : pronom + infinitif
+        assert sentence["french"] != f"{sentence['subject']} {sentence['verb_infinitive_fr'].lower()}"
+
+
+@pytest.mark.parametrize("verb, pronoun, tense, expected", [
+    ("Faire sécher", "ils", "present", "ils font sécher"),
+    ("Ranger/arranger", "je", "present", "je range"),
+    ("Faire le lit", "tu", "present", "tu fais le lit"),
+    ("Enterrer", "je", "present", "j'enterre"),
+    ("Se laver", "il", "past", "il s'est lavé"),
+    ("S'asseoir", "nous", "future", "nous nous assiérons"),
+])
+def test_french_forms(verb, pronoun, tense, expected):
+    assert conjugate_french(verb, pronoun, tense, strict=True) == expected
+
+
+def test_generation_fails_instead_of_fallback():
+    verbs = [{"french": "Zigouiller", "shimaore": "ouzigou", "kibouchi": "mizigou"}]
+    with pytest.raises(MissingConjugationError):
+        check_french_conjugations(verbs)
+    with pytest.raises(MissingConjugationError):
+        list(ConjugationEngine().conjugate_batch(verbs))
@@ -0,0 +1,134 @@
+"""Sauvegardes incrémentales : restauration de la chaîne base + deltas"""
+import gzip
+import os
+import threading
+
+import pytest
+
+import database_protection
+from database_protection import DatabaseProtector
+
+
+@pytest.fixture
+def protector(tmp_path, monkeypatch):
+    monkeypatch.setattr(database_protection, "BACKUP_DIR", str(tmp_path))
+    protector = DatabaseProtector()
+    protector.words_collection.delete_many({})
+    yield protector
+    protector.words_collection.delete_many({})
+
+
+def snapshot(protector):
+    return sorted(protector.words_collection.find({}), key=lambda word: str(word["_id"]))
+
+
+def test_restore_replays_base_then_deltas(protector):
+    words = protector.words_collection
+    words.insert_many([
+        {"_id": "mama", "french": "maman", "shimaore": "mama"},
+        {"french": "papa", "shimaore": "baba"},
+        {"french": "eau", "shimaore": "maji"},
+    ])
+    base = protector.create_backup("base")
+    assert base.endswith(".base.ndjson.gz")
+
+    words.update_one({"_id": "mama"}, {"$set": {"kibouchi": "nindri"}})
+    words.delete_one({"french": "eau"})
+    words.insert_one({"french": "arbre", "shimaore": "mwiri"})
+    first_delta = protector.create_backup("delta")
+    after_first = snapshot(protector)
+
+    words.update_one({"french": "papa"}, {"$set": {"shimaore": "baba wa"}})
+    second_delta = protector.create_backup("delta")
+    after_second = snapshot(protector)
+    assert first_delta.endswith(".delta.ndjson.gz") and second_delta.endswith(".delta.ndjson.gz")
+    assert protector._backup_chain(second_delta) == [base, first_delta, second_delta]
+
+    words.delete_many({})
+    assert protector.restore_from_backup(first_delta)
+    assert snapshot(protector) == after_first
+
+    assert protector.restore_from_backup(second_delta)
+    assert snapshot(protector) == after_second
+
+
+def test_backup_without_changes_writes_nothing(protector, tmp_path):
+    protector.words_collection.insert_one({"french": "chat"})
+    base = protector.create_backup("base")
+    files = sorted(os.listdir(tmp_path))
+    assert protector.create_backup("delta") == base
+    assert sorted(os.listdir(tmp_path)) == files
+
+
+def test_truncated_delta_aborts_before_erasing(protector):
+    words = protector.words_collection
+    words.insert_one({"french": "chat"})
+    protector.create_backup("base")
+    words.insert_one({"french": "chien"})
+    delta = protector.create_backup("delta")
+
+    with gzip.open(delta, "rt", encoding="utf-8") as f:
+        lines = f.readlines()
+    with gzip.open(delta, "wt", encoding="utf-8") as f:
+        f.writelines(lines[:-1])
+
+    words.insert_one({"french": "oiseau"})
+    before = snapshot(protector)
+    assert not protector.restore_from_backup(delta)
+    assert snapshot(protector) == before
+
+
+def test_full_backup_starts_a_new_chain(protector):
+    protector.words_collection.insert_one({"french": "chat"})
+    protector.create_backup("base")
+    protector.words_collection.insert_one({"french": "chien"})
+    full = protector.create_backup("manual", full=True)
+    assert protector._backup_chain(full) == [full]
+    with protector._open_backup(full) as (header, records):
+        assert header["type"] == "base"
+        assert len(list(records)) == 2
+
+
+def test_word_write_forces_health_recompute(monkeypatch):
+    """Une écriture via invalidate_word_caches() invalide les statistiques de santé en cache"""
+    import server
+    from fastapi.testclient import TestClient
+
+    protector = server.db_protector
+    computed = []
+    real_compute = protector._compute_health
+    monkeypatch.setattr(protector, "_compute_health", lambda: computed.append(1) or real_compute())
+    protector.invalidate_stats()
+    protector.get_database_stats()
+    protector.get_database_stats()
+    assert len(computed) == 1
+
+    response = TestClient(server.app).post("/api/words", json={
+        "french": "chien", "shimaore": "mbwa", "kibouchi": "amboa", "category": "animaux",
+    })
+    assert response.status_code == 200
+    protector.get_database_stats()
+    assert len(computed) == 2
+
+
+def test_invalidation_during_compute_is_not_cached(protector, monkeypatch):
+    computed = []
+    real_compute = protector._compute_health
+
+    def compute_with_concurrent_write():
+        result = real_compute()
+        computed.append(result)
+        if len(computed) == 1:
+            # Écriture pendant le calcul : invalidate_stats ne doit pas attendre le calcul
+            writer = threading.Thread(target=protector.invalidate_stats)
+            writer.start()
+            writer.join(timeout=1)
+            assert not writer.is_alive()
+        return result
+
+    monkeypatch.setattr(protector, "_compute_health", compute_with_concurrent_write)
+    protector.get_database_stats()
+    protector.get_database_stats()
+    assert len(computed) == 2
+    protector.get_database_stats()
+    assert len(computed) == 2
@@ -0,0 +1,84 @@
+"""Fichiers servis par http_cache : Range, If-Range, 304 et 416"""
+import os
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from http_cache import file_content_hash, file_response, parse_byte_range
+
+CONTENT = b"0123456789"
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("bytes=0-3", (0, 3)),
+    ("bytes=4-", (4, 9)),
+    ("bytes=-3", (7, 9)),
+    ("bytes=-30", (0, 9)),
+    ("bytes=5-100", (5, 9)),
+    ("bytes=10-12", False),
+    ("bytes=6-2", False),
+    ("bytes=-0", False),
+    ("bytes=0-1,4-5", None),
+    ("bytes=a-b", None),
+    ("items=0-3", None),
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, len(CONTENT)) == expected
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = tmp_path / "son.m4a"
+    path.write_bytes(CONTENT)
+    etag = '"' + file_content_hash(str(path))[:32] + '"'
+    app = FastAPI()
+
+    @app.get("/son")
+    async def son(request: Request):
+        return await file_response(
+            request, str(path), os.stat(path), etag, media_type="audio/mp4",
+            filename="son.m4a", cache_control="public, max-age=3600, must-revalidate",
+        )
+
+    client = TestClient(app)
+    client.etag = etag
+    return client
+
+
+def test_full_and_partial_responses(client):
+    full = client.get("/son")
+    assert full.status_code == 200
+    assert full.content == CONTENT
+    assert full.headers["etag"] == client.etag
+    assert full.headers["cache-control"] == "public, max-age=3600, must-revalidate"
+
+    partial = client.get("/son", headers={"Range": "bytes=2-4"})
+    assert partial.status_code == 206
+    assert partial.content == b"234"
+    assert partial.headers["content-range"] == "bytes 2-4/10"
+
+
+def test_unsatisfiable_range_is_416(client):
+    response = client.get("/son", headers={"Range": "bytes=20-30"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */10"
+
+
+def test_if_range_matching_etag_serves_range(client):
+    response = client.get("/son", headers={"Range": "bytes=0-1", "If-Range": client.etag})
+    assert response.status_code == 206
+    assert response.content == b"01"
+
+
+@pytest.mark.parametrize("range_header", ["bytes=0-1", "bytes=20-30"])
+def test_stale_if_range_serves_full_body(client, range_header):
+    response = client.get("/son", headers={"Range": range_header, "If-Range": '"perime"'})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_if_none_match_is_304(client):
+    response = client.get("/son", headers={"If-None-Match": client.etag})
+    assert response.status_code == 304
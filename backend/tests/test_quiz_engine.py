@@ -0,0 +1,89 @@
+"""Quiz : questions audio jouables pour l'audio dual comme pour l'ancien format"""
+import random
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+from database import db
+from quiz_engine import lazy_permutation
+
+from tests.conftest import run
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    frontend = tmp_path / "frontend"
+    frontend.mkdir()
+    backend = tmp_path / "backend"
+    (backend / "famille").mkdir(parents=True)
+    (backend / "famille" / "Mama.m4a").write_bytes(b"mama")
+    (backend / "famille" / "Baba.m4a").write_bytes(b"baba")
+    monkeypatch.setattr(server.audio_index, "frontend_dir", str(frontend))
+    monkeypatch.setattr(server.audio_index, "backend_dir", str(backend))
+    server.audio_index.build()
+
+    async def seed():
+        await db.words.insert_many([
+            # Ancien format (pas de système dual)
+            {"french": "maman", "shimaore": "mama", "kibouchi": "mama", "category": "famille", "difficulty": 1,
+             "has_shimaoré_audio": True, "audio_shimaoré_filename": "Mama.m4a"},
+            # Système dual
+            {"french": "papa", "shimaore": "baba", "kibouchi": "baba", "category": "famille", "difficulty": 1,
+             "dual_audio_system": True, "shimoare_audio_filename": "Baba.m4a"},
+            {"french": "frère", "shimaore": "mwanama", "kibouchi": "zoki", "category": "famille", "difficulty": 1},
+        ])
+
+    run(seed())
+    server.invalidate_word_caches()
+    yield TestClient(server.app)
+    server.invalidate_word_caches()
+    monkeypatch.undo()
+    server.audio_index.build()
+
+
+def test_audio_questions_point_to_playable_audio(client):
+    response = client.get("/api/quiz", params={"type": "audio-shimaore", "count": 5, "options": 2})
+    assert response.status_code == 200
+    questions = response.json()["questions"]
+    assert sorted(question["correct_answer"] for question in questions) == ["maman", "papa"]
+    for question in questions:
+        audio = client.get(question["prompt"]["audio_url"])
+        assert audio.status_code == 200
+        assert audio.content == {"maman": b"mama", "papa": b"baba"}[question["correct_answer"]]
+
+
+@pytest.mark.parametrize("n", [0, 1, 7, 100])
+def test_lazy_permutation_is_a_permutation(n):
+    assert sorted(lazy_permutation(n)) == list(range(n))
+
+
+def test_lazy_permutation_draws_only_what_is_consumed(monkeypatch):
+    draws = []
+    real_randrange = random.randrange
+    monkeypatch.setattr(random, "randrange", lambda a, b: draws.append((a, b)) or real_randrange(a, b))
+    positions = lazy_permutation(10_000)
+    first = [next(positions) for _ in range(5)]
+    assert len(set(first)) == 5
+    assert len(draws) == 5
+
+
+def test_audio_table_is_built_off_the_event_loop(client, monkeypatch):
+    loop_thread = threading.get_ident()
+    builders = []
+    real_word_files = server.audio_index.word_files
+
+    def recording_word_files(vocabulary):
+        if not server.audio_index.word_files_ready(vocabulary):
+            builders.append(threading.get_ident())
+        return real_word_files(vocabulary)
+
+    monkeypatch.setattr(server.audio_index, "word_files", recording_word_files)
+
+    async def scenario():
+        return await server.quiz_engine.generate("audio-shimaore", 5, options=2)
+
+    quiz = run(scenario())
+    assert quiz["total"] == 2
+    assert builders and loop_thread not in builders
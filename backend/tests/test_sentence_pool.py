@@ -0,0 +1,68 @@
+"""Réserve de phrases : tirage en mémoire et tirage direct par $sample"""
+import pytest
+
+from database import SentencesRepository, db
+from sentence_pool import SentenceBucket, SentencePool
+
+from tests.conftest import run
+
+
+async def seed(count):
+    await db.sentences.insert_many([
+        {"french": f"phrase {i}", "verb_infinitive_fr": f"verbe {i % 4}", "tense": "present", "difficulty": 1}
+        for i in range(count)
+    ])
+
+
+@pytest.mark.parametrize("max_size", [100, 0])
+def test_sample_with_zero_limit_is_empty(max_size):
+    pool = SentencePool(SentencesRepository(db.sentences), max_size=max_size)
+
+    async def scenario():
+        await seed(8)
+        return await pool.sample(0), await pool.sample(-3), await pool.sample(3)
+
+    empty, negative, sentences = run(scenario())
+    assert empty == []
+    assert negative == []
+    assert len(sentences) == 3
+    assert len({sentence["verb_infinitive_fr"] for sentence in sentences}) == 3
+
+
+def test_database_sampling_never_sends_size_zero(monkeypatch):
+    repository = SentencesRepository(db.sentences)
+    pool = SentencePool(repository, max_size=0)
+    sizes = []
+    real_sample = repository.sample
+
+    async def recording_sample(query, size):
+        sizes.append(size)
+        return await real_sample(query, size)
+
+    monkeypatch.setattr(repository, "sample", recording_sample)
+    monkeypatch.setattr(repository, "sample_distinct", lambda *args: pytest.fail("$sample de taille nulle"))
+
+    async def scenario():
+        await seed(2)
+        return await pool.sample(0)
+
+    assert run(scenario()) == []
+    assert sizes == []
+
+
+@pytest.mark.parametrize("limit", [1, 3, 4, 9, 15, 40, 41, 100])
+def test_bucket_sample_prefers_distinct_verbs_without_duplicates(limit):
+    bucket = SentenceBucket()
+    # Verbes déséquilibrés : un verbe très fréquent, trois rares
+    for i in range(30):
+        bucket.add("parler", {"french": f"parler {i}"})
+    for verb in ("manger", "dormir", "courir"):
+        for i in range(3):
+            bucket.add(verb, {"french": f"{verb} {i}"})
+    bucket.add("lire", {"french": "lire"})
+
+    picked = bucket.sample(limit)
+    assert len(picked) == min(limit, bucket.size)
+    assert len({id(sentence) for sentence in picked}) == len(picked)
+    verbs = {sentence["french"].split()[0] for sentence in picked}
+    assert len(verbs) == min(len(picked), 5)
@@ -0,0 +1,121 @@
+"""Webhooks Stripe : ordre des événements, idempotence et réservations"""
+from datetime import timedelta
+
+import stripe_events
+from database import db, stripe_events_repository, users_repository
+from stripe_events import FakeStripeEventSource, StripeEventProcessor
+
+from tests.conftest import run
+
+
+def pipeline():
+    processor = StripeEventProcessor(workers=1)
+    return processor, FakeStripeEventSource(processor)
+
+
+async def outcome(event):
+    return (await stripe_events_repository.collection.find_one({"_id": event["id"]}))["outcome"]
+
+
+def test_checkout_creates_missing_user():
+    processor, source = pipeline()
+
+    async def scenario():
+        event = source.checkout_completed("alice", "cus_a", "sub_a", created=100)
+        await source.send(event)
+        await processor.drain()
+        return await outcome(event), await users_repository.find_by_user_id("alice")
+
+    result, user = run(scenario())
+    assert result == "applied"
+    assert user["is_premium"] is True
+    assert user["stripe_customer_id"] == "cus_a"
+    assert user["words_learned"] == 0
+
+
+def test_checkout_updates_existing_user_without_touching_progress():
+    processor, source = pipeline()
+
+    async def scenario():
+        await users_repository.insert({"user_id": "bob", "words_learned": 12, "total_score": 340})
+        await source.send(source.checkout_completed("bob", "cus_b", "sub_b", created=100))
+        await processor.drain()
+        return await users_repository.find_by_user_id("bob"), await db.users.count_documents({"user_id": "bob"})
+
+    user, count = run(scenario())
+    assert count == 1
+    assert user["is_premium"] is True
+    assert user["words_learned"] == 12
+    assert user["total_score"] == 340
+
+
+def test_redelivered_event_is_stored_once():
+    processor, source = pipeline()
+
+    async def scenario():
+        event = source.checkout_completed("carol", "cus_c", "sub_c", created=100)
+        received = await source.send(event, event)
+        processed = await processor.drain()
+        return received, processed
+
+    received, processed = run(scenario())
+    assert received == [True, False]
+    assert processed == 1
+
+
+def test_out_of_order_events_never_go_back():
+    processor, source = pipeline()
+
+    async def scenario():
+        checkout = source.checkout_completed("dave", "cus_d", "sub_d", created=100)
+        await source.send(checkout)
+        await processor.drain()
+        deleted = source.subscription_deleted("cus_d", created=300)
+        late_update = source.subscription_updated("cus_d", "active", created=200)
+        # Même checkout renvoyé sous un autre identifiant, après la résiliation
+        late_checkout = source.checkout_completed("dave", "cus_d", "sub_d", created=100)
+        await source.send(deleted)
+        await processor.drain()
+        await source.send(late_update, late_checkout)
+        await processor.drain()
+        return (
+            [await outcome(e) for e in (deleted, late_update, late_checkout)],
+            await users_repository.find_by_user_id("dave"),
+            await db.users.count_documents({"user_id": "dave"}),
+        )
+
+    outcomes, user, count = run(scenario())
+    assert outcomes == ["applied", "stale", "stale"]
+    assert user["is_premium"] is False
+    assert user["subscription_status"] == "cancelled"
+    assert count == 1
+
+
+def test_expired_lease_taken_over_is_not_overwritten(monkeypatch):
+    """Le premier worker, dont la réservation a expiré, ne touche plus à l'événement repris"""
+    processor, source = pipeline()
+    monkeypatch.setattr(stripe_events, "STRIPE_EVENT_LEASE", timedelta(seconds=-1))
+    calls = []
+
+    async def slow_then_failing(event):
+        calls.append(len(calls))
+        if len(calls) == 1:
+            # Réservation expirée pendant le traitement : un second worker reprend
+            await processor.process_next("worker-b")
+            raise RuntimeError("délai dépassé")
+        return "applied"
+
+    monkeypatch.setitem(stripe_events.EVENT_HANDLERS, "checkout.session.completed", slow_then_failing)
+
+    async def scenario():
+        event = source.checkout_completed("erin", "cus_e", "sub_e", created=100)
+        await source.send(event)
+        await processor.process_next("worker-a")
+        return await stripe_events_repository.collection.find_one({"_id": event["id"]})
+
+    record = run(scenario())
+    assert calls == [0, 1]
+    assert record["status"] == "done"
+    assert record["outcome"] == "applied"
+    assert record["worker"] == "worker-b"
+    assert "last_error" not in record
@@ -0,0 +1,61 @@
+"""Webhook Stripe : signature obligatoire dès qu'un secret est configuré"""
+import json
+import time
+
+import pytest
+import stripe
+from fastapi.testclient import TestClient
+
+import server
+from database import stripe_events_repository
+
+from tests.conftest import run
+
+SECRET = "whsec_test"
+
+
+def event_payload(event_id="evt_test"):
+    return json.dumps({
+        "id": event_id,
+        "type": "checkout.session.completed",
+        "created": int(time.time()),
+        "data": {"object": {"client_reference_id": "mallory", "customer": "cus_m"}},
+    })
+
+
+def signature(payload, secret=SECRET):
+    timestamp = int(time.time())
+    signed = stripe.WebhookSignature._compute_signature(f"{timestamp}.{payload}", secret)
+    return f"t={timestamp},v1={signed}"
+
+
+def stored(event_id="evt_test"):
+    return run(stripe_events_repository.collection.find_one({"_id": event_id}))
+
+
+@pytest.fixture
+def client():
+    return TestClient(server.app)
+
+
+@pytest.mark.parametrize("headers", [{}, {"Stripe-Signature": "t=1,v1=faux"}])
+def test_unsigned_or_forged_event_is_rejected_when_secret_is_set(client, monkeypatch, headers):
+    monkeypatch.setenv("STRIPE_WEBHOOK_SECRET", SECRET)
+    response = client.post("/api/stripe/webhook", content=event_payload(), headers=headers)
+    assert response.status_code == 400
+    assert stored() is None
+
+
+def test_signed_event_is_stored_when_secret_is_set(client, monkeypatch):
+    monkeypatch.setenv("STRIPE_WEBHOOK_SECRET", SECRET)
+    payload = event_payload()
+    response = client.post("/api/stripe/webhook", content=payload, headers={"Stripe-Signature": signature(payload)})
+    assert response.status_code == 200
+    assert stored()["type"] == "checkout.session.completed"
+
+
+def test_unsigned_event_is_accepted_without_secret(client, monkeypatch):
+    monkeypatch.delenv("STRIPE_WEBHOOK_SECRET", raising=False)
+    response = client.post("/api/stripe/webhook", content=event_payload())
+    assert response.status_code == 200
+    assert stored() is not None
@@ -0,0 +1,95 @@
+"""Pagination du vocabulaire : page_words (curseur, offset) et /api/words (fields)"""
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+from database import db
+from vocabulary_cache import VocabularyData, decode_cursor, encode_cursor
+
+from tests.conftest import run
+
+WORDS = [
+    {"id": f"{i:02d}", "french": french, "category": category}
+    for i, (french, category) in enumerate([
+        ("chat", "animaux"), ("arbre", "nature"), ("chien", "animaux"), ("eau", "nature"),
+        ("bonjour", "salutations"), ("chat", "animaux"), ("baleine", "animaux"),
+    ])
+]
+
+
+def walk(data, category=None, limit=2):
+    pages, cursor = [], None
+    while True:
+        page, total, cursor = data.page_words(category, limit=limit, cursor=cursor)
+        pages.append([word["id"] for word in page])
+        if cursor is None:
+            return pages, total
+
+
+def test_cursor_pages_cover_every_word_once_in_order():
+    data = VocabularyData(WORDS)
+    pages, total = walk(data)
+    ids = [word_id for page in pages for word_id in page]
+    assert total == len(WORDS)
+    assert ids == [word["id"] for word in data.sorted_words]
+    # Les deux « chat » (même mot français) sont départagés par l'id
+    assert ids.index("00") < ids.index("05")
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+
+
+def test_cursor_pages_by_category():
+    data = VocabularyData(WORDS)
+    pages, total = walk(data, category="animaux", limit=3)
+    assert total == 4
+    assert pages == [["06", "00", "05"], ["02"]]
+
+
+def test_offset_paging_and_last_page_has_no_cursor():
+    data = VocabularyData(WORDS)
+    page, total, cursor = data.page_words(offset=5, limit=5)
+    assert [word["id"] for word in page] == [word["id"] for word in data.sorted_words[5:]]
+    assert cursor is None
+    page, _, cursor = data.page_words(offset=0, limit=5)
+    assert decode_cursor(cursor) == decode_cursor(encode_cursor(page[-1]))
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        VocabularyData(WORDS).page_words(cursor="pas-un-curseur")
+
+
+@pytest.fixture
+def client():
+    async def seed():
+        await db.words.insert_many([
+            {"french": word["french"], "category": word["category"], "shimaore": "s", "kibouchi": "k"}
+            for word in WORDS
+        ])
+
+    run(seed())
+    server.invalidate_word_caches()
+    yield TestClient(server.app)
+    server.invalidate_word_caches()
+
+
+def test_api_words_cursor_and_fields(client):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, "fields": "french"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/words", params=params)
+        assert response.status_code == 200
+        assert response.headers["x-total-count"] == str(len(WORDS))
+        for word in response.json():
+            assert set(word) == {"id", "french"}
+        seen.extend(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert [word["french"] for word in seen] == sorted(word["french"] for word in WORDS)
+    assert len({word["id"] for word in seen}) == len(WORDS)
+
+
+def test_api_words_bad_cursor_is_400(client):
+    assert client.get("/api/words", params={"limit": 2, "cursor": "%%%"}).status_code == 400
@@ -0,0 +1,203 @@
+"""File write-behind : reprise après échec, rejeu du journal, lectures pendant une écriture"""
+import asyncio
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+import premium_system
+import user_stats
+from database import progress_repository, user_stats_repository, users_repository
+from write_behind import WriteBehindQueue
+
+from tests.conftest import run
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    """File neuve (journal dans tmp_path) avec les gestionnaires réels"""
+    queue = WriteBehindQueue(spool_dir=str(tmp_path), interval=3600)
+    queue.register(user_stats.PROGRESS_EVENT, user_stats.flush_progress_events)
+    queue.register(premium_system.ACTIVITY_EVENT, premium_system.flush_activity_events)
+    monkeypatch.setattr(user_stats, "write_behind_queue", queue)
+    monkeypatch.setattr(premium_system, "write_behind_queue", queue)
+    return queue
+
+
+def enqueue_progress(queue, user_name, score):
+    progress = user_stats.record_progress(
+        {"user_name": user_name, "exercise_id": "ex", "score": score, "completed_at": datetime.utcnow()}
+    )
+    return progress
+
+
+def test_progress_is_written_once(queue):
+    async def scenario():
+        await queue.start()
+        enqueue_progress(queue, "alice", 10)
+        enqueue_progress(queue, "alice", 100)
+        stats = await user_stats.get_user_stats("alice")
+        await queue.stop()
+        return stats
+
+    stats = run(scenario())
+    assert stats["total_score"] == 110
+    assert stats["completed_exercises"] == 2
+    assert stats["perfect_scores"] == 1
+
+
+def test_failed_type_is_requeued_without_recounting_others(queue, monkeypatch):
+    calls = {"activity": 0}
+    real_flush_activity = premium_system.flush_activity_events
+
+    async def flaky_activity(events):
+        calls["activity"] += 1
+        if calls["activity"] == 1:
+            raise RuntimeError("MongoDB indisponible")
+        await real_flush_activity(events)
+
+    queue.register(premium_system.ACTIVITY_EVENT, flaky_activity)
+
+    async def scenario():
+        await queue.start()
+        enqueue_progress(queue, "bob", 10)
+        queue.enqueue(premium_system.ACTIVITY_EVENT, "bob", {"words_learned": 3, "score": 10, "at": datetime.utcnow()})
+        with pytest.raises(RuntimeError):
+            await queue.flush()
+        # Seule l'activité est remise en file
+        assert queue.pending_count == 1
+        await queue.flush()
+        await queue.stop()
+        return await user_stats_repository.find_by_user("bob"), await users_repository.find_by_user_id("bob")
+
+    stats, user = run(scenario())
+    assert stats["total_score"] == 10
+    assert stats["completed_exercises"] == 1
+    assert user["words_learned"] == 3
+    assert user["total_score"] == 10
+    assert "write_behind_applied" not in user
+
+
+def test_spool_replay_after_crash_is_idempotent(tmp_path, queue):
+    async def crash_after_write():
+        await queue.start()
+        enqueue_progress(queue, "carol", 20)
+        queue.enqueue(premium_system.ACTIVITY_EVENT, "carol", {"words_learned": 2, "score": 20, "at": datetime.utcnow()})
+        # Écriture MongoDB réussie mais segments jamais supprimés (plantage)
+        queue._rotate_segment()
+        await user_stats.flush_progress_events([e for e in queue._events if e["type"] == "progress"])
+        await premium_system.flush_activity_events([e for e in queue._events if e["type"] == "activity"])
+        queue._task.cancel()
+
+    run(crash_after_write())
+
+    restarted = WriteBehindQueue(spool_dir=str(tmp_path), interval=3600)
+    restarted.register(user_stats.PROGRESS_EVENT, user_stats.flush_progress_events)
+    restarted.register(premium_system.ACTIVITY_EVENT, premium_system.flush_activity_events)
+
+    async def replay():
+        await restarted.start()
+        assert restarted.pending_count == 2
+        await restarted.stop()
+        return (
+            await user_stats_repository.find_by_user("carol"),
+            await users_repository.find_by_user_id("carol"),
+            await progress_repository.find_by_user("carol"),
+        )
+
+    stats, user, rows = run(replay())
+    assert len(rows) == 1
+    assert stats["total_score"] == 20
+    assert stats["completed_exercises"] == 1
+    assert user["words_learned"] == 2
+    assert user["total_score"] == 20
+
+
+def test_read_waits_for_in_flight_flush(queue, monkeypatch):
+    """Premier passage d'un utilisateur : une lecture pendant l'écriture ne compte pas le lot deux fois"""
+    real_insert = progress_repository.insert_many_once
+    inserted = None
+
+    async def slow_insert(progress):
+        await real_insert(progress)
+        inserted.set()
+        await asyncio.sleep(0.05)
+
+    monkeypatch.setattr(progress_repository, "insert_many_once", slow_insert)
+
+    async def scenario():
+        nonlocal inserted
+        inserted = asyncio.Event()
+        await queue.start()
+        enqueue_progress(queue, "dave", 10)
+        flush = asyncio.create_task(queue.flush())
+        await inserted.wait()
+        stats = await user_stats.get_user_stats("dave")
+        await flush
+        await queue.stop()
+        return stats, await user_stats_repository.find_by_user("dave")
+
+    read, stored = run(scenario())
+    assert read["total_score"] == 10
+    assert stored["total_score"] == 10
+    assert stored["completed_exercises"] == 1
+
+
+def test_stats_read_without_document_does_not_write(queue):
+    async def scenario():
+        await progress_repository.insert_many_once([
+            {"user_name": "erin", "exercise_id": "ex", "score": 30, "completed_at": datetime.utcnow()}
+        ])
+        stats = await user_stats.get_user_stats("erin")
+        return stats, await user_stats_repository.find_by_user("erin")
+
+    stats, stored = run(scenario())
+    assert stats["total_score"] == 30
+    assert stored is None
+
+
+def test_enqueue_does_not_wait_for_disk(tmp_path, queue, monkeypatch):
+    """Group commit : enqueue() ne touche pas au disque, un fsync par lot"""
+    real_fsync = os.fsync
+    syncs = []
+
+    def slow_fsync(fd):
+        syncs.append(fd)
+        time.sleep(0.2)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", slow_fsync)
+
+    async def scenario():
+        await queue.start()
+        started = time.perf_counter()
+        for i in range(50):
+            enqueue_progress(queue, "fiona", i)
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(queue.sync_interval * 4)
+        queue.sync_spool()
+        await queue.stop()
+        return elapsed
+
+    elapsed = run(scenario())
+    assert elapsed < 0.1
+    assert 1 <= len(syncs) < 5
+
+
+def test_unflushed_events_are_journaled_by_group_commit(tmp_path, queue):
+    async def scenario():
+        await queue.start()
+        enqueue_progress(queue, "gus", 5)
+        await asyncio.sleep(queue.sync_interval * 4)
+        lines = [
+            line
+            for name in os.listdir(tmp_path)
+            for line in open(os.path.join(tmp_path, name), encoding="utf-8")
+        ]
+        await queue.stop()
+        return lines
+
+    lines = run(scenario())
+    assert len(lines) == 1
+    assert '"gus"' in lines[0]
@@ -0,0 +1,239 @@
+"""
+Traces de requêtes pour Kwezi
+- une requête sur TRACE_SAMPLE_RATE est tracée : chaque commande MongoDB,
+  accès disque et sérialisation JSON y est enregistré comme un span
+- les TRACE_BUFFER_SIZE traces les plus lentes sont gardées en mémoire et
+  consultables par un endpoint d'administration
+- toute requête plus lente que TRACE_SLOW_REQUEST_MS et toute commande
+  MongoDB plus lente que TRACE_SLOW_COMMAND_MS est journalisée, tracée ou non
+Hors requête tracée, span() ne fait rien : le coût reste négligeable.
+"""
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from pymongo import monitoring
+
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.05"))
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "50"))
+TRACE_SLOW_REQUEST_MS = float(os.getenv("TRACE_SLOW_REQUEST_MS", "1000"))
+TRACE_SLOW_COMMAND_MS = float(os.getenv("TRACE_SLOW_COMMAND_MS", "200"))
+
+# Au-delà, les spans d'une trace sont seulement comptés
+TRACE_MAX_SPANS = 500
+
+current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("current_trace", default=None)
+
+
+class Span(NamedTuple):
+    kind: str
+    name: str
+    start: float
+    duration: float
+    detail: Optional[dict]
+
+
+class Trace:
+    """Spans d'une requête (ajoutés depuis la boucle et les threads)"""
+
+    def __init__(self, method: str, path: str, query: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.query = query
+        self.route: Optional[str] = None
+        self.status: Optional[int] = None
+        self.started_at = datetime.utcnow()
+        self.origin = time.perf_counter()
+        self.duration = 0.0
+        self.first_byte: Optional[float] = None
+        self.spans: List[Span] = []
+        self.dropped = 0
+
+    def add(self, kind: str, name: str, start: float, duration: float, detail: Optional[dict] = None):
+        # list.append est atomique : pas de verrou entre threads
+        if len(self.spans) < TRACE_MAX_SPANS:
+            self.spans.append(Span(kind, name, start - self.origin, duration, detail))
+        else:
+            self.dropped += 1
+
+    def to_dict(self) -> dict:
+        summary: Dict[str, dict] = {}
+        for span in self.spans:
+            entry = summary.setdefault(span.kind, {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += span.duration * 1000
+        for entry in summary.values():
+            entry["total_ms"] = round(entry["total_ms"], 3)
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "route": self.route,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "first_byte_ms": round(self.first_byte * 1000, 3) if self.first_byte is not None else None,
+            "summary": summary,
+            "spans": [
+                {
+                    "kind": span.kind,
+                    "name": span.name,
+                    "start_ms": round(span.start * 1000, 3),
+                    "duration_ms": round(span.duration * 1000, 3),
+                    **({"detail": span.detail} if span.detail else {}),
+                }
+                for span in sorted(self.spans, key=lambda span: span.start)
+            ],
+            "dropped_spans": self.dropped,
+        }
+
+
+@contextmanager
+def span(kind: str, name: str, **detail):
+    """Mesure un bloc dans la trace de la requête en cours (sans effet hors trace)"""
+    trace = current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(kind, name, start, time.perf_counter() - start, detail or None)
+
+
+class SlowTraceBuffer:
+    """Les `capacity` traces les plus lentes (tas min sur la durée)"""
+
+    def __init__(self, capacity: int = TRACE_BUFFER_SIZE):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+
+    def add(self, trace: Trace):
+        entry = (trace.duration, next(self._sequence), trace)
+        with self._lock:
+            if len(self._heap) < self.capacity:
+                heapq.heappush(self._heap, entry)
+            elif trace.duration > self._heap[0][0]:
+                heapq.heapreplace(self._heap, entry)
+
+    def slowest(self, limit: Optional[int] = None, route: Optional[str] = None) -> List[dict]:
+        with self._lock:
+            traces = [trace for _, _, trace in sorted(self._heap, reverse=True)]
+        if route:
+            traces = [trace for trace in traces if trace.route == route or trace.path == route]
+        return [trace.to_dict() for trace in traces[:limit]]
+
+    def clear(self):
+        with self._lock:
+            self._heap = []
+
+
+slow_traces = SlowTraceBuffer()
+
+
+class TraceMiddleware:
+    """Middleware ASGI : échantillonne les requêtes et journalise les requêtes lentes"""
+
+    def __init__(self, app, sample_rate: float = TRACE_SAMPLE_RATE, buffer: SlowTraceBuffer = slow_traces):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.buffer = buffer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        if random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            self._log_if_slow(scope, time.perf_counter() - start)
+            return
+
+        trace = Trace(scope["method"], scope["path"], scope.get("query_string", b"").decode("latin-1"))
+        body_started: Optional[float] = None
+
+        async def send_wrapper(message):
+            nonlocal body_started
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+                trace.first_byte = time.perf_counter() - trace.origin
+            elif message["type"] == "http.response.body":
+                if body_started is None:
+                    body_started = time.perf_counter()
+                if not message.get("more_body", False):
+                    trace.add("http", "send", body_started, time.perf_counter() - body_started)
+            await send(message)
+
+        token = current_trace.set(trace)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_trace.reset(token)
+            trace.duration = time.perf_counter() - trace.origin
+            trace.route = getattr(scope.get("route"), "path", None)
+            self.buffer.add(trace)
+            self._log_if_slow(scope, trace.duration, trace.id)
+
+    @staticmethod
+    def _log_if_slow(scope, duration: float, trace_id: Optional[str] = None):
+        if duration * 1000 >= TRACE_SLOW_REQUEST_MS:
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            traced = f" (trace {trace_id})" if trace_id else ""
+            print(f"🐢 Requête lente: {scope['method']} {route} {duration * 1000:.0f} ms{traced}")
+
+
+class TraceCommandListener(monitoring.CommandListener):
+    """Spans des commandes MongoDB et journal des commandes lentes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._commands: Dict[tuple, dict] = {}
+
+    @staticmethod
+    def _key(event):
+        return (event.connection_id, event.request_id)
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        detail = {"collection": target if isinstance(target, str) else event.database_name}
+        # Noms des champs filtrés seulement : jamais les valeurs (données utilisateurs)
+        query = event.command.get("filter", event.command.get("query"))
+        if isinstance(query, dict) and query:
+            detail["filter"] = sorted(query)
+        with self._lock:
+            self._commands[self._key(event)] = detail
+
+    def _finish(self, event, failed: bool):
+        with self._lock:
+            detail = self._commands.pop(self._key(event), {})
+        duration = event.duration_micros / 1e6
+        if failed:
+            detail["failed"] = True
+        trace = current_trace.get()
+        if trace is not None:
+            trace.add("mongo", event.command_name, time.perf_counter() - duration, duration, detail)
+        if duration * 1000 >= TRACE_SLOW_COMMAND_MS:
+            print(f"🐢 Commande MongoDB lente: {event.command_name} {detail.get('collection')} {duration * 1000:.0f} ms")
+
+    def succeeded(self, event):
+        self._finish(event, False)
+
+    def failed(self, event):
+        self._finish(event, True)
+
+
+trace_command_listener = TraceCommandListener()
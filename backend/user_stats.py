@@ -0,0 +1,170 @@
+"""
+Statistiques agrégées par utilisateur pour Kwezi
+Un document user_stats mis à jour par lots depuis la file write-behind
+($inc / $max / $addToSet) : la lecture ne dépend plus de la longueur de
+l'historique user_progress
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from database import progress_repository, user_stats_repository
+from write_behind import (
+    APPLIED_EVENTS_FIELD, APPLIED_EVENTS_WINDOW, applied_events_push, unapplied_events, write_behind_queue
+)
+
+PERFECT_SCORE = 100
+PROGRESS_EVENT = "progress"
+
+
+def _day(completed_at: datetime) -> str:
+    return completed_at.date().isoformat()
+
+
+def compute_user_stats(user_name: str, progress: Iterable[dict]) -> dict:
+    """Document user_stats recalculé à partir de tout l'historique (rattrapage)"""
+    stats = {
+        "user_name": user_name,
+        "total_score": 0,
+        "completed_exercises": 0,
+        "best_score": 0,
+        "perfect_scores": 0,
+        "learning_days": [],
+    }
+    days = set()
+    for p in progress:
+        score = p.get("score", 0)
+        stats["total_score"] += score
+        stats["completed_exercises"] += 1
+        stats["best_score"] = max(stats["best_score"], score)
+        if score >= PERFECT_SCORE:
+            stats["perfect_scores"] += 1
+        days.add(_day(p.get("completed_at", datetime.utcnow())))
+    stats["learning_days"] = sorted(days)
+    return stats
+
+
+def format_user_stats(user_name: str, stats: Optional[dict]) -> dict:
+    """Réponse de /api/stats (même format qu'avant) à partir du document agrégé"""
+    stats = stats or {}
+    total_score = stats.get("total_score", 0)
+    completed_exercises = stats.get("completed_exercises", 0)
+    average_score = total_score / completed_exercises if completed_exercises > 0 else 0
+    return {
+        "user_name": user_name,
+        "total_score": total_score,
+        "completed_exercises": completed_exercises,
+        "average_score": round(average_score, 1),
+        "best_score": stats.get("best_score", 0),
+        "perfect_scores": stats.get("perfect_scores", 0),
+        "learning_days": len(stats.get("learning_days", [])),
+        "words_learned": completed_exercises  # Simplified assumption
+    }
+
+
+def _progress_totals(events: List[dict]) -> dict:
+    totals = {"total_score": 0, "completed_exercises": 0, "perfect_scores": 0, "best_score": 0, "days": set()}
+    for event in events:
+        progress = event["data"]
+        score = progress.get("score", 0)
+        totals["total_score"] += score
+        totals["completed_exercises"] += 1
+        totals["perfect_scores"] += 1 if score >= PERFECT_SCORE else 0
+        totals["best_score"] = max(totals["best_score"], score)
+        totals["days"].add(_day(progress["completed_at"]))
+    return totals
+
+
+async def _backfill_user_stats(user_name: str, events: List[dict], now: datetime) -> bool:
+    """
+    Premier lot d'un utilisateur : document agrégé recalculé depuis l'historique
+    (qui contient déjà ce lot). False si le document existait déjà
+    """
+    stats = compute_user_stats(user_name, await progress_repository.find_by_user(user_name))
+    stats["updated_at"] = now
+    stats[APPLIED_EVENTS_FIELD] = [event["id"] for event in events][-APPLIED_EVENTS_WINDOW:]
+    result = await user_stats_repository.insert_if_absent(user_name, stats)
+    return result.upserted_id is not None
+
+
+async def flush_progress_events(events: List[dict]):
+    """
+    Écrit un lot de progressions (gestionnaire de la file write-behind) :
+    insertion des lignes user_progress puis une mise à jour agrégée par
+    utilisateur ($inc/$max/$addToSet) en un seul bulk_write.
+    Idempotent : les lignes ont un _id fixe et chaque document user_stats
+    garde les identifiants des événements déjà comptés.
+    """
+    await progress_repository.insert_many_once([event["data"] for event in events])
+
+    by_user: Dict[str, List[dict]] = {}
+    for event in events:
+        by_user.setdefault(event["data"]["user_name"], []).append(event)
+
+    documents = {
+        document["user_name"]: document
+        for document in await user_stats_repository.find_applied_events(list(by_user))
+    }
+    now = datetime.utcnow()
+    operations = []
+    for user_name, user_events in by_user.items():
+        document = documents.get(user_name)
+        if document is None:
+            if await _backfill_user_stats(user_name, user_events, now):
+                continue
+            # Document créé entre-temps : mise à jour incrémentale
+            document = next(iter(await user_stats_repository.find_applied_events([user_name])), None)
+        new_events = unapplied_events(user_events, document)
+        if not new_events:
+            continue
+        total = _progress_totals(new_events)
+        operations.append(UpdateOne(
+            {"user_name": user_name, APPLIED_EVENTS_FIELD: {"$nin": [event["id"] for event in new_events]}},
+            {
+                "$inc": {
+                    "total_score": total["total_score"],
+                    "completed_exercises": total["completed_exercises"],
+                    "perfect_scores": total["perfect_scores"],
+                },
+                "$max": {"best_score": total["best_score"]},
+                "$addToSet": {"learning_days": {"$each": sorted(total["days"])}},
+                "$push": applied_events_push(new_events),
+                "$set": {"updated_at": now},
+            }
+        ))
+    if operations:
+        await user_stats_repository.bulk_write(operations)
+
+
+def record_progress(progress: dict) -> dict:
+    """
+    Met une progression en file d'écriture différée et la retourne avec son _id
+    (généré ici : la réponse n'attend pas MongoDB)
+    """
+    progress = dict(progress, _id=ObjectId())
+    write_behind_queue.enqueue(PROGRESS_EVENT, progress["user_name"], progress)
+    return progress
+
+
+async def get_user_progress(user_name: str) -> List[dict]:
+    await write_behind_queue.flush_key(PROGRESS_EVENT, user_name)
+    return await progress_repository.find_by_user(user_name)
+
+
+async def get_user_stats(user_name: str) -> dict:
+    """
+    Statistiques d'un utilisateur en une lecture
+    Sans document agrégé (utilisateur antérieur à user_stats), calcul à la
+    volée depuis l'historique, sans écriture : le document est créé par la
+    file write-behind à sa prochaine progression
+    """
+    await write_behind_queue.flush_key(PROGRESS_EVENT, user_name)
+    stats = await user_stats_repository.find_by_user(user_name)
+    if stats is None:
+        stats = compute_user_stats(user_name, await progress_repository.find_by_user(user_name))
+    return format_user_stats(user_name, stats)
+
+
+write_behind_queue.register(PROGRESS_EVENT, flush_progress_events)
@@ -0,0 +1,206 @@
+"""
+Cache mémoire du vocabulaire pour Kwezi
+Charge la collection words une seule fois et sert les lectures
+(/api/words, /api/vocabulary) sans aller-retour MongoDB
+"""
+import asyncio
+import base64
+import bisect
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from http_cache import EncodedBody
+
+# Durée de vie maximale d'un snapshot (secondes) - permet de voir les
+# modifications faites directement en base par les scripts de maintenance.
+# 0 = pas d'expiration, seule l'invalidation explicite recharge.
+VOCABULARY_CACHE_TTL = int(os.getenv("VOCABULARY_CACHE_TTL", "300"))
+
+# Nombre maximal de corps pré-encodés gardés par version du snapshot
+MAX_ENCODED_BODIES = 256
+
+
+def _word_sort_key(word):
+    """Ordre alphabétique par mot français (équivalent du sort MongoDB)"""
+    french = word.get("french")
+    return (french is not None, str(french) if french is not None else "", word.get("id", ""))
+
+
+def _difficulty_sort_key(word):
+    """Ordre (difficulty, _id) du sort MongoDB : difficulté absente en premier"""
+    difficulty = word.get("difficulty")
+    return (difficulty is not None, difficulty if difficulty is not None else 0, word.get("id", ""))
+
+
+def encode_cursor(word: dict) -> str:
+    """Curseur opaque de pagination : position (french, id) du dernier mot servi"""
+    raw = json.dumps([word.get("french"), word.get("id", "")], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Clé de tri d'un curseur, ValueError s'il est invalide"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        french, word_id = json.loads(raw)
+    except Exception:
+        raise ValueError("Curseur invalide")
+    return _word_sort_key({"french": french, "id": word_id})
+
+
+def project_words(words: Sequence[dict], fields: Optional[Sequence[str]]) -> List[dict]:
+    """Ne garde que les champs demandés (l'identifiant est toujours inclus)"""
+    if not fields:
+        return list(words)
+    keep = ["id"] + [field for field in fields if field != "id"]
+    return [{field: word[field] for field in keep if field in word} for word in words]
+
+
+class VocabularyData:
+    """Données immuables d'une version du snapshot (remplacées en bloc)"""
+
+    def __init__(self, words: List[dict], version: int = 0):
+        self.version = version
+        self.words = words
+        self.sorted_words = sorted(words, key=_word_sort_key)
+        self.by_id: Dict[str, dict] = {word["id"]: word for word in words if "id" in word}
+
+        self.by_category: Dict[str, List[dict]] = {}
+        for word in self.sorted_words:
+            self.by_category.setdefault(word.get("category"), []).append(word)
+
+        # Les sections gardent l'ordre naturel de la collection
+        self.by_section: Dict[str, List[dict]] = {}
+        for word in words:
+            self.by_section.setdefault(word.get("section"), []).append(word)
+        self.sections = [section for section in self.by_section if section is not None]
+        self.encoded: Dict[tuple, EncodedBody] = {}
+        self._ranked: Dict[Optional[str], List[dict]] = {}
+
+    def all_words(self, sort_by_french: bool = False) -> List[dict]:
+        return self.sorted_words if sort_by_french else self.words
+
+    def words_by_category(self, category: str) -> List[dict]:
+        """Mots d'une catégorie, triés alphabétiquement"""
+        return self.by_category.get(category, [])
+
+    def words_by_section(self, section: str) -> List[dict]:
+        """Mots d'une section, dans l'ordre de la collection"""
+        return self.by_section.get(section, [])
+
+    def get_word(self, word_id: str) -> Optional[dict]:
+        return self.by_id.get(word_id)
+
+    def ranked_words(self, category: Optional[str] = None) -> List[dict]:
+        """Mots triés par (difficulty, _id), calculés une fois par catégorie"""
+        words = self._ranked.get(category)
+        if words is None:
+            source = self.by_category.get(category, []) if category else self.words
+            # L'id hexadécimal d'un ObjectId se trie comme l'ObjectId lui-même
+            words = self._ranked[category] = sorted(source, key=_difficulty_sort_key)
+        return words
+
+    def encode(self, key: tuple, build: Callable[["VocabularyData"], object]) -> EncodedBody:
+        """Corps JSON pré-encodé, build(self) n'est appelé qu'une fois par clé"""
+        body = self.encoded.get(key)
+        if body is None:
+            body = EncodedBody(build(self))
+            if len(self.encoded) < MAX_ENCODED_BODIES:
+                self.encoded[key] = body
+        return body
+
+    def page_words(
+        self,
+        category: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[dict], int, Optional[str]]:
+        """
+        Page de mots triés par (french, id) : (mots, total, curseur suivant)
+        Le curseur (pagination par clé) est prioritaire sur offset
+        """
+        words = self.words_by_category(category) if category else self.sorted_words
+        start = offset
+        if cursor:
+            start = bisect.bisect_right(words, decode_cursor(cursor), key=_word_sort_key)
+        end = len(words) if limit is None else start + limit
+        page = words[start:end]
+        next_cursor = encode_cursor(page[-1]) if page and end < len(words) else None
+        return page, len(words), next_cursor
+
+
+class VocabularySnapshot:
+    """Snapshot versionné de tous les mots, indexé par catégorie et section"""
+
+    def __init__(self, repository, ttl: int = VOCABULARY_CACHE_TTL):
+        self.repository = repository
+        self.ttl = ttl
+        self.version = 0
+        self._lock = asyncio.Lock()
+        self._loaded_at: Optional[float] = None
+        # Incrémenté à chaque invalidation : un chargement lancé avant une
+        # écriture ne doit pas être considéré comme frais
+        self._generation = 0
+        self._data = VocabularyData([])
+
+    def _is_fresh(self):
+        if self._loaded_at is None:
+            return False
+        if self.ttl and time.monotonic() - self._loaded_at > self.ttl:
+            return False
+        return True
+
+    async def _load(self):
+        """Charge tous les mots et reconstruit les index"""
+        generation = self._generation
+        words = []
+        for word_doc in await self.repository.find_all():
+            word = dict(word_doc)
+            if "_id" in word:
+                word["id"] = str(word["_id"])
+                del word["_id"]
+            words.append(word)
+
+        self.version += 1
+        self._data = VocabularyData(words, self.version)
+        if generation == self._generation:
+            self._loaded_at = time.monotonic()
+        print(f"📚 Snapshot vocabulaire v{self.version}: {len(words)} mots chargés")
+
+    async def current(self) -> VocabularyData:
+        """Données à jour (recharge le snapshot s'il est absent, invalidé ou expiré)"""
+        if not self._is_fresh():
+            async with self._lock:
+                if not self._is_fresh():
+                    await self._load()
+        return self._data
+
+    def invalidate(self):
+        """Invalide le snapshot (à appeler après toute écriture sur words)"""
+        self._generation += 1
+        self._loaded_at = None
+
+    async def all_words(self, sort_by_french: bool = False) -> List[dict]:
+        return (await self.current()).all_words(sort_by_french)
+
+    async def words_by_category(self, category: str) -> List[dict]:
+        return (await self.current()).words_by_category(category)
+
+    async def words_by_section(self, section: str) -> List[dict]:
+        return (await self.current()).words_by_section(section)
+
+    async def sections(self) -> List[str]:
+        return (await self.current()).sections
+
+    async def get_word(self, word_id: str) -> Optional[dict]:
+        return (await self.current()).get_word(word_id)
+
+    async def encoded(self, key: tuple, build: Callable[[VocabularyData], object]) -> EncodedBody:
+        """
+        Corps JSON pré-encodé pour cette version du snapshot
+        build(data) n'est appelé qu'une fois par clé et par version
+        """
+        return (await self.current()).encode(key, build)
@@ -0,0 +1,319 @@
+"""
+File d'écriture différée (write-behind) pour Kwezi
+Les événements fréquents (progression, activité) sont mis en file et
+journalisés sur disque, puis écrits dans MongoDB par lots (bulk_write),
+regroupés par utilisateur, toutes les WRITE_BEHIND_INTERVAL secondes ou dès
+WRITE_BEHIND_MAX_EVENTS événements. La réponse à l'utilisateur n'attend plus
+les écritures MongoDB.
+
+Chaque type d'événement a son gestionnaire d'écriture, enregistré par le
+module concerné (register). Les lectures appellent flush_key() pour voir
+leurs propres écritures.
+
+Un événement peut être écrit deux fois : lot rejoué après un plantage entre
+l'écriture MongoDB et la suppression du segment, ou segment conservé parce
+qu'un autre type du lot a échoué. Chaque événement porte donc un identifiant
+unique et les gestionnaires mémorisent, dans le document mis à jour et par la
+même écriture, les identifiants déjà appliqués (APPLIED_EVENTS_FIELD).
+
+Le journal est écrit par lots (group commit) : enqueue() ne fait que
+placer la ligne en mémoire, et un thread dédié écrit puis synchronise sur
+disque (un seul fsync) tous les événements reçus pendant
+WRITE_BEHIND_SYNC_INTERVAL secondes. La boucle d'événements n'attend jamais
+le disque ; un plantage peut perdre au plus cet intervalle.
+WRITE_BEHIND_SPOOL_DIR doit être sur un disque persistant (disque Render
+monté) : sur un disque éphémère les événements ne survivent qu'à un
+redémarrage du processus, pas à un redéploiement.
+"""
+import asyncio
+import os
+import threading
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from bson import json_util
+from starlette.concurrency import run_in_threadpool
+
+WRITE_BEHIND_INTERVAL = float(os.getenv("WRITE_BEHIND_INTERVAL", "1.0"))
+WRITE_BEHIND_MAX_EVENTS = int(os.getenv("WRITE_BEHIND_MAX_EVENTS", "200"))
+# Période du group commit du journal (secondes)
+WRITE_BEHIND_SYNC_INTERVAL = float(os.getenv("WRITE_BEHIND_SYNC_INTERVAL", "0.05"))
+WRITE_BEHIND_SPOOL_DIR = os.getenv(
+    "WRITE_BEHIND_SPOOL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "write_behind_spool")
+)
+
+# Identifiants des derniers événements appliqués, gardés dans chaque document mis à jour
+APPLIED_EVENTS_FIELD = "write_behind_applied"
+APPLIED_EVENTS_WINDOW = 1000
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+
+FlushHandler = Callable[[List[dict]], Awaitable[None]]
+
+
+def unapplied_events(events: List[dict], document: Optional[dict]) -> List[dict]:
+    """Événements pas encore appliqués à un document (rejeu idempotent)"""
+    applied = set((document or {}).get(APPLIED_EVENTS_FIELD, []))
+    return [event for event in events if event["id"] not in applied]
+
+
+def applied_events_push(events: List[dict]) -> dict:
+    """Opérande $push qui mémorise les identifiants d'un lot (fenêtre bornée)"""
+    return {APPLIED_EVENTS_FIELD: {"$each": [event["id"] for event in events], "$slice": -APPLIED_EVENTS_WINDOW}}
+
+
+class WriteBehindQueue:
+    """
+    File d'événements avec journal disque en segments : un segment n'est
+    supprimé qu'après l'écriture réussie de ses événements dans MongoDB, et
+    les segments restants sont rejoués au démarrage
+    """
+
+    def __init__(
+        self,
+        spool_dir: str = WRITE_BEHIND_SPOOL_DIR,
+        interval: float = WRITE_BEHIND_INTERVAL,
+        max_events: int = WRITE_BEHIND_MAX_EVENTS,
+        sync_interval: float = WRITE_BEHIND_SYNC_INTERVAL,
+    ):
+        self.spool_dir = spool_dir
+        self.interval = interval
+        self.max_events = max_events
+        self.sync_interval = sync_interval
+        self._handlers: Dict[str, FlushHandler] = {}
+        self._events: List[dict] = []
+        # Nombre d'événements en attente par (type, clé)
+        self._pending: Dict[Tuple[str, str], int] = {}
+        # Clés du lot en cours d'écriture (flush_key doit attendre sa fin)
+        self._in_flight: Dict[Tuple[str, str], int] = {}
+        self._segment_number = 0
+        self._segment = None
+        # Segments fermés dont les événements ne sont pas encore écrits en base
+        self._closed_segments: List[str] = []
+        # Lignes pas encore écrites dans le segment (protégées par _spool_lock,
+        # tenu le temps d'un append) ; le fichier segment est protégé par _io_lock
+        self._spool_buffer: List[str] = []
+        self._spool_lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._sync_stop = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, event_type: str, handler: FlushHandler):
+        """Gestionnaire qui écrit un lot d'événements d'un type (dans l'ordre d'arrivée)"""
+        self._handlers[event_type] = handler
+
+    # Journal disque
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.spool_dir, f"{SEGMENT_PREFIX}{number:012d}{SEGMENT_SUFFIX}")
+
+    def _open_segment(self):
+        self._segment_number += 1
+        self._segment = open(self._segment_path(self._segment_number), "a", encoding="utf-8")
+
+    def _write_buffer(self):
+        # Appelé avec _io_lock : écrit les lignes en attente puis un seul fsync
+        with self._spool_lock:
+            lines, self._spool_buffer = self._spool_buffer, []
+        if not lines:
+            return
+        if self._segment is None:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            self._open_segment()
+        self._segment.write("".join(lines))
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+
+    def sync_spool(self):
+        """Écrit et synchronise sur disque les événements reçus depuis le dernier appel"""
+        with self._io_lock:
+            self._write_buffer()
+
+    def _sync_loop(self):
+        while not self._sync_stop.wait(self.sync_interval):
+            try:
+                self.sync_spool()
+            except Exception as e:
+                print(f"⚠️ Write-behind: échec d'écriture du journal, nouvel essai: {e}")
+
+    def _rotate_segment(self):
+        """Ferme le segment courant (ses événements partent dans le prochain lot)"""
+        with self._io_lock:
+            # Les lignes en mémoire appartiennent au lot : dans ce segment
+            self._write_buffer()
+            if self._segment is not None:
+                self._segment.close()
+                self._closed_segments.append(self._segment.name)
+            self._open_segment()
+
+    def _load_spool(self):
+        """Rejoue les événements journalisés avant un arrêt ou un plantage"""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        segments = sorted(
+            name for name in os.listdir(self.spool_dir)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+        for name in segments:
+            path = os.path.join(self.spool_dir, name)
+            loaded = len(self._events)
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        try:
+                            self._track(json_util.loads(line))
+                        except ValueError:
+                            # Dernière ligne tronquée par un arrêt brutal
+                            print(f"⚠️ Ligne illisible ignorée dans {name}")
+            self._segment_number = max(self._segment_number, int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+            if len(self._events) > loaded:
+                self._closed_segments.append(path)
+            else:
+                os.remove(path)
+        if self._events:
+            print(f"📝 Write-behind: {len(self._events)} événements rejoués depuis {len(segments)} segments")
+
+    # File en mémoire
+
+    def _track(self, event: dict):
+        # Événements journalisés avant l'ajout des identifiants
+        event.setdefault("id", uuid.uuid4().hex)
+        self._events.append(event)
+        key = (event["type"], event["key"])
+        self._pending[key] = self._pending.get(key, 0) + 1
+
+    def enqueue(self, event_type: str, key: str, data: dict):
+        """
+        Ajoute un événement sans accès disque : il est journalisé par le
+        prochain group commit (au plus WRITE_BEHIND_SYNC_INTERVAL secondes)
+        """
+        event = {"id": uuid.uuid4().hex, "type": event_type, "key": key, "data": data}
+        line = json_util.dumps(event) + "\n"
+        with self._spool_lock:
+            self._spool_buffer.append(line)
+        self._track(event)
+        if len(self._events) >= self.max_events and self._wakeup is not None:
+            self._wakeup.set()
+
+    def pending_events(self, event_type: str, key: str) -> List[dict]:
+        """Données des événements pas encore écrits pour une clé (projection des réponses)"""
+        if (event_type, key) not in self._pending:
+            return []
+        return [event["data"] for event in self._events if event["type"] == event_type and event["key"] == key]
+
+    def has_pending(self, event_type: str, key: str) -> bool:
+        return (event_type, key) in self._pending
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._events)
+
+    # Écriture en base
+
+    async def flush(self):
+        """
+        Écrit tous les événements en attente, type par type
+        Seuls les types en échec sont remis en file ; l'exception est relevée
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._events:
+                return
+            # Écriture disque et fsync hors de la boucle d'événements
+            await run_in_threadpool(self._rotate_segment)
+            batch, self._events = self._events, []
+            self._in_flight, self._pending = self._pending, {}
+            segments = list(self._closed_segments)
+            failed: List[dict] = []
+            error: Optional[Exception] = None
+            try:
+                by_type: Dict[str, List[dict]] = {}
+                for event in batch:
+                    by_type.setdefault(event["type"], []).append(event)
+                for event_type, events in by_type.items():
+                    handler = self._handlers.get(event_type)
+                    if handler is None:
+                        print(f"⚠️ Write-behind: aucun gestionnaire pour '{event_type}'")
+                        continue
+                    try:
+                        await handler(events)
+                    except Exception as e:
+                        failed.extend(events)
+                        error = error or e
+            finally:
+                self._in_flight = {}
+            if error is not None:
+                # Types en échec remis en tête de file ; les segments restent sur
+                # disque (les types déjà écrits seront ignorés s'ils sont rejoués)
+                self._events = failed + self._events
+                for event in failed:
+                    key = (event["type"], event["key"])
+                    self._pending[key] = self._pending.get(key, 0) + 1
+                raise error
+            for path in segments:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                self._closed_segments.remove(path)
+
+    async def flush_key(self, event_type: str, key: str):
+        """
+        À appeler avant une lecture : écrit la file si cette clé a des événements
+        en attente, ou attend la fin du lot en cours qui la contient
+        """
+        if self.has_pending(event_type, key) or (event_type, key) in self._in_flight:
+            await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"⚠️ Write-behind: échec de l'écriture, nouvel essai au prochain tour: {e}")
+
+    async def start(self):
+        """Rejoue le journal et démarre l'écriture périodique (démarrage du serveur)"""
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        with self._io_lock:
+            self._load_spool()
+            self._open_segment()
+        self._task = asyncio.create_task(self._run())
+        self._sync_stop.clear()
+        self._sync_thread = threading.Thread(target=self._sync_loop, name="write-behind-spool", daemon=True)
+        self._sync_thread.start()
+
+    async def stop(self):
+        """Dernière écriture avant l'arrêt du serveur"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"⚠️ Write-behind: événements conservés dans le journal: {e}")
+        if self._sync_thread is not None:
+            self._sync_stop.set()
+            await run_in_threadpool(self._sync_thread.join)
+            self._sync_thread = None
+        with self._io_lock:
+            self._write_buffer()
+            if self._segment is not None:
+                self._segment.close()
+                if os.path.getsize(self._segment.name) == 0:
+                    os.remove(self._segment.name)
+                self._segment = None
+
+
+write_behind_queue = WriteBehindQueue()
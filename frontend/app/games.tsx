@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from 'react';
+import React, { useRef, useState } from 'react';
 import {
   View,
   Text,
@@ -96,9 +96,9 @@ const GAMES: GameCard[] = [
 ];
 
 export default function GamesScreen() {
-  const [words, setWords] = useState<Word[]>([]);
+  // Liste de mots chargée à la demande (mémoire, quiz Mayotte, secours du jeu de traduction)
+  const wordsRequest = useRef<Promise<Word[]> | null>(null);
   const [currentGame, setCurrentGame] = useState<string | null>(null);
-  const [gameWords, setGameWords] = useState<Word[]>([]);
   const [selectedWords, setSelectedWords] = useState<string[]>([]);
   const [score, setScore] = useState(0);
   const [gameStarted, setGameStarted] = useState(false);
@@ -118,26 +118,36 @@ export default function GamesScreen() {
     // Utiliser le système de voix féminine
     await speakText(text, lang);
   };
-  useEffect(() => {
-    fetchWords();
-  }, []);
-
-  const fetchWords = async () => {
+  const fetchWords = async (): Promise<Word[]> => {
     try {
       const backendUrl = Constants.expoConfig?.extra?.backendUrl || 'https://kwezi-backend.onrender.com';
-      // Charger seulement 100 mots pour le jeu (performance)
-      const response = await fetch(`${backendUrl}/api/words?limit=100`);
+      // Tous les mots pour varier les jeux, mais seulement les champs utilisés (performance)
+      const response = await fetch(`${backendUrl}/api/words?fields=french,shimaore,kibouchi,category,difficulty,image_url`);
       if (response.ok) {
         const responseData = await response.json();
         // Le backend retourne {words: [...], total: 635}
         const wordsArray = Array.isArray(responseData) ? responseData : responseData.words || [];
         console.log(`✅ Jeux: ${wordsArray.length} mots chargés pour les jeux`);
-        setWords(wordsArray);
+        return wordsArray;
       }
     } catch (error) {
       console.error('❌ Erreur fetchWords (games):', error);
       Alert.alert('Erreur', 'Impossible de charger les mots');
     }
+    return [];
+  };
+
+  // Un seul téléchargement partagé par les jeux qui en ont besoin ; nouvel essai après un échec
+  const loadWords = (): Promise<Word[]> => {
+    if (!wordsRequest.current) {
+      wordsRequest.current = fetchWords().then((wordsArray) => {
+        if (wordsArray.length === 0) {
+          wordsRequest.current = null;
+        }
+        return wordsArray;
+      });
+    }
+    return wordsRequest.current;
   };
 
   const fetchSentences = async () => {
@@ -189,14 +199,12 @@ export default function GamesScreen() {
       setCurrentSentenceIndex(0);
       setBuiltSentence([]);
       fetchSentences(); // Charger un mélange de tous les temps
-  } else {
-      // Pour les autres jeux
-      const shuffled = [...words].sort(() => Math.random() - 0.5).slice(0, 6);
-      setGameWords(shuffled);
-      
-      if (gameId === 'match-words') {
-        generateAllQuestions(shuffled);
-      }
+    } else if (gameId === 'match-words') {
+      // Questions du backend : la liste de mots n'est chargée qu'en secours
+      fetchQuiz();
+    } else {
+      // Mémoire et quiz Mayotte : précharger les mots pendant l'écran d'accueil du jeu
+      loadWords();
     }
     
     // Utiliser la voix féminine pour l'encouragement
@@ -279,6 +287,32 @@ export default function GamesScreen() {
     };
   };
 
+  // Questions générées par le backend (distracteurs de la même catégorie) ;
+  // génération locale seulement si le backend ne répond pas
+  const fetchQuiz = async () => {
+    try {
+      const backendUrl = Constants.expoConfig?.extra?.backendUrl || 'https://kwezi-backend.onrender.com';
+      const response = await fetch(`${backendUrl}/api/quiz?type=mixed&count=10&options=2`);
+      if (response.ok) {
+        const data = await response.json();
+        const questions = data.questions.map((question: any) => ({
+          french: question.prompt.text,
+          language: question.language,
+          languageLabel: question.language_label,
+          options: question.options.map((option: any) => ({ text: option.text, isCorrect: option.is_correct })),
+          correctAnswer: question.correct_answer,
+        }));
+        if (questions.length > 0) {
+          startQuestions(questions);
+          return;
+        }
+      }
+    } catch (error) {
+      console.error('❌ Erreur fetchQuiz:', error);
+    }
+    generateAllQuestions(await loadWords());
+  };
+
   // Générer toutes les questions au début du jeu
   const generateAllQuestions = (words: Word[]) => {
     const questions = [];
@@ -288,7 +322,10 @@ export default function GamesScreen() {
       const question = generateQuestion(shuffledWords, i);
       if (question) questions.push(question);
     }
-    
+    startQuestions(questions);
+  };
+
+  const startQuestions = (questions: any[]) => {
   setQuestionsGenerated(questions);
   if (questions.length > 0) {
     setCurrentQuestion(questions[0]);
@@ -476,8 +513,8 @@ export default function GamesScreen() {
   };
 
   // Initialiser le jeu de mémoire
-  const initMemoryGame = () => {
-    const cards = createMemoryCards(words);
+  const initMemoryGame = async () => {
+    const cards = createMemoryCards(await loadWords());
     setMemoryCards(cards);
     setFlippedCards([]);
     setMatchedPairs([]);
@@ -853,8 +890,8 @@ export default function GamesScreen() {
   };
 
   // Initialiser le quiz
-  const startQuiz = () => {
-    const questions = createQuizQuestions(words);
+  const startQuiz = async () => {
+    const questions = createQuizQuestions(await loadWords());
     setQuizQuestions(questions);
     setCurrentQuizIndex(0);
     setQuizScore(0);
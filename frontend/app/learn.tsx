@@ -143,10 +143,12 @@ export default function LearnScreen() {
       // CORRECTION CRITIQUE: Utiliser Constants.expoConfig pour APK Android
       const baseUrl = Constants.expoConfig?.extra?.backendUrl || 'https://kwezi-backend.onrender.com';
       console.log('🌍 Backend URL (fetchWords):', baseUrl);
-      // Ajouter limit=1000 pour récupérer tous les mots (le backend pagine par défaut à 50)
+      // Une catégorie est chargée en entier ; sans catégorie, 50 mots sauf si on demande tout
       const url = category 
-        ? `${baseUrl}/api/words?category=${category}&limit=50`
-        : `${baseUrl}/api/words?limit=50`;
+        ? `${baseUrl}/api/words?category=${category}`
+        : loadAll
+          ? `${baseUrl}/api/words`
+          : `${baseUrl}/api/words?limit=50`;
       
       const controller = new AbortController();
       const timeoutId = setTimeout(() => controller.abort(), 30000); // 30 secondes timeout
@@ -160,7 +162,8 @@ export default function LearnScreen() {
         const responseData = await response.json();
         // Le backend retourne {words: [...], total: 635}
         let data = Array.isArray(responseData) ? responseData : responseData.words || [];
-        const actualTotal = responseData.total || data.length;
+        // Le nombre total de mots est dans l'en-tête X-Total-Count quand la réponse est paginée
+        const actualTotal = Number(response.headers.get('X-Total-Count')) || responseData.total || data.length;
         
         console.log(`✅ Mots reçus du backend: ${data.length} mots (total dans DB: ${actualTotal})`);
         setTotalWordsCount(actualTotal);
@@ -261,7 +264,7 @@ export default function LearnScreen() {
         try {
           // CORRECTION CRITIQUE: Utiliser Constants.expoConfig pour APK Android
           const backendUrl = Constants.expoConfig?.extra?.backendUrl || 'https://kwezi-backend.onrender.com';
-         const response = await fetch(`${backendUrl}/api/words?limit=200`);
+         const response = await fetch(`${backendUrl}/api/words`);
           const responseData = await response.json();
           const wordsArray = Array.isArray(responseData) ? responseData : responseData.words || [];
           console.log(`✅ Recherche: ${wordsArray.length} mots chargés`);
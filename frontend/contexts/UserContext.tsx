@@ -74,6 +74,17 @@ export const UserProvider: React.FC<{ children: React.ReactNode }> = ({ children
         if (response.ok) {
           const userData = await response.json();
           setUser(userData);
+        } else if (response.status === 404) {
+          // Utilisateur inconnu du backend (la lecture ne le crée plus) : l'enregistrer
+          const registerResponse = await fetch(`${backendUrl}/api/users/register`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ user_id: userId }),
+          });
+          if (registerResponse.ok) {
+            const data = await registerResponse.json();
+            setUser(data.user);
+          }
         }
       }
     } catch (error) {
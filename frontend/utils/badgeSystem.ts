@@ -22,7 +22,8 @@ export interface BadgeRule {
   condition: (stats: UserStats) => boolean;
 }
 
-// Règles de déblocage des badges
+// Règles de déblocage des badges (noms et descriptions pour l'affichage ;
+// l'évaluation fait foi côté serveur, à garder synchronisée avec backend/badge_engine.py)
 export const BADGE_RULES: BadgeRule[] = [
   {
     id: 'first-word',
@@ -76,56 +77,27 @@ export const BADGE_RULES: BadgeRule[] = [
 
 /**
  * Vérifie et débloque automatiquement les badges pour un utilisateur
+ * Les règles sont évaluées par le serveur (backend/badge_engine.py) en une seule requête
  */
 export const checkAndUnlockBadges = async (userName: string): Promise<string[]> => {
   try {
-    // Récupérer les statistiques utilisateur
-    const statsResponse = await fetch(
-      `${process.env.EXPO_PUBLIC_BACKEND_URL}/api/stats/${encodeURIComponent(userName)}`
+    const response = await fetch(
+      `${process.env.EXPO_PUBLIC_BACKEND_URL}/api/badges/${encodeURIComponent(userName)}/evaluate`,
+      { method: 'POST' }
     );
     
-    if (!statsResponse.ok) {
-      console.log('Erreur lors de la récupération des stats');
+    if (!response.ok) {
+      console.log('Erreur lors de la vérification des badges');
       return [];
     }
     
-    const stats: UserStats = await statsResponse.json();
-    
-    // Récupérer les badges actuels
-    const badgesResponse = await fetch(
-      `${process.env.EXPO_PUBLIC_BACKEND_URL}/api/badges/${encodeURIComponent(userName)}`
-    );
-    
-    if (!badgesResponse.ok) {
-      console.log('Erreur lors de la récupération des badges');
-      return [];
-    }
-    
-    const currentBadges: string[] = await badgesResponse.json();
-    const newlyUnlocked: string[] = [];
-    
-    // Vérifier chaque règle de badge
-    for (const rule of BADGE_RULES) {
-      // Si le badge n'est pas déjà débloqué et que la condition est remplie
-      if (!currentBadges.includes(rule.id) && rule.condition(stats)) {
-        try {
-          // Débloquer le badge
-          const unlockResponse = await fetch(
-            `${process.env.EXPO_PUBLIC_BACKEND_URL}/api/badges/${encodeURIComponent(userName)}/unlock/${rule.id}`,
-            { method: 'POST' }
-          );
-          
-          if (unlockResponse.ok) {
-            newlyUnlocked.push(rule.id);
-            console.log(`🎉 Badge débloqué: ${rule.name}`);
-          }
-        } catch (error) {
-          console.log(`Erreur lors du déblocage du badge ${rule.id}:`, error);
-        }
-      }
+    const result: { newly_unlocked: string[] } = await response.json();
+    for (const badgeId of result.newly_unlocked) {
+      const rule = BADGE_RULES.find(r => r.id === badgeId);
+      console.log(`🎉 Badge débloqué: ${rule ? rule.name : badgeId}`);
     }
     
-    return newlyUnlocked;
+    return result.newly_unlocked;
     
   } catch (error) {
     console.log('Erreur lors de la vérification des badges:', error);